@@ -14,8 +14,8 @@ import sys
 import requests
 from PyQt5 import QtCore, QtWidgets
 
-from src.sql.configs_sql import ConfigsSql
-from src.utils import constants, messages, utilities
+from src.settings import Settings
+from src.utils import constants, messages, preflight, self_update, utilities
 
 
 class Launcher:
@@ -29,17 +29,7 @@ class Launcher:
 
     ################################################################################
     def init(self):
-        self.progressBar.setValues(messages.checking_files, 25)
-        utilities.check_dirs()
-        self.log = utilities.setup_logging(self)
-        sys.excepthook = utilities.log_uncaught_exceptions
-        utilities.check_files(self)
-        self.database_settings = dict(DatabaseInUse='sqlite')
-
-        self.progressBar.setValues(messages.checking_db_connection, 50)
-        utilities.check_db_connection(self)
-        utilities.set_default_database_configs(self)
-        utilities.check_database_updated_columns(self)
+        preflight.run(self)
 
         self.progressBar.setValues(messages.checking_new_version, 75)
         self._check_update_required()
@@ -48,15 +38,14 @@ class Launcher:
 
     ################################################################################
     def _check_update_required(self):
-        configSql = ConfigsSql(self)
-        rsConfig = configSql.get_configs()
+        settings = Settings(self).load()
 
-        if rsConfig[0]["program_version"] is None:
+        if settings.program_version is None:
             self.client_version = constants.VERSION
         else:
-            self.client_version = rsConfig[0]["program_version"]
+            self.client_version = settings.program_version
 
-        if rsConfig[0]["check_program_updates"].upper() == "Y":
+        if settings.check_program_updates:
             new_version_obj = utilities.check_new_program_version(self)
             if new_version_obj.new_version_available:
                 self.new_version = new_version_obj.new_version
@@ -77,31 +66,26 @@ class Launcher:
                 self.form.setWindowTitle(_translate("Main", new_title))
                 return
 
-        program_url = f"{constants.GITHUB_EXE_PROGRAM_URL}{self.new_version}/{constants.EXE_PROGRAM_NAME}"
         downloaded_program_path = f"{utilities.get_current_path()}\\{constants.EXE_PROGRAM_NAME}"
-
-        r = requests.get(program_url)
-        if r.status_code == 200:
-            with open(downloaded_program_path, 'wb') as outfile:
-                outfile.write(r.content)
+        try:
+            self_update.update_program(self.client_version, self.new_version, downloaded_program_path)
             utilities.show_message_window("Info", "INFO", f"{messages.program_updated}v{self.new_version}")
-        else:
+        except (OSError, self_update.UpdateError, requests.exceptions.RequestException) as e:
             utilities.show_message_window("error", "ERROR", f"{messages.error_dl_new_version}")
-            self.log.error(f"{messages.error_dl_new_version} {r.status_code} {r}")
+            self.log.error(f"{messages.error_dl_new_version} {e}")
 
     ################################################################################
     def _call_program(self):
-        code = None
-        cmd = [f"{os.path.abspath(os.getcwd())}\\{constants.EXE_PROGRAM_NAME}"]
+        # the token tells the program that files and database were already checked by this version
+        cmd = [f"{os.path.abspath(os.getcwd())}\\{constants.EXE_PROGRAM_NAME}",
+               f"{constants.PREFLIGHT_ARG}={constants.VERSION}"]
+        if constants.LOG_JSON_ARG in sys.argv:
+            cmd.append(constants.LOG_JSON_ARG)
         try:
-            process = subprocess.run(cmd, shell=True, check=True, universal_newlines=True)
-            #output = process.stdout
-            code = process.returncode
-        except Exception as e:
-            emsg = None
-            if code is None:
-                code = e.returncode
-                emsg = f"cmd:{cmd} - code:{code} - {e}"
+            subprocess.run(cmd, check=True, universal_newlines=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            code = getattr(e, "returncode", None)
+            emsg = f"cmd:{cmd} - code:{code} - {e}"
             self.log.error(f"{messages.error_executing_program}{constants.EXE_PROGRAM_NAME}"
                            f" - {messages.error_check_installation} - {emsg}")
             utilities.show_message_window("error", "ERROR",
@@ -5,7 +5,8 @@ block_cipher = None
 a = Analysis(['launcher.py'],
              pathex=['*path*'],
              binaries=[],
-             datas=[],
+             datas=[('src/files/ReShadePreset.ini', 'src/files'),
+                    ('src/files/style.qss', 'src/files')],
              hiddenimports=[],
              hookspath=[],
              runtime_hooks=[],
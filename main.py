@@ -105,6 +105,21 @@ class Ui_Main(object):
         self.edit_config_button.setMinimumSize(QtCore.QSize(120, 30))
         self.edit_config_button.setMaximumSize(QtCore.QSize(120, 30))
         self.edit_config_button.setObjectName("edit_config_button")
+        self.scan_button = QtWidgets.QPushButton(self.games_tab)
+        self.scan_button.setGeometry(QtCore.QRect(20, 470, 120, 30))
+        self.scan_button.setMinimumSize(QtCore.QSize(120, 30))
+        self.scan_button.setMaximumSize(QtCore.QSize(120, 30))
+        self.scan_button.setObjectName("scan_button")
+        self.verify_button = QtWidgets.QPushButton(self.games_tab)
+        self.verify_button.setGeometry(QtCore.QRect(150, 470, 120, 30))
+        self.verify_button.setMinimumSize(QtCore.QSize(120, 30))
+        self.verify_button.setMaximumSize(QtCore.QSize(120, 30))
+        self.verify_button.setObjectName("verify_button")
+        self.preset_button = QtWidgets.QPushButton(self.games_tab)
+        self.preset_button.setGeometry(QtCore.QRect(280, 470, 120, 30))
+        self.preset_button.setMinimumSize(QtCore.QSize(120, 30))
+        self.preset_button.setMaximumSize(QtCore.QSize(120, 30))
+        self.preset_button.setObjectName("preset_button")
         self.main_tabWidget.addTab(self.games_tab, "")
         self.configs_tab = QtWidgets.QWidget()
         self.configs_tab.setObjectName("configs_tab")
@@ -181,6 +196,39 @@ class Ui_Main(object):
         self.no_silent_reshade_updates_radioButton = QtWidgets.QRadioButton(self.silent_reshade_updates_groupBox)
         self.no_silent_reshade_updates_radioButton.setGeometry(QtCore.QRect(120, 20, 45, 18))
         self.no_silent_reshade_updates_radioButton.setObjectName("no_silent_reshade_updates_radioButton")
+        self.use_hardlinks_groupBox = QtWidgets.QGroupBox(self.configs_tab)
+        self.use_hardlinks_groupBox.setGeometry(QtCore.QRect(20, 180, 175, 60))
+        self.use_hardlinks_groupBox.setObjectName("use_hardlinks_groupBox")
+        self.yes_use_hardlinks_radioButton = QtWidgets.QRadioButton(self.use_hardlinks_groupBox)
+        self.yes_use_hardlinks_radioButton.setGeometry(QtCore.QRect(10, 30, 50, 20))
+        self.yes_use_hardlinks_radioButton.setObjectName("yes_use_hardlinks_radioButton")
+        self.no_use_hardlinks_radioButton = QtWidgets.QRadioButton(self.use_hardlinks_groupBox)
+        self.no_use_hardlinks_radioButton.setGeometry(QtCore.QRect(120, 30, 50, 20))
+        self.no_use_hardlinks_radioButton.setObjectName("no_use_hardlinks_radioButton")
+        self.watch_games_groupBox = QtWidgets.QGroupBox(self.configs_tab)
+        self.watch_games_groupBox.setGeometry(QtCore.QRect(710, 180, 175, 60))
+        self.watch_games_groupBox.setObjectName("watch_games_groupBox")
+        self.yes_watch_games_radioButton = QtWidgets.QRadioButton(self.watch_games_groupBox)
+        self.yes_watch_games_radioButton.setGeometry(QtCore.QRect(10, 30, 50, 20))
+        self.yes_watch_games_radioButton.setObjectName("yes_watch_games_radioButton")
+        self.no_watch_games_radioButton = QtWidgets.QRadioButton(self.watch_games_groupBox)
+        self.no_watch_games_radioButton.setGeometry(QtCore.QRect(120, 30, 50, 20))
+        self.no_watch_games_radioButton.setObjectName("no_watch_games_radioButton")
+        self.shared_preset_groupBox = QtWidgets.QGroupBox(self.configs_tab)
+        self.shared_preset_groupBox.setGeometry(QtCore.QRect(20, 300, 175, 60))
+        self.shared_preset_groupBox.setObjectName("shared_preset_groupBox")
+        self.yes_shared_preset_radioButton = QtWidgets.QRadioButton(self.shared_preset_groupBox)
+        self.yes_shared_preset_radioButton.setGeometry(QtCore.QRect(10, 30, 50, 20))
+        self.yes_shared_preset_radioButton.setObjectName("yes_shared_preset_radioButton")
+        self.no_shared_preset_radioButton = QtWidgets.QRadioButton(self.shared_preset_groupBox)
+        self.no_shared_preset_radioButton.setGeometry(QtCore.QRect(120, 30, 50, 20))
+        self.no_shared_preset_radioButton.setObjectName("no_shared_preset_radioButton")
+        self.reshade_version_groupBox = QtWidgets.QGroupBox(self.configs_tab)
+        self.reshade_version_groupBox.setGeometry(QtCore.QRect(710, 300, 175, 60))
+        self.reshade_version_groupBox.setObjectName("reshade_version_groupBox")
+        self.reshade_version_comboBox = QtWidgets.QComboBox(self.reshade_version_groupBox)
+        self.reshade_version_comboBox.setGeometry(QtCore.QRect(10, 25, 155, 25))
+        self.reshade_version_comboBox.setObjectName("reshade_version_comboBox")
         self.main_tabWidget.addTab(self.configs_tab, "")
         self.about_tab = QtWidgets.QWidget()
         self.about_tab.setObjectName("about_tab")
@@ -255,6 +303,12 @@ class Ui_Main(object):
         item.setText(_translate("Main", "Path"))
         self.edit_config_button.setToolTip(_translate("Main", "Click to edit the game path"))
         self.edit_config_button.setText(_translate("Main", "EDIT CONFIG"))
+        self.scan_button.setToolTip(_translate("Main", "Click to scan the Steam, GOG and Epic library folders for games"))
+        self.scan_button.setText(_translate("Main", "SCAN"))
+        self.verify_button.setToolTip(_translate("Main", "Click to check that every game has the current Reshade DLL"))
+        self.verify_button.setText(_translate("Main", "VERIFY"))
+        self.preset_button.setToolTip(_translate("Main", "Click to assign a preset file to the selected game"))
+        self.preset_button.setText(_translate("Main", "PRESET"))
         self.main_tabWidget.setTabText(self.main_tabWidget.indexOf(self.games_tab), _translate("Main", "Games"))
         self.update_shaders_groupBox.setTitle(_translate("Main", "Update Shader Files"))
         self.yes_update_shaders_radioButton.setText(_translate("Main", "YES"))
@@ -279,6 +333,17 @@ class Ui_Main(object):
         self.silent_reshade_updates_groupBox.setTitle(_translate("Main", "Silent update on startup"))
         self.yes_silent_reshade_updates_radioButton.setText(_translate("Main", "YES"))
         self.no_silent_reshade_updates_radioButton.setText(_translate("Main", "NO"))
+        self.use_hardlinks_groupBox.setTitle(_translate("Main", "Use Hardlinks for DLLs"))
+        self.yes_use_hardlinks_radioButton.setText(_translate("Main", "YES"))
+        self.no_use_hardlinks_radioButton.setText(_translate("Main", "NO"))
+        self.watch_games_groupBox.setTitle(_translate("Main", "Watch Games for Updates"))
+        self.yes_watch_games_radioButton.setText(_translate("Main", "YES"))
+        self.no_watch_games_radioButton.setText(_translate("Main", "NO"))
+        self.shared_preset_groupBox.setTitle(_translate("Main", "Use a Shared Preset"))
+        self.yes_shared_preset_radioButton.setText(_translate("Main", "YES"))
+        self.no_shared_preset_radioButton.setText(_translate("Main", "NO"))
+        self.reshade_version_groupBox.setTitle(_translate("Main", "Active Reshade Version"))
+        self.reshade_version_comboBox.setToolTip(_translate("Main", "Switch to a cached Reshade version"))
         self.main_tabWidget.setTabText(self.main_tabWidget.indexOf(self.configs_tab), _translate("Main", "Configs"))
         self.about_textBrowser.setHtml(_translate("Main", "<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
 "<html><head><meta name=\"qrichtext\" content=\"1\" /><style type=\"text/css\">\n"
@@ -5,7 +5,9 @@ block_cipher = None
 a = Analysis(['main.py'],
              pathex=['*path*'],
              binaries=[],
-             datas=[],
+             datas=[('src/files/ReShadePreset.ini', 'src/files'),
+                    ('src/files/style.qss', 'src/files'),
+                    ('src/images/paypal.png', 'src/images')],
              hiddenimports=[],
              hookspath=[],
              runtime_hooks=[],
@@ -2,7 +2,10 @@ __all__ = ['databases',
            'sql',
            'ui',
            'utils',
+           'apply_plan',
            'form_events',
+           'game_config_dialog',
            'game_configs',
-           'main_src'
+           'main_src',
+           'settings'
            ]
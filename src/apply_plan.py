@@ -0,0 +1,427 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from src.sql.games_apply_state_sql import GamesApplyStateSql
+from src.sql.games_deploy_sql import GamesDeploySql
+from src.sql.presets_sql import PresetsSql
+from src.utils import constants, file_copy, file_deploy, preset_store, screenshot_dirs, utilities
+from src.utils.apply_journal import GameTransaction
+from src.utils.create_files import get_reshade_ini_content, render_reshade_ini
+
+COPY_DLL = "copy_dll"
+REMOVE_DLL = "remove_dll"
+WRITE_INI = "write_ini"
+COPY_PRESET = "copy_preset"
+_STAT_WORKERS = 16
+
+
+class ApplyPlan:
+    def __init__(self, main):
+        self.main = main
+        self.log = main.log
+        self.games = []
+        self.skipped_games = []
+        self.operations = []
+        self.screenshot_dirs = []
+        self._planned = set()
+        self._game_operations = {}
+        self._fingerprints = None
+        self._game_presets = None
+        self._shared_inputs = None
+
+    ################################################################################
+    def build(self, rs_games: dict):
+        self.add_games(get_games(rs_games))
+        return self
+
+    ################################################################################
+    def add_games(self, games: list):
+        # stat every game dir up front, in parallel, before deciding anything
+        game_dirs = sorted(set(_get_game_dir(x.path) for x in games))
+        dir_files = _list_game_dirs(game_dirs)
+        dll_sizes = _get_reshade_dll_sizes()
+        if self._fingerprints is None:
+            self._fingerprints = GamesApplyStateSql(self.main).get_fingerprints()
+            self._game_presets = PresetsSql(self.main).get_game_presets()
+            self._shared_inputs = _get_shared_inputs(self.main)
+        if self.main.settings.create_screenshots_folder:
+            missing_dirs = screenshot_dirs.get_missing_dirs([x.game_name for x in games])
+            self.screenshot_dirs += [x for x in missing_dirs if x not in self.screenshot_dirs]
+
+        for games_obj in games:
+            self._plan_game(games_obj, dir_files.get(_get_game_dir(games_obj.path), set()), dll_sizes)
+        return self
+
+    ################################################################################
+    def _plan_game(self, games_obj, files: set, dll_sizes: set):
+        game_dir = _get_game_dir(games_obj.path)
+        game_name = games_obj.game_name
+
+        if games_obj.architecture == "32bits":
+            src_path = constants.RESHADE32_PATH
+        else:
+            src_path = constants.RESHADE64_PATH
+
+        if games_obj.api == "DX9":
+            dll_name, stale_dll_name = constants.D3D9, constants.DXGI
+        else:
+            dll_name, stale_dll_name = constants.DXGI, constants.D3D9
+
+        # a preset assigned from the store replaces the default one
+        game_preset = self._game_presets.get(games_obj.id)
+        if game_preset is not None:
+            preset_src_path = preset_store.get_preset_path(game_preset["hash"])
+        else:
+            preset_src_path = constants.RESHADE_PRESET_FILENAME
+        game_preset_path = f"{game_dir}\\{constants.RESHADE_PRESET_INI}"
+
+        screenshots_path = self._plan_screenshot_path(game_dir, game_name)
+        preset_path = self._plan_preset_path(game_dir, files, game_preset)
+        local_preset = preset_path is None or preset_path == f".\\{constants.RESHADE_PRESET_INI}"
+        inputs = self._get_inputs(games_obj, game_dir, src_path, screenshots_path, preset_path, game_preset)
+        games_obj.fingerprint = json.dumps(inputs, sort_keys=True)
+
+        # every input is compared on its own, only the files of the inputs that changed
+        # since the last successful apply, or that went missing, are written again
+        reset = self.main.reset_reshade_files
+        previous = _load_fingerprint(self._fingerprints.get(games_obj.id))
+        write_dll = reset or previous.get("dll") != inputs["dll"] \
+            or not _dll_in_place(files, game_dir, dll_name, src_path)
+        write_ini = reset or previous.get("ini") != inputs["ini"] or constants.RESHADE_INI.lower() not in files
+        # a shared preset is referenced by Reshade.ini, nothing is copied. reshade saves to the
+        # game's copy, so a store preset is only copied again when another one was assigned
+        write_preset = local_preset and (reset or constants.RESHADE_PRESET_INI.lower() not in files
+                                         or previous.get("preset") != inputs["preset"])
+        if not write_dll and not write_ini and not write_preset:
+            self.skipped_games.append(games_obj)
+            return
+        self.games.append(games_obj)
+
+        if write_dll:
+            # only remove the other api dll when its size says it is one of ours
+            stale_dll_path = f"{game_dir}\\{stale_dll_name}"
+            if stale_dll_name.lower() in files and _get_size(stale_dll_path) in dll_sizes:
+                self._add(games_obj, REMOVE_DLL, None, stale_dll_path)
+            self._add(games_obj, COPY_DLL, src_path, f"{game_dir}\\{dll_name}")
+
+        if write_ini:
+            # without reset only the managed keys of an existing Reshade.ini are merged
+            merge = not reset and constants.RESHADE_INI.lower() in files
+            ini_content = get_reshade_ini_content(game_dir, screenshots_path, merge, preset_path)
+            if ini_content is not None:
+                operation = self._add(games_obj, WRITE_INI, screenshots_path,
+                                      f"{game_dir}\\{constants.RESHADE_INI}")
+                if operation is not None:
+                    # rendered once while planning, execute writes it as is
+                    operation.content = ini_content
+
+        if write_preset:
+            self._add(games_obj, COPY_PRESET, preset_src_path, game_preset_path)
+
+    ################################################################################
+    def _plan_preset_path(self, game_dir: str, files: set, game_preset):
+        # None leaves PresetPath alone, otherwise it is the value Reshade.ini has to point to
+        local_preset_path = f".\\{constants.RESHADE_PRESET_INI}"
+        if not self.main.settings.shared_preset:
+            # a game that pointed to the shared preset or the store gets its own copy back
+            ini_path = f"{game_dir}\\{constants.RESHADE_INI}"
+            current = utilities.get_ini_settings(ini_path, "GENERAL", "PresetPath")
+            if current is not None and current.lower().startswith(constants.PRESETS_PATH.lower()):
+                return local_preset_path
+            return None
+
+        # the store is never referenced, reshade would save to a file named by its content
+        if game_preset is not None:
+            return local_preset_path
+
+        # a game keeps its own preset only when it was edited to differ from the shared one
+        game_preset_path = f"{game_dir}\\{constants.RESHADE_PRESET_INI}"
+        if not self.main.reset_reshade_files and constants.RESHADE_PRESET_INI.lower() in files \
+                and _read_bytes(game_preset_path) != self._shared_inputs["shared_preset"]:
+            return local_preset_path
+        return constants.SHARED_PRESET_FILENAME
+
+    ################################################################################
+    def _get_inputs(self, games_obj, game_dir: str, src_path: str, screenshots_path: str, preset_path,
+                    game_preset):
+        # one hash per file the apply writes, for the preset only the assigned store preset counts
+        dll_inputs = [games_obj.architecture,
+                      games_obj.api,
+                      game_dir.lower(),
+                      self._shared_inputs[src_path]]
+        # the rendered template covers the shaders, screenshot and preset paths
+        ini_inputs = [game_dir.lower(),
+                      hashlib.sha1(render_reshade_ini(constants.SHADERS_SRC_PATH, screenshots_path,
+                                                      preset_path)).hexdigest()]
+        return dict(dll=_hash_inputs(dll_inputs),
+                    ini=_hash_inputs(ini_inputs),
+                    preset=game_preset["hash"] if game_preset is not None else None)
+
+    ################################################################################
+    def _plan_screenshot_path(self, game_dir: str, game_name: str):
+        if self.main.settings.create_screenshots_folder:
+            return screenshot_dirs.get_game_screenshots_path(game_name)
+
+        file = f"{game_dir}\\{constants.RESHADE_INI}"
+        reshade_config_screenshot_path = utilities.get_ini_settings(file, "GENERAL", "ScreenshotPath")
+        if reshade_config_screenshot_path is not None:
+            return reshade_config_screenshot_path
+        elif os.path.isdir(f"{constants.RESHADE_SCREENSHOT_PATH}{game_name}"):
+            return f"{constants.RESHADE_SCREENSHOT_PATH}{game_name}"
+        return ""
+
+    ################################################################################
+    def _add(self, games_obj, action: str, src, dst: str):
+        # the same file is only touched once, even if two games share a folder
+        key = (action, dst.lower())
+        if key in self._planned:
+            return None
+        self._planned.add(key)
+
+        operation = utilities.Object()
+        operation.game_id = games_obj.id
+        operation.game_name = games_obj.game_name
+        operation.action = action
+        operation.src = src
+        operation.dst = dst
+        self.operations.append(operation)
+        self._game_operations.setdefault(games_obj.id, []).append(operation)
+        return operation
+
+    ################################################################################
+    def get_game_operations(self, game_id: int):
+        return self._game_operations.get(game_id, [])
+
+    ################################################################################
+    def to_text(self):
+        lines = []
+        if len(self.screenshot_dirs) > 0:
+            lines.append("Screenshot folders:")
+            for path in self.screenshot_dirs:
+                lines.append(f"    create_dir: {path}")
+        for games_obj in self.games:
+            operations = self.get_game_operations(games_obj.id)
+            if len(operations) == 0:
+                continue
+            lines.append(f"{games_obj.game_name}:")
+            for operation in operations:
+                if operation.src:
+                    lines.append(f"    {operation.action}: {operation.src} -> {operation.dst}")
+                else:
+                    lines.append(f"    {operation.action}: {operation.dst}")
+        return "\n".join(lines)
+
+    ################################################################################
+    def execute(self, progress_callback=None, game_callback=None):
+        errors = []
+        self.failed_games = []
+        len_games = len(self.games)
+        # every missing screenshot folder of the library is created in one go
+        screenshot_dirs.create_dirs(self.screenshot_dirs)
+        if self.main.settings.shared_preset:
+            ensure_shared_preset()
+        # our own writes are not game updates
+        self.main.game_watcher.pause()
+        try:
+            with file_copy.SyncBatch():
+                for i, games_obj in enumerate(self.games):
+                    if progress_callback is not None:
+                        progress_callback(int(100 * i / len_games))
+                    result = self.execute_game(games_obj)
+                    if len(result) > 0:
+                        errors.append(result)
+                        self.failed_games.append(games_obj)
+                    if game_callback is not None:
+                        game_callback(games_obj, result)
+        finally:
+            self.main.game_watcher.resume(sorted(set(_get_game_dir(x.path) for x in self.games)))
+
+        # remember what every applied game was built from, the next apply skips it if nothing changed
+        failed_ids = set(x.id for x in self.failed_games)
+        states = []
+        for games_obj in [x for x in self.games if x.id not in failed_ids]:
+            state_obj = utilities.Object()
+            state_obj.game_id = games_obj.id
+            state_obj.fingerprint = games_obj.fingerprint
+            states.append(state_obj)
+        GamesApplyStateSql(self.main).update_fingerprints(states)
+        return errors
+
+    ################################################################################
+    def execute_game(self, games_obj):
+        # a game is applied completely or not at all
+        errors = ""
+        transaction = GameTransaction(games_obj.id, games_obj.game_name)
+        try:
+            transaction.begin()
+            for operation in self.get_game_operations(games_obj.id):
+                self._execute_operation(operation, transaction)
+            # commit drops the backups, the new files have to be on disk before that
+            file_copy.flush_batch()
+            transaction.commit()
+        except Exception as e:
+            transaction.rollback()
+            if isinstance(e, OSError) and e.strerror is not None:
+                error = e.strerror.lower()
+            else:
+                error = str(e)
+            self.log.error(f"apply:[{games_obj.game_name}:][{error}]")
+            errors = f"- {games_obj.game_name}: {error}"
+        return errors
+
+    ################################################################################
+    def _execute_operation(self, operation, transaction):
+        if operation.action == REMOVE_DLL:
+            if os.path.isfile(operation.dst):
+                transaction.remove(operation.dst)
+        elif operation.action == COPY_DLL:
+            tmp_path = transaction.stage(operation.dst)
+            deploy_dll(self.main, operation.game_id, operation.src, tmp_path)
+            transaction.replace(operation.dst)
+        elif operation.action == WRITE_INI:
+            tmp_path = transaction.stage(operation.dst)
+            with open(tmp_path, mode="wb") as file:
+                file.write(operation.content)
+            file_copy.sync_file(tmp_path)
+            transaction.replace(operation.dst)
+        elif operation.action == COPY_PRESET:
+            tmp_path = transaction.stage(operation.dst)
+            file_copy.copy_file(operation.src, tmp_path, fsync=True)
+            transaction.replace(operation.dst)
+
+
+################################################################################
+def get_games(rs_games: dict):
+    games = []
+    for i in range(len(rs_games)):
+        games_obj = utilities.Object()
+        games_obj.id = rs_games[i]["id"]
+        games_obj.game_name = rs_games[i]["name"]
+        games_obj.architecture = rs_games[i]["architecture"]
+        games_obj.api = rs_games[i]["api"]
+        games_obj.path = rs_games[i]["path"]
+        games.append(games_obj)
+    return games
+
+
+################################################################################
+def deploy_dll(self, game_id, src_path, dst_path):
+    games_deploy_sql = GamesDeploySql(self)
+    known_method = games_deploy_sql.get_deploy_method(game_id)
+    method = file_deploy.deploy_file(src_path, dst_path, self.settings.use_hardlinks, known_method, fsync=True)
+
+    if self.settings.use_hardlinks and method != known_method:
+        deploy_obj = utilities.Object()
+        deploy_obj.game_id = game_id
+        deploy_obj.deploy_method = method
+        games_deploy_sql.update_deploy_method(deploy_obj)
+
+
+################################################################################
+def _get_game_dir(game_path: str):
+    return '\\'.join(game_path.split("\\")[:-1])
+
+
+################################################################################
+def _list_game_dir(game_dir: str):
+    try:
+        with os.scandir(game_dir) as it:
+            return game_dir, set(x.name.lower() for x in it)
+    except OSError:
+        return game_dir, set()
+
+
+################################################################################
+def _list_game_dirs(game_dirs: list):
+    if len(game_dirs) == 0:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(_STAT_WORKERS, len(game_dirs))) as executor:
+        return dict(executor.map(_list_game_dir, game_dirs))
+
+
+################################################################################
+def _get_size(path: str):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+################################################################################
+def _dll_in_place(files: set, game_dir: str, dll_name: str, src_path: str):
+    if dll_name.lower() not in files:
+        return False
+    return _get_size(f"{game_dir}\\{dll_name}") == _get_size(src_path)
+
+
+################################################################################
+def _hash_inputs(inputs: list):
+    return hashlib.sha1("|".join(str(x) for x in inputs).encode("utf-8")).hexdigest()
+
+
+################################################################################
+def _load_fingerprint(fingerprint):
+    # fingerprints of older versions were a single hash, those games are planned once in full
+    try:
+        inputs = json.loads(fingerprint)
+    except (TypeError, ValueError):
+        return {}
+    return inputs if isinstance(inputs, dict) else {}
+
+
+################################################################################
+def _get_shared_inputs(main):
+    # inputs every game shares, read once per plan
+    inputs = {}
+    for path in (constants.RESHADE32_PATH, constants.RESHADE64_PATH):
+        try:
+            st = os.stat(path)
+            inputs[path] = f"{main.reshade_version}:{st.st_size}:{st.st_mtime_ns}"
+        except OSError:
+            inputs[path] = None
+    if main.settings.shared_preset:
+        shared_preset = _read_bytes(constants.SHARED_PRESET_FILENAME)
+        if shared_preset is None:
+            shared_preset = _read_bytes(constants.RESHADE_PRESET_FILENAME)
+        inputs["shared_preset"] = shared_preset
+    return inputs
+
+
+################################################################################
+def ensure_shared_preset():
+    # the shared preset starts as a copy of the default one
+    if os.path.isfile(constants.SHARED_PRESET_FILENAME) or not os.path.isfile(constants.RESHADE_PRESET_FILENAME):
+        return
+    if not os.path.isdir(constants.PRESETS_PATH):
+        os.makedirs(constants.PRESETS_PATH)
+    file_copy.copy_file(constants.RESHADE_PRESET_FILENAME, constants.SHARED_PRESET_FILENAME, fsync=True)
+
+
+################################################################################
+def _read_bytes(path: str):
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+################################################################################
+def _get_reshade_dll_sizes():
+    sizes = set()
+    for path in (constants.RESHADE32_PATH, constants.RESHADE64_PATH):
+        size = _get_size(path)
+        if size is not None:
+            sizes.add(size)
+    return sizes
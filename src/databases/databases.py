@@ -32,10 +32,10 @@ class Databases:
     def execute(self, sql):
         if self.database_in_use == "sqlite":
             sqlite3 = Sqlite3(self.main)
-            sqlite3.executescript(sql)
+            return sqlite3.executescript(sql)
         elif self.database_in_use == "postgres":
             postgreSQL = PostgreSQL(self.main)
-            postgreSQL.execute(sql)
+            return postgreSQL.execute(sql)
 
     ################################################################################
     def select(self, sql):
@@ -15,9 +15,14 @@ import requests
 from PyQt5 import QtCore, QtWidgets
 from PyQt5.QtGui import QDesktopServices
 
-from src.sql.configs_sql import ConfigsSql
+from src.apply_plan import ApplyPlan, deploy_dll, ensure_shared_preset, get_games
+from src.sql.apply_jobs_sql import ApplyJobsSql
+from src.sql.games_apply_state_sql import GamesApplyStateSql
+from src.sql.games_deploy_sql import GamesDeploySql
 from src.sql.games_sql import GamesSql
-from src.utils import constants, messages, utilities
+from src.sql.presets_sql import PresetsSql
+from src.utils import apply_journal, constants, dll_verify, file_copy, library_scanner, messages, prefetch, \
+    preset_store, reshade_cache, screenshot_dirs, utilities
 from src.utils.create_files import CreateFiles
 
 
@@ -59,6 +64,63 @@ class FormEvents:
             else:
                 utilities.show_message_window("error", "ERROR", f"{messages.not_valid_game}")
 
+    ################################################################################
+    def scan_library(self):
+        if self.library_scan is not None:
+            return
+        root_dirs = library_scanner.get_library_roots()
+        if len(root_dirs) == 0:
+            utilities.show_message_window("info", "INFO", messages.library_not_found)
+            library_dir = utilities.open_get_directory()
+            if library_dir is None:
+                return
+            root_dirs = [library_dir]
+
+        self.progressBar.setValues(messages.scanning_library, 50)
+        # the folders are walked off the gui thread, the timer picks up the result
+        self.qtObj.scan_button.setEnabled(False)
+        self.library_scan = library_scanner.LibraryScan(root_dirs).start()
+        if self.scan_timer is None:
+            self.scan_timer = QtCore.QTimer()
+            self.scan_timer.timeout.connect(lambda: FormEvents.check_library_scan(self))
+        self.scan_timer.start(constants.SCAN_TIMER_MSEC)
+
+    ################################################################################
+    def check_library_scan(self):
+        if self.library_scan is None or not self.library_scan.is_done():
+            return
+        self.scan_timer.stop()
+        scanned_games = self.library_scan.games
+        self.library_scan = None
+        self.qtObj.scan_button.setEnabled(True)
+
+        games_sql = GamesSql(self)
+        rs_all_games = games_sql.get_games()
+        known_paths = set()
+        if rs_all_games is not None:
+            known_paths = set(rs_all_games[i]["path"].lower() for i in range(len(rs_all_games)))
+        new_games = []
+        for games_obj in scanned_games:
+            if games_obj.path.lower() in known_paths:
+                continue
+            known_paths.add(games_obj.path.lower())
+            # exe headers did not tell, most games today are 64bits dx11
+            if games_obj.architecture is None:
+                games_obj.architecture = "64bits"
+            if games_obj.api is None:
+                games_obj.api = "DX11"
+            new_games.append(games_obj)
+
+        if len(new_games) > 0:
+            games_sql.insert_games(new_games)
+            self.populate_programs_listWidget()
+        self.progressBar.close()
+
+        if len(new_games) == 0:
+            utilities.show_message_window("info", "INFO", messages.no_new_games_found)
+        else:
+            utilities.show_message_window("info", "SUCCESS", f"{messages.games_imported}{len(new_games)}")
+
     ################################################################################
     def delete_game(self):
         self.enable_widgets(True)
@@ -149,13 +211,17 @@ class FormEvents:
                 games_obj.path = new_game_path
                 games_sql.update_game_path(games_obj)
 
+                # new path may be on another volume, detect the deploy method again
+                games_deploy_sql = GamesDeploySql(self)
+                games_deploy_sql.delete_deploy_method(games_obj.id)
+
                 # create Reshade.ini to replace edit CurrentPresetPath
                 game_screenshots_path = _get_screenshot_path(self, new_game_path, self.selected_game.name)
                 self.selected_game.game_dir = '\\'.join(new_game_path.split("\\")[:-1])
 
                 try:
                     create_files = CreateFiles(self)
-                    create_files.create_reshade_ini_file(self.selected_game.game_dir, game_screenshots_path)
+                    create_files.create_reshade_ini_file(self.selected_game.game_dir, game_screenshots_path, merge=True)
                 except Exception as e:
                     self.log.error(f"create_files: {e}")
 
@@ -180,9 +246,23 @@ class FormEvents:
             except Exception as e:
                 self.log.error(f"create_files: {e}")
 
+            # with a shared preset, editing a game gives it its own copy to override it
+            preset_src_path = constants.RESHADE_PRESET_FILENAME
+            if self.settings.shared_preset:
+                preset_src_path = constants.SHARED_PRESET_FILENAME
+
             try:
-                if not os.path.exists(res_plug_ini_path) and os.path.exists(constants.RESHADE_PRESET_FILENAME):
-                    shutil.copyfile(constants.RESHADE_PRESET_FILENAME, res_plug_ini_path)
+                if self.settings.shared_preset:
+                    ensure_shared_preset()
+                if not os.path.exists(res_plug_ini_path) and os.path.exists(preset_src_path):
+                    file_copy.copy_file(preset_src_path, res_plug_ini_path)
+                if self.settings.shared_preset:
+                    game_screenshots_path = utilities.get_ini_settings(f"{game_path}\\{constants.RESHADE_INI}",
+                                                                       "SCREENSHOTS", "SavePath")
+                    if game_screenshots_path is not None:
+                        create_files = CreateFiles(self)
+                        create_files.create_reshade_ini_file(game_path, game_screenshots_path, merge=True,
+                                                             preset_path=f".\\{constants.RESHADE_PRESET_INI}")
             except Exception as e:
                 self.log.error(f"{e}")
 
@@ -194,6 +274,45 @@ class FormEvents:
 
         self.enable_widgets(False)
 
+    ################################################################################
+    def assign_preset(self):
+        self.enable_widgets(True)
+        if self.selected_game is not None and len(self.selected_game.rs) > 0:
+            preset_file = utilities.open_get_filename("ini(*.ini)", constants.PRESETS_PATH)
+            if preset_file is not None:
+                # the file name is the preset name, the same content is only stored once
+                preset_obj = utilities.Object()
+                preset_obj.name = os.path.splitext(os.path.basename(preset_file))[0]
+                presets_sql = PresetsSql(self)
+                try:
+                    preset_obj.hash = preset_store.add_preset_file(preset_file)
+                    presets_sql.update_preset(preset_obj)
+                    _remove_unused_presets(self)
+                except OSError as e:
+                    self.log.error(f"assign_preset: {e}")
+                    utilities.show_message_window("error", "ERROR", f"{e.strerror}")
+                    self.enable_widgets(False)
+                    return
+
+                game_preset_obj = utilities.Object()
+                game_preset_obj.game_id = self.selected_game.rs[0]["id"]
+                game_preset_obj.name = preset_obj.name
+                presets_sql.update_game_preset(game_preset_obj)
+
+                games_obj = utilities.Object()
+                games_obj.id = self.selected_game.rs[0]["id"]
+                games_obj.game_name = self.selected_game.rs[0]["name"]
+                games_obj.architecture = self.selected_game.rs[0]["architecture"]
+                games_obj.api = self.selected_game.rs[0]["api"]
+                games_obj.path = self.selected_game.rs[0]["path"]
+                errors = _apply_single(self, games_obj)
+                if len(errors) > 0:
+                    utilities.show_message_window("error", "ERROR", f"{messages.apply_success_with_errors}\n\n{errors}")
+                else:
+                    utilities.show_message_window("info", "SUCCESS", f"{messages.preset_assigned}\n\n"
+                                                                     f"{games_obj.game_name}: {preset_obj.name}")
+        self.enable_widgets(False)
+
     ################################################################################
     def edit_default_config_file(self):
         try:
@@ -203,114 +322,123 @@ class FormEvents:
         except Exception as e:
             self.log.error(f"{e}")
 
+        # with a shared preset this is the file every game reads
+        preset_path = constants.RESHADE_PRESET_FILENAME
+        if self.settings.shared_preset:
+            try:
+                ensure_shared_preset()
+                preset_path = constants.SHARED_PRESET_FILENAME
+            except OSError as e:
+                self.log.error(f"{e}")
+
         try:
-            os.startfile(f"\"{constants.RESHADE_PRESET_FILENAME}\"")
+            os.startfile(f"\"{preset_path}\"")
         except Exception as e:
             err_msg = f"{e.strerror}\n\n{constants.RESHADE_PRESET_INI}{messages.not_found}"
             utilities.show_message_window("error", "ERROR", err_msg)
 
     ################################################################################
     def dark_theme_clicked(self, status: str):
-        if status == "YES":
-            self.set_style_sheet(True)
-            self.use_dark_theme = True
-            status = "Y"
-        else:
-            self.set_style_sheet(False)
-            self.use_dark_theme = False
-            status = "N"
-
-        config_sql = ConfigsSql(self)
-        configs_obj = utilities.Object()
-        configs_obj.status = status
-        config_sql.update_dark_theme(configs_obj)
+        self.settings.use_dark_theme = status == "YES"
+        self.set_style_sheet(self.settings.use_dark_theme)
 
     ################################################################################
     def check_program_updates_clicked(self, status: str):
-        if status == "YES":
-            self.check_program_updates = True
-            status = "Y"
-        else:
-            self.check_program_updates = False
-            status = "N"
-
-        config_sql = ConfigsSql(self)
-        configs_obj = utilities.Object()
-        configs_obj.status = status
-        config_sql.update_check_program_updates(configs_obj)
+        self.settings.check_program_updates = status == "YES"
 
     ################################################################################
     def check_reshade_updates_clicked(self, status: str):
-        if status == "YES":
-            self.check_reshade_updates = True
-            status = "Y"
-        else:
-            self.check_reshade_updates = False
-            status = "N"
+        self.settings.check_reshade_updates = status == "YES"
+        self.qtObj.silent_reshade_updates_groupBox.setEnabled(self.settings.check_reshade_updates)
+        self.qtObj.silent_reshade_updates_groupBox.setVisible(self.settings.check_reshade_updates)
 
-        self.qtObj.silent_reshade_updates_groupBox.setEnabled(self.check_reshade_updates)
-        self.qtObj.silent_reshade_updates_groupBox.setVisible(self.check_reshade_updates)
+    ################################################################################
+    def silent_reshade_updates_clicked(self, status: str):
+        self.settings.silent_reshade_updates = status == "YES"
 
-        config_sql = ConfigsSql(self)
-        configs_obj = utilities.Object()
-        configs_obj.status = status
-        config_sql.update_check_resahde_updates(configs_obj)
+    ################################################################################
+    def update_shaders_clicked(self, status: str):
+        self.settings.update_shaders = status == "YES"
 
     ################################################################################
-    def silent_reshade_updates_clicked(self, status: str):
-        if status == "YES":
-            self.silent_reshade_updates = True
-            status = "Y"
-        else:
-            self.silent_reshade_updates = False
-            status = "N"
+    def create_screenshots_folder_clicked(self, status: str):
+        self.settings.create_screenshots_folder = status == "YES"
 
-        config_sql = ConfigsSql(self)
-        configs_obj = utilities.Object()
-        configs_obj.status = status
-        config_sql.update_silent_reshade_updates(configs_obj)
+    ################################################################################
+    def reset_reshade_files_clicked(self, status: str):
+        self.settings.reset_reshade_files = status == "YES"
+        self.reset_reshade_files = self.settings.reset_reshade_files
 
     ################################################################################
-    def update_shaders_clicked(self, status: str):
-        if status == "YES":
-            self.update_shaders = True
-            status = "Y"
-        else:
-            self.update_shaders = False
-            status = "N"
+    def use_hardlinks_clicked(self, status: str):
+        self.settings.use_hardlinks = status == "YES"
 
-        config_sql = ConfigsSql(self)
-        configs_obj = utilities.Object()
-        configs_obj.status = status
-        config_sql.update_shaders(configs_obj)
+    ################################################################################
+    def watch_games_clicked(self, status: str):
+        self.settings.watch_games = status == "YES"
+        self.set_game_watcher(self.settings.watch_games)
 
     ################################################################################
-    def create_screenshots_folder_clicked(self, status: str):
-        if status == "YES":
-            self.create_screenshots_folder = True
-            status = "Y"
-        else:
-            self.create_screenshots_folder = False
-            status = "N"
+    def shared_preset_clicked(self, status: str):
+        self.settings.shared_preset = status == "YES"
 
-        config_sql = ConfigsSql(self)
-        configs_obj = utilities.Object()
-        configs_obj.status = status
-        config_sql.update_create_screenshots_folder(configs_obj)
+    ################################################################################
+    def repair_changed_games(self):
+        game_ids = set()
+        while not self.game_watcher.changed.empty():
+            game_ids.add(self.game_watcher.changed.get_nowait())
+        if len(game_ids) == 0 or not self.qtObj.apply_button.isEnabled():
+            # nothing to do, or an apply is running and will write the files anyway
+            return
+
+        games_sql = GamesSql(self)
+        rs_all_games = games_sql.get_games()
+        if rs_all_games is None:
+            return
+        rs_games = [rs_all_games[i] for i in range(len(rs_all_games)) if rs_all_games[i]["id"] in game_ids]
+        if len(rs_games) == 0:
+            return
+
+        # only the games whose files were touched are applied again, their configs are kept
+        reset_reshade_files = self.reset_reshade_files
+        self.reset_reshade_files = False
+        try:
+            plan = ApplyPlan(self).build(dict(enumerate(rs_games)))
+            errors = plan.execute()
+        finally:
+            self.reset_reshade_files = reset_reshade_files
+        for games_obj in plan.games:
+            self.log.info(f"game_watcher: re-applied {games_obj.game_name}")
+        for error in errors:
+            self.log.error(f"game_watcher: {error}")
 
     ################################################################################
-    def reset_reshade_files_clicked(self, status: str):
-        if status == "YES":
-            self.reset_reshade_files = True
-            status = "Y"
-        else:
-            self.reset_reshade_files = False
-            status = "N"
+    def reshade_version_changed(self):
+        version = self.qtObj.reshade_version_comboBox.currentText()
+        if len(version) == 0 or version == self.reshade_version:
+            return
 
-        config_sql = ConfigsSql(self)
-        configs_obj = utilities.Object()
-        configs_obj.status = status
-        config_sql.update_reset_reshade_files(configs_obj)
+        # rollback is a local copy, no download
+        try:
+            reshade_cache.activate_version(version)
+        except (OSError, ValueError) as e:
+            self.log.error(f"reshade_cache: {e}")
+            utilities.show_message_window("error", "ERROR", f"{e}")
+            self.populate_reshade_versions()
+            return
+
+        # anything but the newest build is a rollback, it is kept until the newest one is picked again
+        newest_version = self.qtObj.reshade_version_comboBox.itemText(0)
+        self.settings.pinned_reshade_version = version if version != newest_version else ""
+        self.settings.reshade_version = version
+        self.reshade_version = version
+        self.local_reshade_exe = f"{constants.PROGRAM_PATH}\\ReShade_Setup_{version}.exe"
+        self.qtObj.reshade_version_label.setText(f"{messages.info_reshade_version}{version}")
+
+        msg = f"{messages.reshade_version_switched}{version}\n\n{messages.apply_all_question}"
+        reply = utilities.show_message_window("question", "Reshade Version", msg)
+        if reply == QtWidgets.QMessageBox.Yes:
+            FormEvents.apply_all(self)
 
     ################################################################################
     def programs_tableWidget_clicked(self, item):
@@ -363,139 +491,180 @@ class FormEvents:
                     self.reset_reshade_files = False
 
             if rs_all_games is not None:
-                self.enable_form(False)
-                self.enable_widgets(False)
-                self.qtObj.apply_button.setEnabled(False)
+                if self.dry_run:
+                    _show_apply_plan(self, rs_all_games)
+                    return
 
-                # download shaders
-                _download_shaders(self)
+                # a new apply replaces any interrupted one
+                apply_jobs_sql = ApplyJobsSql(self)
+                apply_jobs_sql.cancel_unfinished_jobs()
+                job_obj = utilities.Object()
+                job_obj.reset_reshade_files = "Y" if self.reset_reshade_files else "N"
+                job_id = apply_jobs_sql.create_job(job_obj)
+                _run_apply_job(self, job_id, rs_all_games)
 
-                # begin games update section
-                errors = []
-                games_obj = utilities.Object()
-                self.progressBar.setValues(messages.copying_DLLs, 0)
-                for i in range(len(rs_all_games)):
-                    self.progressBar.setValues(messages.copying_DLLs, 100 / len_games)
-                    games_obj.api = rs_all_games[i]["api"]
-                    games_obj.architecture = rs_all_games[i]["architecture"]
-                    games_obj.game_name = rs_all_games[i]["name"]
-                    games_obj.path = rs_all_games[i]["path"]
-                    len_games = len_games - 1
-                    result = _apply_single(self, games_obj)
-                    if len(result) > 0:
-                        errors.append(result)
-
-                self.enable_form(True)
-                self.qtObj.apply_button.setEnabled(True)
-
-                if len(errors) == 0 and self.need_apply is False:
-                    utilities.show_message_window("info", "SUCCESS", f"{messages.apply_success}")
-                elif len(errors) > 0:
-                    err = '\n'.join(errors)
-                    utilities.show_message_window("error", "ERROR", f"{messages.apply_success_with_errors}\n\n{err}")
+    ################################################################################
+    def verify_all(self):
+        games_sql = GamesSql(self)
+        rs_all_games = games_sql.get_games()
+        if rs_all_games is None or len(rs_all_games) == 0:
+            return
+
+        self.progressBar.setValues(messages.verifying_dlls, 50)
+        results = dll_verify.verify_games(get_games(rs_all_games))
+        self.progressBar.close()
+
+        bad_results = [x for x in results if x.status != dll_verify.STATUS_OK]
+        for result in bad_results:
+            self.log.info(f"verify:[{result.game_name}:][{result.status}][{result.dll_path}]")
+        if len(bad_results) == 0:
+            utilities.show_message_window("info", "SUCCESS", messages.verify_all_ok)
+            return
+
+        report = '\n'.join(f"- {x.game_name}: {x.status}" for x in bad_results)
+        # foreign dlls are someone else's, they are only reported
+        fix_ids = set(x.game_id for x in bad_results if x.status != dll_verify.STATUS_FOREIGN)
+        if len(fix_ids) == 0:
+            utilities.show_message_window("info", "INFO", f"{messages.verify_report}\n\n{report}")
+            return
+
+        msg = f"{messages.verify_report}\n\n{report}\n\n{messages.verify_reapply_question}"
+        reply = utilities.show_message_window("question", "VERIFY", msg)
+        if reply == QtWidgets.QMessageBox.Yes:
+            # what the last apply recorded does not match the files anymore, the games are planned again
+            games_apply_state_sql = GamesApplyStateSql(self)
+            for game_id in fix_ids:
+                games_apply_state_sql.delete_fingerprint(game_id)
+
+            # a repair is an apply of those games only, with the same job and recovery
+            apply_jobs_sql = ApplyJobsSql(self)
+            apply_jobs_sql.cancel_unfinished_jobs()
+            job_obj = utilities.Object()
+            job_obj.reset_reshade_files = "N"
+            job_obj.game_ids = sorted(fix_ids)
+            job_id = apply_jobs_sql.create_job(job_obj)
+            rs_games = [rs_all_games[i] for i in range(len(rs_all_games)) if rs_all_games[i]["id"] in fix_ids]
+            reset_reshade_files = self.reset_reshade_files
+            self.reset_reshade_files = False
+            _run_apply_job(self, job_id, dict(enumerate(rs_games)))
+            self.reset_reshade_files = reset_reshade_files
 
-                self.progressBar.close()
+    ################################################################################
+    def resume_apply(self, job: dict):
+        apply_jobs_sql = ApplyJobsSql(self)
+        rs_games = apply_jobs_sql.get_pending_games(job["id"])
+        if rs_games is None or len(rs_games) == 0:
+            job_obj = utilities.Object()
+            job_obj.job_id = job["id"]
+            job_obj.status = "done"
+            apply_jobs_sql.update_job_status(job_obj)
+            return
+
+        # resume with the same reset choice the job was started with
+        reset_reshade_files = self.reset_reshade_files
+        self.reset_reshade_files = job["reset_reshade_files"] == "Y"
+        _run_apply_job(self, job["id"], rs_games)
+        self.reset_reshade_files = reset_reshade_files
 
     ################################################################################
     def game_config_form(self, status: str):
         if status == "OK":
             self.progressBar.setValues(messages.copying_DLLs, 50)
-            if self.game_config_form.qtObj.game_name_lineEdit.text() == "":
+            games_obj = utilities.Object()
+            games_obj.game_name = self.game_config_form.get_game_name()
+            games_obj.architecture = self.game_config_form.get_architecture()
+            games_obj.api = self.game_config_form.get_api()
+
+            if games_obj.game_name == "":
                 self.progressBar.close()
                 utilities.show_message_window("error", "ERROR", messages.missing_game_name)
                 return
 
-            if not self.game_config_form.qtObj.radioButton_32bits.isChecked() \
-                    and not self.game_config_form.qtObj.radioButton_64bits.isChecked():
+            if games_obj.architecture is None:
                 self.progressBar.close()
                 utilities.show_message_window("error", "ERROR", messages.missing_architecture)
                 return
 
-            if not self.game_config_form.qtObj.dx9_radioButton.isChecked() \
-                    and not self.game_config_form.qtObj.dx11_radioButton.isChecked():
+            if games_obj.api is None:
                 self.progressBar.close()
                 utilities.show_message_window("error", "ERROR", messages.missing_api)
                 return
 
-            games_obj = utilities.Object()
-            games_obj.game_name = self.game_config_form.qtObj.game_name_lineEdit.text()
-
-            if self.game_config_form.qtObj.radioButton_32bits.isChecked():
-                games_obj.architecture = "32bits"
+            if games_obj.architecture == "32bits":
                 src_path = constants.RESHADE32_PATH
             else:
-                games_obj.architecture = "64bits"
                 src_path = constants.RESHADE64_PATH
 
             games_sql = GamesSql(self)
             if self.selected_game is not None:
-                if self.game_config_form.qtObj.dx9_radioButton.isChecked():
-                    games_obj.api = "DX9"
+                if games_obj.api == "DX9":
                     dst_path = os.path.join(self.selected_game.game_dir, constants.D3D9)
                 else:
-                    games_obj.api = "DX11"
                     dst_path = os.path.join(self.selected_game.game_dir, constants.DXGI)
 
+                games_obj.id = self.selected_game.rs[0]["id"]
+                # the row is written before any file, a watcher repair in between uses the new api
+                games_sql.update_game(games_obj)
+
                 # checking name / api / architecture changes
                 if self.selected_game.rs[0]["name"] != games_obj.game_name \
                     or (self.selected_game.rs[0]["architecture"] != games_obj.architecture) \
                         or (self.selected_game.rs[0]["api"] != games_obj.api):
-
-                    # checking name changes
-                    # create Reshade.ini to replace edit CurrentPresetPath
-                    old_screenshots_path = _get_screenshot_path(self, self.selected_game.game_dir, self.selected_game.name)
-                    if len(old_screenshots_path) > 0:
-                        t_path = '\\'.join(old_screenshots_path.split('\\')[:-1])
-                        new_screenshots_path = f"{t_path}\\{games_obj.game_name}"
-                    else:
-                        new_screenshots_path = ""
-
-                    try:
-                        create_files = CreateFiles(self)
-                        create_files.create_reshade_ini_file(self.selected_game.game_dir, new_screenshots_path)
-                    except Exception as e:
-                        self.log.error(f"create_reshade_ini_file: {e}")
-
-                    try:
-                        # rename screenshot folder
-                        if os.path.isdir(old_screenshots_path):
-                            os.rename(old_screenshots_path, f"{new_screenshots_path}")
-                    except OSError as e:
-                        self.log.error(f"rename_screenshot_dir: {e}")
-
-                    # checking api / architecture changes
-                    # deleting any Reshade.dll
-                    reshade32_game_path = os.path.join(self.selected_game.game_dir, constants.D3D9)
-                    reshade64_game_path = os.path.join(self.selected_game.game_dir, constants.DXGI)
+                    self.game_watcher.pause()
                     try:
-                        if os.path.isfile(reshade32_game_path):
-                            os.remove(reshade32_game_path)
-                        if os.path.isfile(reshade64_game_path):
-                            os.remove(reshade64_game_path)
-                    except OSError as e:
-                        self.log.error(f"remove_reshade_file: {e}")
-
-                    try:
-                        # creating Reshade.dll
-                        shutil.copyfile(src_path, dst_path)
-                    except shutil.Error as e:
-                        self.log.error(f"copyfile: {src_path} to {dst_path} - {e}")
+                        # checking name changes
+                        # create Reshade.ini to replace edit CurrentPresetPath
+                        old_screenshots_path = _get_screenshot_path(self, self.selected_game.game_dir, self.selected_game.name)
+                        if len(old_screenshots_path) > 0:
+                            t_path = '\\'.join(old_screenshots_path.split('\\')[:-1])
+                            new_screenshots_path = f"{t_path}\\{games_obj.game_name}"
+                        else:
+                            new_screenshots_path = ""
+
+                        try:
+                            create_files = CreateFiles(self)
+                            create_files.create_reshade_ini_file(self.selected_game.game_dir, new_screenshots_path, merge=True)
+                        except Exception as e:
+                            self.log.error(f"create_reshade_ini_file: {e}")
+
+                        try:
+                            # rename screenshot folder
+                            screenshot_dirs.rename_dir(old_screenshots_path, new_screenshots_path)
+                        except OSError as e:
+                            self.log.error(f"rename_screenshot_dir: {e}")
+
+                        # checking api / architecture changes
+                        # deleting any Reshade.dll
+                        reshade32_game_path = os.path.join(self.selected_game.game_dir, constants.D3D9)
+                        reshade64_game_path = os.path.join(self.selected_game.game_dir, constants.DXGI)
+                        try:
+                            if os.path.isfile(reshade32_game_path):
+                                os.remove(reshade32_game_path)
+                            if os.path.isfile(reshade64_game_path):
+                                os.remove(reshade64_game_path)
+                        except OSError as e:
+                            self.log.error(f"remove_reshade_file: {e}")
+
+                        try:
+                            # creating Reshade.dll
+                            deploy_dll(self, self.selected_game.rs[0]["id"], src_path, dst_path)
+                        except OSError as e:
+                            self.log.error(f"copyfile: {src_path} to {dst_path} - {e}")
+                    finally:
+                        rs_all_games = games_sql.get_games()
+                        if rs_all_games is not None:
+                            self.game_watcher.set_games(rs_all_games)
+                        self.game_watcher.resume([self.selected_game.game_dir])
 
                     utilities.show_message_window("info", "SUCCESS", f"{messages.game_updated}\n\n"
                                                                      f"{games_obj.game_name}")
 
-                games_obj.id = self.selected_game.rs[0]["id"]
-                games_sql.update_game(games_obj)
                 self.progressBar.close()
             else:
                 # new game added
-                if self.game_config_form.qtObj.dx9_radioButton.isChecked():
-                    games_obj.api = "DX9"
-                else:
-                    games_obj.api = "DX11"
-
                 games_obj.path = self.added_game_path
                 games_sql.insert_game(games_obj)
+                games_obj.id = games_sql.get_game_by_path(games_obj.path)[0]["id"]
                 del self.added_game_path
                 _download_shaders(self)
                 self.progressBar.close()
@@ -509,23 +678,131 @@ class FormEvents:
             self.game_config_form.close()
 
 
+################################################################################
+def _show_apply_plan(self, rs_games):
+    self.progressBar.setValues(messages.copying_DLLs, 0)
+    plan = ApplyPlan(self).build(rs_games)
+    plan_text = plan.to_text()
+    self.progressBar.close()
+    self.log.info(f"apply dry-run:\n{plan_text}")
+    summary = f"{messages.dry_run_games}{len(plan.games)}\n" \
+              f"{messages.dry_run_skipped_games}{len(plan.skipped_games)}\n" \
+              f"{messages.dry_run_operations}{len(plan.operations)}\n" \
+              f"{messages.dry_run_screenshot_dirs}{len(plan.screenshot_dirs)}"
+    utilities.show_message_window("info", "DRY RUN", f"{messages.apply_dry_run}\n\n{summary}", details=plan_text)
+
+
+################################################################################
+def _run_apply_job(self, job_id, rs_games):
+    self.enable_form(False)
+    self.enable_widgets(False)
+    self.qtObj.apply_button.setEnabled(False)
+
+    # roll back games left half applied by a previous crash
+    recovered_games = apply_journal.recover_journals()
+    if len(recovered_games) > 0:
+        self.log.info(f"apply: rolled back unfinished games {recovered_games}")
+
+    # every finished game is checkpointed, so an interrupted apply can resume from there
+    apply_jobs_sql = ApplyJobsSql(self)
+    job_obj = utilities.Object()
+    job_obj.job_id = job_id
+
+    # download shaders
+    _download_shaders(self)
+
+    error = _check_apply_files(self)
+    if error is not None:
+        # nothing was touched, there is nothing to resume later either
+        self.enable_form(True)
+        self.qtObj.apply_button.setEnabled(True)
+        self.progressBar.close()
+        job_obj.status = "cancelled"
+        apply_jobs_sql.update_job_status(job_obj)
+        utilities.show_message_window("error", "ERROR", error)
+        return
+
+    # plan every operation up front, then execute it
+    self.progressBar.setValues(messages.copying_DLLs, 0)
+    plan = ApplyPlan(self).build(rs_games)
+
+    def _checkpoint(games_obj, error):
+        job_obj.game_id = games_obj.id
+        job_obj.status = "failed" if len(error) > 0 else "done"
+        job_obj.error = error
+        apply_jobs_sql.update_game_status(job_obj)
+
+    file_copy.copy_stats.reset()
+    errors = plan.execute(lambda value: self.progressBar.setValues(messages.copying_DLLs, value), _checkpoint)
+    self.log.info(f"apply: {file_copy.copy_stats.files} files copied"
+                  f" at {file_copy.copy_stats.bytes_per_sec()} bytes/sec")
+
+    self.enable_form(True)
+    self.qtObj.apply_button.setEnabled(True)
+    self.progressBar.close()
+
+    while len(errors) > 0:
+        # failed games were rolled back, only those are retried
+        err = '\n'.join(errors)
+        msg = f"{messages.apply_success_with_errors}\n\n{err}\n\n{messages.retry_failed_games_question}"
+        reply = utilities.show_message_window("question", "ERROR", msg)
+        if reply == QtWidgets.QMessageBox.No:
+            break
+        plan = ApplyPlan(self).add_games(plan.failed_games)
+        errors = plan.execute(game_callback=_checkpoint)
+
+    status_obj = utilities.Object()
+    status_obj.job_id = job_id
+    status_obj.status = "failed" if len(errors) > 0 else "done"
+    apply_jobs_sql.update_job_status(status_obj)
+
+    if len(errors) == 0 and self.need_apply is False:
+        utilities.show_message_window("info", "SUCCESS", f"{messages.apply_success}")
+
+
+################################################################################
+def _check_apply_files(self):
+    # returns the error message when something every game needs is missing
+    if not os.path.isfile(constants.RESHADE32_PATH) or not os.path.isfile(constants.RESHADE64_PATH):
+        if not reshade_cache.has_version(self.reshade_version):
+            return messages.reshade_dlls_missing
+        try:
+            reshade_cache.activate_version(self.reshade_version)
+        except (OSError, ValueError) as e:
+            self.log.error(f"reshade_cache: {e}")
+            return messages.reshade_dlls_missing
+
+    if not os.path.isdir(constants.SHADERS_SRC_PATH):
+        return messages.shaders_missing
+    return None
+
+
+################################################################################
+def _remove_unused_presets(self):
+    # a store file is kept while a preset, and so a game, or any Reshade.ini still points to it
+    used_hashes = set()
+    rs_presets = PresetsSql(self).get_presets()
+    if rs_presets is not None:
+        used_hashes.update(rs_presets[i]["hash"] for i in range(len(rs_presets)))
+    rs_all_games = GamesSql(self).get_games()
+    if rs_all_games is None:
+        return
+    for i in range(len(rs_all_games)):
+        game_dir = '\\'.join(rs_all_games[i]["path"].split("\\")[:-1])
+        preset_path = utilities.get_ini_settings(f"{game_dir}\\{constants.RESHADE_INI}", "GENERAL", "PresetPath")
+        preset_hash = preset_store.get_preset_hash(preset_path)
+        if preset_hash is not None:
+            used_hashes.add(preset_hash)
+    preset_store.remove_unused(used_hashes)
+
+
 ################################################################################
 def _get_screenshot_path(self, game_path, game_name):
     game_screenshots_path = ""
     # creating screenshot dir
     if self.qtObj.yes_screenshots_folder_radioButton.isChecked():
-        game_screenshots_path = f"{constants.RESHADE_SCREENSHOT_PATH}\\{game_name}"
-        try:
-            if not os.path.exists(constants.RESHADE_SCREENSHOT_PATH):
-                os.makedirs(constants.RESHADE_SCREENSHOT_PATH)
-        except OSError as e:
-            self.log.error(f"mkdir: {constants.RESHADE_SCREENSHOT_PATH} {e}")
-
-        try:
-            if not os.path.exists(game_screenshots_path):
-                os.makedirs(game_screenshots_path)
-        except OSError as e:
-            self.log.error(f"mkdir: {game_screenshots_path} {e}")
+        game_screenshots_path = screenshot_dirs.get_game_screenshots_path(game_name)
+        screenshot_dirs.provision([game_name])
     else:
         file = f"{game_path}\\{constants.RESHADE_INI}"
         reshade_config_screenshot_path = utilities.get_ini_settings(file, "GENERAL", "ScreenshotPath")
@@ -539,58 +816,30 @@ def _get_screenshot_path(self, game_path, game_name):
 
 ################################################################################
 def _apply_single(self, games_obj):
-    errors = ""
-    game_path = '\\'.join(games_obj.path.split("\\")[:-1])
-    game_name = games_obj.game_name
-    dst_res_ini_path = f"{game_path}\\{constants.RESHADE_INI}"
-    dst_res_plug_ini_path = f"{game_path}\\{constants.RESHADE_PRESET_INI}"
-    game_screenshots_path = _get_screenshot_path(self, game_path, game_name)
-
-    if games_obj.architecture == "32bits":
-        src_path = constants.RESHADE32_PATH
-    else:
-        src_path = constants.RESHADE64_PATH
+    plan = ApplyPlan(self).add_games([games_obj])
+    errors = plan.execute()
+    return '\n'.join(errors)
 
-    if games_obj.api == "DX9":
-        dst_path = f"{game_path}\\{constants.D3D9}"
-    else:
-        dst_path = f"{game_path}\\{constants.DXGI}"
 
-    try:
+################################################################################
+def _download_shaders(self):
+    # shaders prefetched in the background only need to be unpacked
+    if prefetch.has_staged_shaders():
         try:
-            # copying Reshade.dll
-            shutil.copyfile(src_path, dst_path)
-        except shutil.Error as e:
-            self.log.error(f"copyfile: {e}")
+            prefetch.install_staged_shaders()
+            return
+        except (OSError, zipfile.BadZipFile) as e:
+            self.log.error(f"install_staged_shaders: {e}")
 
-        try:
-            # create Reshade.ini
-            if self.reset_reshade_files or not os.path.exists(dst_res_ini_path):
-                create_files = CreateFiles(self)
-                create_files.create_reshade_ini_file(game_path, game_screenshots_path)
-        except Exception as e:
-            self.log.error(f"create_reshade_ini_file: {e}")
-
-        # copying ReShadePreset.ini
-        if self.reset_reshade_files or not os.path.exists(dst_res_plug_ini_path):
-            try:
-                shutil.copyfile(constants.RESHADE_PRESET_FILENAME, dst_res_plug_ini_path)
-            except shutil.Error as e:
-                self.log.error(f"copyfile: {e}")
-    except OSError as e:
-        self.log.error(f"apply:[{game_name}:][{e.strerror.lower()}]")
-        errors = f"- {game_name}: {e.strerror.lower()}"
-
-    return errors
+    # with local shaders apply never waits for the network, newer ones are fetched for the next apply
+    if os.path.exists(constants.SHADERS_SRC_PATH) and self.settings.update_shaders:
+        self.prefetcher.prefetch_shaders()
+        return
 
-
-################################################################################
-def _download_shaders(self):
     downloaded_new_shaders = None
-    if not os.path.exists(constants.SHADERS_SRC_PATH) or (
-            self.update_shaders is not None and self.update_shaders is True):
+    if not os.path.exists(constants.SHADERS_SRC_PATH) or self.settings.update_shaders:
         downloaded_new_shaders = True
-    elif self.update_shaders is not None and self.update_shaders is False:
+    elif not self.settings.update_shaders:
         downloaded_new_shaders = False
 
     if downloaded_new_shaders is not None and downloaded_new_shaders is True:
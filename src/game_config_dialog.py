@@ -0,0 +1,95 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+from PyQt5 import QtWidgets
+
+from src.form_events import FormEvents
+from src.game_configs import UiGameConfigForm
+from src.utils import pe_inspect
+
+
+class GameConfigDialog:
+    # one form for the whole session, built and connected on first use,
+    # every open only binds the fields to the game being added or edited
+    def __init__(self, main):
+        self.main = main
+        self.form = None
+        self.qtObj = None
+
+    ################################################################################
+    def show(self, game_name: str, games_row=None, exe_path=None):
+        if self.form is None:
+            self._build()
+        self._bind(game_name, games_row, exe_path)
+        self.qtObj.game_name_lineEdit.setFocus()
+        self.form.show()
+        self.form.raise_()
+        self.form.activateWindow()
+
+    ################################################################################
+    def close(self):
+        if self.form is not None:
+            self.form.close()
+
+    ################################################################################
+    def get_game_name(self):
+        return self.qtObj.game_name_lineEdit.text()
+
+    ################################################################################
+    def get_architecture(self):
+        if self.qtObj.radioButton_32bits.isChecked():
+            return "32bits"
+        if self.qtObj.radioButton_64bits.isChecked():
+            return "64bits"
+        return None
+
+    ################################################################################
+    def get_api(self):
+        if self.qtObj.dx9_radioButton.isChecked():
+            return "DX9"
+        if self.qtObj.dx11_radioButton.isChecked():
+            return "DX11"
+        return None
+
+    ################################################################################
+    def _build(self):
+        self.form = QtWidgets.QWidget()
+        self.qtObj = UiGameConfigForm()
+        self.qtObj.setupUi(self.form)
+        self.qtObj.ok_pushButton.clicked.connect(lambda: FormEvents.game_config_form(self.main, "OK"))
+        self.qtObj.cancel_pushButton.clicked.connect(lambda: FormEvents.game_config_form(self.main, "CANCEL"))
+
+    ################################################################################
+    def _bind(self, game_name: str, games_row, exe_path):
+        # radio buttons keep the previous game's choice otherwise
+        for radio_button in (self.qtObj.radioButton_32bits, self.qtObj.radioButton_64bits,
+                             self.qtObj.dx9_radioButton, self.qtObj.dx11_radioButton):
+            radio_button.setAutoExclusive(False)
+            radio_button.setChecked(False)
+            radio_button.setAutoExclusive(True)
+
+        if games_row is not None:
+            self.qtObj.game_name_lineEdit.setText(games_row["name"])
+            architecture = games_row["architecture"]
+            api = games_row["api"]
+        else:
+            self.qtObj.game_name_lineEdit.setText(game_name)
+            exe_info = pe_inspect.inspect_exe(exe_path)
+            architecture = exe_info.architecture
+            api = exe_info.api
+
+        if architecture == "32bits":
+            self.qtObj.radioButton_32bits.setChecked(True)
+        elif architecture == "64bits" or games_row is not None:
+            self.qtObj.radioButton_64bits.setChecked(True)
+
+        if api == "DX9":
+            self.qtObj.dx9_radioButton.setChecked(True)
+        elif api == "DX11" or games_row is not None:
+            self.qtObj.dx11_radioButton.setChecked(True)
@@ -8,6 +8,7 @@
 # # -*- coding: utf-8 -*-
 
 import os
+import shutil
 import sys
 
 import requests
@@ -16,10 +17,13 @@ from PyQt5.QtCore import Qt
 from bs4 import BeautifulSoup
 
 from src.form_events import FormEvents
-from src.game_configs import UiGameConfigForm
-from src.sql.configs_sql import ConfigsSql
+from src.game_config_dialog import GameConfigDialog
+from src.settings import Settings
+from src.sql.apply_jobs_sql import ApplyJobsSql
 from src.sql.games_sql import GamesSql
-from src.utils import constants, messages, utilities
+from src.utils import constants, messages, prefetch, preflight, reshade_cache, theme, utilities
+from src.utils.game_watcher import GameWatcher
+from src.utils.prefetch import Prefetcher
 
 
 class MainSrc:
@@ -29,17 +33,21 @@ class MainSrc:
         self.form = form
         self.database_settings = None
         self.selected_game = None
-        self.game_config_form = None
+        self.game_config_form = GameConfigDialog(self)
         self.reshade_version = None
         self.local_reshade_exe = None
-        self.use_dark_theme = None
-        self.update_shaders = None
-        self.check_program_updates = None
-        self.check_reshade_updates = None
-        self.silent_reshade_updates = None
-        self.create_screenshots_folder = None
+        self.settings = None
+        # starts as the saved setting, an apply can turn it off for this session
         self.reset_reshade_files = None
+        self.game_watcher = GameWatcher()
+        self.watcher_timer = None
+        self.prefetcher = Prefetcher()
+        self.prefetch_timer = None
+        self.library_scan = None
+        self.scan_timer = None
         self.need_apply = False
+        self.dry_run = "--dry-run" in sys.argv
+        self.preflight_done = f"{constants.PREFLIGHT_ARG}={constants.VERSION}" in sys.argv
         self.new_version = None
         self.db_conn = None
         self.remote_reshade_version = None
@@ -50,19 +58,10 @@ class MainSrc:
     def init(self):
         self.progressBar.setValues(messages.initializing, 0)
         utilities.set_paypal_button(self)
-        utilities.check_dirs()
-        self.log = utilities.setup_logging(self)
-        sys.excepthook = utilities.log_uncaught_exceptions
-
-        self.progressBar.setValues(messages.checking_files, 15)
-        utilities.check_files(self)
-        self.database_settings = dict(DatabaseInUse='sqlite')
         self.client_version = constants.VERSION
-
-        self.progressBar.setValues(messages.checking_db_connection, 30)
-        utilities.check_db_connection(self)
-        utilities.set_default_database_configs(self)
-        utilities.check_database_updated_columns(self)
+        # started by the launcher of this same version, its preflight already ran
+        preflight.run(self, skip_checks=self.preflight_done)
+        self.settings = Settings(self).load()
 
         self.progressBar.setValues(messages.checking_configs, 45)
         self.qtObj.programs_tableWidget.horizontalHeader().setDefaultAlignment(Qt.AlignLeft)
@@ -75,21 +74,30 @@ class MainSrc:
         if self.local_reshade_exe is None:
             self._download_new_reshade_version()
         else:
-            if not os.path.isfile(self.local_reshade_exe):
+            # a cached build does not need its setup exe anymore
+            if not os.path.isfile(self.local_reshade_exe) and not reshade_cache.has_version(self.reshade_version):
                 self._download_new_reshade_version()
             else:
                 self._check_new_reshade_version()
 
-        if self.remote_reshade_version is not None:
-            if self.reshade_version != self.remote_reshade_version:
-                self.need_apply = True
-                if self.silent_reshade_updates:
-                    self._download_new_reshade_version()
-                else:
-                    msg = f"{messages.update_reshade_question}"
-                    reply = utilities.show_message_window("question", "Download new Reshade version", msg)
-                    if reply == QtWidgets.QMessageBox.Yes:
-                        self._download_new_reshade_version()
+        # no update while the user is pinned to a build they rolled back to
+        if self.remote_reshade_version is not None and self.remote_reshade_version != self.reshade_version \
+                and not self.settings.pinned_reshade_version:
+            self.need_apply = True
+            if reshade_cache.has_version(self.remote_reshade_version):
+                self._offer_reshade_version(self.remote_reshade_version)
+            else:
+                # downloaded in the background, installed from the cache once it is there
+                self.prefetcher.prefetch_reshade(self.remote_reshade_version)
+
+        # the shipped icon, preset and stylesheet are refreshed once per program version,
+        # the cached preset and stylesheet are only used when those files are first created
+        if self.settings.check_program_updates:
+            self.prefetcher.prefetch_assets()
+
+        # newer shaders are staged in the background, apply only unpacks them
+        if self.settings.update_shaders and os.path.exists(constants.SHADERS_SRC_PATH) and not prefetch.has_staged_shaders():
+            self.prefetcher.prefetch_shaders()
 
         self.progressBar.setValues(messages.checking_new_version, 90)
         self._check_new_program_version()
@@ -98,15 +106,43 @@ class MainSrc:
         self.qtObj.api_groupBox.setEnabled(False)
         self.enable_widgets(False)
         self.progressBar.close()
+        self._check_unfinished_apply_job()
+        self.set_game_watcher(self.settings.watch_games)
+        self.prefetch_timer = QtCore.QTimer()
+        self.prefetch_timer.timeout.connect(self._check_prefetch)
+        self.prefetch_timer.start(constants.PREFETCH_TIMER_MSEC)
+
+    ################################################################################
+    def _check_unfinished_apply_job(self):
+        apply_jobs_sql = ApplyJobsSql(self)
+        job = apply_jobs_sql.get_unfinished_job()
+        if job is None:
+            return
+
+        rs_games = apply_jobs_sql.get_pending_games(job["id"])
+        if rs_games is None or len(rs_games) == 0:
+            # every game was done or deleted since, nothing to resume
+            apply_jobs_sql.cancel_unfinished_jobs()
+            return
+
+        msg = f"{messages.resume_apply_question}\n\n{messages.games_remaining}{len(rs_games)}"
+        reply = utilities.show_message_window("question", "Resume Apply", msg)
+        if reply == QtWidgets.QMessageBox.Yes:
+            FormEvents.resume_apply(self, job)
+        else:
+            apply_jobs_sql.cancel_unfinished_jobs()
 
     ################################################################################
     def _register_form_events(self):
         # TAB 1 - games
         self.qtObj.add_button.clicked.connect(lambda: FormEvents.add_game(self))
+        self.qtObj.scan_button.clicked.connect(lambda: FormEvents.scan_library(self))
         self.qtObj.delete_button.clicked.connect(lambda: FormEvents.delete_game(self))
         self.qtObj.edit_path_button.clicked.connect(lambda: FormEvents.edit_game_path(self))
         self.qtObj.edit_config_button.clicked.connect(lambda: FormEvents.open_reshade_config_file(self))
+        self.qtObj.preset_button.clicked.connect(lambda: FormEvents.assign_preset(self))
         self.qtObj.apply_button.clicked.connect(lambda: FormEvents.apply_all(self))
+        self.qtObj.verify_button.clicked.connect(lambda: FormEvents.verify_all(self))
         self.qtObj.update_button.clicked.connect(lambda: FormEvents.update_clicked())
         #########
         self.qtObj.programs_tableWidget.clicked.connect(self._programs_tableWidget_clicked)
@@ -134,26 +170,44 @@ class MainSrc:
         self.qtObj.yes_reset_reshade_radioButton.clicked.connect(lambda: FormEvents.reset_reshade_files_clicked(self, "YES"))
         self.qtObj.no_reset_reshade_radioButton.clicked.connect(lambda: FormEvents.reset_reshade_files_clicked(self, "NO"))
         #########
+        self.qtObj.yes_use_hardlinks_radioButton.clicked.connect(lambda: FormEvents.use_hardlinks_clicked(self, "YES"))
+        self.qtObj.no_use_hardlinks_radioButton.clicked.connect(lambda: FormEvents.use_hardlinks_clicked(self, "NO"))
+
+        self.qtObj.yes_watch_games_radioButton.clicked.connect(lambda: FormEvents.watch_games_clicked(self, "YES"))
+        self.qtObj.no_watch_games_radioButton.clicked.connect(lambda: FormEvents.watch_games_clicked(self, "NO"))
+
+        self.qtObj.yes_shared_preset_radioButton.clicked.connect(lambda: FormEvents.shared_preset_clicked(self, "YES"))
+        self.qtObj.no_shared_preset_radioButton.clicked.connect(lambda: FormEvents.shared_preset_clicked(self, "NO"))
+        #########
         self.qtObj.edit_default_config_button.clicked.connect(lambda: FormEvents.edit_default_config_file(self))
+        self.qtObj.reshade_version_comboBox.activated.connect(lambda: FormEvents.reshade_version_changed(self))
         # TAB 3 - about
         #########
         self.qtObj.paypal_button.clicked.connect(lambda: FormEvents.donate_clicked())
 
     ################################################################################
     def _check_reshade_files(self):
-        configSql = ConfigsSql(self)
-        rsConfig = configSql.get_configs()
-
-        if rsConfig[0]["reshade_version"] is not None and len(rsConfig[0]["reshade_version"]) > 0:
-            self.reshade_version = rsConfig[0]["reshade_version"]
+        if self.settings.reshade_version is not None and len(self.settings.reshade_version) > 0:
+            self.reshade_version = self.settings.reshade_version
             self.qtObj.reshade_version_label.setText(f"{messages.info_reshade_version}{self.reshade_version}")
             self.enable_form(True)
             self.local_reshade_exe = f"{constants.PROGRAM_PATH}\\ReShade_Setup_{self.reshade_version}.exe"
 
+            # dlls missing from the program folder come back from the cache, installs without cache seed it
+            try:
+                if reshade_cache.has_version(self.reshade_version):
+                    if not os.path.isfile(constants.RESHADE32_PATH) or not os.path.isfile(constants.RESHADE64_PATH):
+                        reshade_cache.activate_version(self.reshade_version)
+                elif os.path.isfile(constants.RESHADE32_PATH) and os.path.isfile(constants.RESHADE64_PATH):
+                    reshade_cache.store_version(self.reshade_version)
+            except (OSError, ValueError) as e:
+                self.log.error(f"reshade_cache: {e}")
+        self.populate_reshade_versions()
+
     ################################################################################
     def _check_new_reshade_version(self):
         self.remote_reshade_version = None
-        if self.check_reshade_updates:
+        if self.settings.check_reshade_updates:
             try:
                 response = requests.get(constants.RESHADE_WEBSITE_URL)
                 if response.status_code != 200:
@@ -176,7 +230,7 @@ class MainSrc:
     ################################################################################
     def _download_new_reshade_version(self):
         self.progressBar.setValues(messages.downloading_new_reshade_version, 75)
-        if not self.silent_reshade_updates:
+        if not self.settings.silent_reshade_updates:
             msg = f"{messages.update_reshade_question}"
             reply = utilities.show_message_window("question", "Download new Reshade version", msg)
             if reply == QtWidgets.QMessageBox.No:
@@ -186,15 +240,11 @@ class MainSrc:
         exe_download_url = None
         download_path = f"{constants.PROGRAM_PATH}\\ReShade_Setup_"
 
-        # remove old version
+        # remove old setup exe, its dlls are kept in the cache
         if self.reshade_version is not None:
             old_local_reshade_exe = f"{download_path}{self.reshade_version}.exe"
             if os.path.isfile(old_local_reshade_exe):
                 os.remove(old_local_reshade_exe)
-            if os.path.isfile(constants.RESHADE32_PATH):
-                os.remove(constants.RESHADE32_PATH)
-            if os.path.isfile(constants.RESHADE64_PATH):
-                os.remove(constants.RESHADE64_PATH)
 
         # get new version number
         try:
@@ -217,46 +267,98 @@ class MainSrc:
             utilities.show_message_window("error", "ERROR", messages.reshade_website_unreacheable)
             return
 
-        # download new reshade version exe
-        try:
-            self.local_reshade_exe = f"{download_path}{self.remote_reshade_version}.exe"
-            r = requests.get(exe_download_url)
-            with open(self.local_reshade_exe, 'wb') as outfile:
-                outfile.write(r.content)
-        except Exception as e:
-            if e.errno == 13:
-                utilities.show_message_window("error", "ERROR", messages.error_permissionError)
-            else:
-                self.log.error(f"{messages.error_check_new_reshade_version} {e}")
-            return
+        if not reshade_cache.has_version(self.remote_reshade_version):
+            # download new reshade version exe
+            try:
+                self.local_reshade_exe = f"{download_path}{self.remote_reshade_version}.exe"
+                r = requests.get(exe_download_url)
+                with open(self.local_reshade_exe, 'wb') as outfile:
+                    outfile.write(r.content)
+            except Exception as e:
+                if e.errno == 13:
+                    utilities.show_message_window("error", "ERROR", messages.error_permissionError)
+                else:
+                    self.log.error(f"{messages.error_check_new_reshade_version} {e}")
+                return
+
+            # unzip reshade to a staging folder, only a complete build goes to the cache
+            staging_dir = os.path.join(constants.STAGING_PATH, f"reshade_{self.remote_reshade_version}")
+            if not self._unzip_reshade(self.local_reshade_exe, staging_dir):
+                return
+            try:
+                reshade_cache.store_version(self.remote_reshade_version, src_dir=staging_dir)
+            except OSError as e:
+                self.log.error(f"reshade_cache: {e}")
+                return
+            finally:
+                shutil.rmtree(staging_dir, ignore_errors=True)
 
-        # unzip reshade
-        self._unzip_reshade(self.local_reshade_exe)
+        self._activate_reshade_version(self.remote_reshade_version)
 
-        # save version to sql table
-        configSql = ConfigsSql(self)
-        configsObj = utilities.Object()
-        configsObj.reshade_version = self.remote_reshade_version
-        configSql.update_reshade_version(configsObj)
+    ################################################################################
+    def _activate_reshade_version(self, version: str):
+        # the version is in the cache at this point, installing it is a local copy
+        if reshade_cache.has_version(version):
+            try:
+                reshade_cache.activate_version(version)
+                reshade_cache.evict(keep_version=version)
+            except (OSError, ValueError) as e:
+                self.log.error(f"reshade_cache: {e}")
+                return
+
+        self.settings.reshade_version = version
+        self.settings.pinned_reshade_version = ""
 
         # set version label
         self.qtObj.reshade_version_label.clear()
-        self.qtObj.reshade_version_label.setText(f"{messages.info_reshade_version}{self.remote_reshade_version}")
+        self.qtObj.reshade_version_label.setText(f"{messages.info_reshade_version}{version}")
+        self.remote_reshade_version = version
 
         if self.need_apply:
             FormEvents.apply_all(self)
             utilities.show_message_window("info", "INFO",
                                           f"{messages.new_reshade_version}\n"
-                                          f"Version: {self.remote_reshade_version}\n\n"
+                                          f"Version: {version}\n\n"
                                           f"{messages.apply_success}")
             self.need_apply = False
 
-        self.reshade_version = self.remote_reshade_version
+        self.reshade_version = version
+        self.populate_reshade_versions()
+
+    ################################################################################
+    def _check_prefetch(self):
+        # runs on the gui thread, picks up what the prefetcher finished
+        while not self.prefetcher.done.empty():
+            kind, version, ok = self.prefetcher.done.get_nowait()
+            if kind != prefetch.PREFETCH_RESHADE or not ok or version == self.reshade_version \
+                    or self.settings.pinned_reshade_version:
+                continue
+            self._offer_reshade_version(version)
+
+    ################################################################################
+    def _offer_reshade_version(self, version: str):
+        if not self.settings.silent_reshade_updates:
+            msg = f"{messages.update_reshade_question}"
+            reply = utilities.show_message_window("question", "Download new Reshade version", msg)
+            if reply == QtWidgets.QMessageBox.No:
+                return
+        self._activate_reshade_version(version)
+
+    ################################################################################
+    def populate_reshade_versions(self):
+        self.qtObj.reshade_version_comboBox.clear()
+        versions = [x["version"] for x in reshade_cache.list_versions()]
+        if self.reshade_version is not None and self.reshade_version not in versions:
+            versions.insert(0, self.reshade_version)
+        versions.sort(key=lambda x: [int(n) if n.isdigit() else 0 for n in x.split(".")], reverse=True)
+        self.qtObj.reshade_version_comboBox.addItems(versions)
+        if self.reshade_version is not None:
+            self.qtObj.reshade_version_comboBox.setCurrentText(self.reshade_version)
 
     ################################################################################
     def _check_new_program_version(self):
         self.qtObj.update_button.setVisible(False)
-        if self.check_program_updates:
+        if self.settings.check_program_updates:
             new_version_obj = utilities.check_new_program_version(self)
             if new_version_obj.new_version_available:
                 self.qtObj.updateAvail_label.clear()
@@ -264,9 +366,10 @@ class MainSrc:
                 self.qtObj.update_button.setVisible(True)
 
     ################################################################################
-    def _unzip_reshade(self, local_reshade_exe):
+    def _unzip_reshade(self, local_reshade_exe, out_path):
         try:
-            out_path = constants.PROGRAM_PATH
+            if os.path.isdir(out_path):
+                shutil.rmtree(out_path)
             utilities.unzip_file(local_reshade_exe, out_path)
         # except FileNotFoundError as e:
         #    self.log.error(f"{e}")
@@ -274,14 +377,24 @@ class MainSrc:
         #    self.log.error(f"{e}")
         except Exception as e:
             self.log.error(f"{e}")
+            return False
+
+        missing = [x for x in (constants.RESHADE32, constants.RESHADE64) if not os.path.isfile(os.path.join(out_path, x))]
+        if len(missing) > 0:
+            self.log.error(f"{', '.join(missing)} not found in {local_reshade_exe}")
+            shutil.rmtree(out_path, ignore_errors=True)
+            return False
+        return True
 
     ################################################################################
     def _en_dis_apply_button(self):
         len_games = self.qtObj.programs_tableWidget.rowCount()
         if len_games == 0:
             self.qtObj.apply_button.setEnabled(False)
+            self.qtObj.verify_button.setEnabled(False)
         else:
             self.qtObj.apply_button.setEnabled(True)
+            self.qtObj.verify_button.setEnabled(True)
 
     ################################################################################
     def _programs_tableWidget_clicked(self, item):
@@ -293,130 +406,77 @@ class MainSrc:
 
     ################################################################################
     def _set_all_configs(self):
-        configSql = ConfigsSql(self)
-        rsConfig = configSql.get_configs()
-
+        settings = self.settings
         self.populate_programs_listWidget()
 
-        if rsConfig is not None and len(rsConfig) > 0:
-            if rsConfig[0]["use_dark_theme"].upper() == "N":
-                self.use_dark_theme = False
-                self.set_style_sheet(False)
-                self.qtObj.yes_dark_theme_radioButton.setChecked(False)
-                self.qtObj.no_dark_theme_radioButton.setChecked(True)
-            else:
-                self.use_dark_theme = True
-                self.set_style_sheet(True)
-                self.qtObj.yes_dark_theme_radioButton.setChecked(True)
-                self.qtObj.no_dark_theme_radioButton.setChecked(False)
-
-            if rsConfig[0]["update_shaders"].upper() == "N":
-                self.update_shaders = False
-                self.qtObj.yes_update_shaders_radioButton.setChecked(False)
-                self.qtObj.no_update_shaders_radioButton.setChecked(True)
-            else:
-                self.update_shaders = True
-                self.qtObj.yes_update_shaders_radioButton.setChecked(True)
-                self.qtObj.no_update_shaders_radioButton.setChecked(False)
-
-            if rsConfig[0]["check_program_updates"].upper() == "N":
-                self.check_program_updates = False
-                self.qtObj.yes_check_program_updates_radioButton.setChecked(False)
-                self.qtObj.no_check_program_updates_radioButton.setChecked(True)
-            else:
-                self.check_program_updates = True
-                self.qtObj.yes_check_program_updates_radioButton.setChecked(True)
-                self.qtObj.no_check_program_updates_radioButton.setChecked(False)
-
-            if rsConfig[0]["check_reshade_updates"].upper() == "N":
-                self.check_reshade_updates = False
-                self.qtObj.yes_check_reshade_updates_radioButton.setChecked(False)
-                self.qtObj.no_check_reshade_updates_radioButton.setChecked(True)
-            else:
-                self.check_reshade_updates = True
-                self.qtObj.yes_check_reshade_updates_radioButton.setChecked(True)
-                self.qtObj.no_check_reshade_updates_radioButton.setChecked(False)
-
-            if rsConfig[0]["create_screenshots_folder"].upper() == "N":
-                self.create_screenshots_folder = False
-                self.qtObj.yes_screenshots_folder_radioButton.setChecked(False)
-                self.qtObj.no_screenshots_folder_radioButton.setChecked(True)
-            else:
-                self.create_screenshots_folder = True
-                self.qtObj.yes_screenshots_folder_radioButton.setChecked(True)
-                self.qtObj.no_screenshots_folder_radioButton.setChecked(False)
-
-            if rsConfig[0]["reset_reshade_files"].upper() == "N":
-                self.reset_reshade_files = False
-                self.qtObj.yes_reset_reshade_radioButton.setChecked(False)
-                self.qtObj.no_reset_reshade_radioButton.setChecked(True)
-            else:
-                self.reset_reshade_files = True
-                self.qtObj.yes_reset_reshade_radioButton.setChecked(True)
-                self.qtObj.no_reset_reshade_radioButton.setChecked(False)
-
-            if rsConfig[0]["silent_reshade_updates"].upper() == "N":
-                self.silent_reshade_updates = False
-                self.qtObj.yes_silent_reshade_updates_radioButton.setChecked(False)
-                self.qtObj.no_silent_reshade_updates_radioButton.setChecked(True)
-            else:
-                self.silent_reshade_updates = True
-                self.qtObj.yes_silent_reshade_updates_radioButton.setChecked(True)
-                self.qtObj.no_silent_reshade_updates_radioButton.setChecked(False)
-            self.qtObj.silent_reshade_updates_groupBox.setEnabled(self.check_reshade_updates)
-            self.qtObj.silent_reshade_updates_groupBox.setVisible(self.check_reshade_updates)
+        self.set_style_sheet(settings.use_dark_theme)
+        self.qtObj.yes_dark_theme_radioButton.setChecked(settings.use_dark_theme)
+        self.qtObj.no_dark_theme_radioButton.setChecked(not settings.use_dark_theme)
 
-            if rsConfig[0]["program_version"] is None or rsConfig[0]["program_version"] != constants.VERSION:
-                config_obj = utilities.Object()
-                config_obj.program_version = constants.VERSION
-                configSql.update_program_version(config_obj)
+        self.qtObj.yes_update_shaders_radioButton.setChecked(settings.update_shaders)
+        self.qtObj.no_update_shaders_radioButton.setChecked(not settings.update_shaders)
+
+        self.qtObj.yes_check_program_updates_radioButton.setChecked(settings.check_program_updates)
+        self.qtObj.no_check_program_updates_radioButton.setChecked(not settings.check_program_updates)
+
+        self.qtObj.yes_check_reshade_updates_radioButton.setChecked(settings.check_reshade_updates)
+        self.qtObj.no_check_reshade_updates_radioButton.setChecked(not settings.check_reshade_updates)
+
+        self.qtObj.yes_screenshots_folder_radioButton.setChecked(settings.create_screenshots_folder)
+        self.qtObj.no_screenshots_folder_radioButton.setChecked(not settings.create_screenshots_folder)
+
+        self.reset_reshade_files = settings.reset_reshade_files
+        self.qtObj.yes_reset_reshade_radioButton.setChecked(settings.reset_reshade_files)
+        self.qtObj.no_reset_reshade_radioButton.setChecked(not settings.reset_reshade_files)
+
+        self.qtObj.yes_silent_reshade_updates_radioButton.setChecked(settings.silent_reshade_updates)
+        self.qtObj.no_silent_reshade_updates_radioButton.setChecked(not settings.silent_reshade_updates)
+        self.qtObj.silent_reshade_updates_groupBox.setEnabled(settings.check_reshade_updates)
+        self.qtObj.silent_reshade_updates_groupBox.setVisible(settings.check_reshade_updates)
+
+        self.qtObj.yes_use_hardlinks_radioButton.setChecked(settings.use_hardlinks)
+        self.qtObj.no_use_hardlinks_radioButton.setChecked(not settings.use_hardlinks)
+
+        self.qtObj.yes_watch_games_radioButton.setChecked(settings.watch_games)
+        self.qtObj.no_watch_games_radioButton.setChecked(not settings.watch_games)
+
+        self.qtObj.yes_shared_preset_radioButton.setChecked(settings.shared_preset)
+        self.qtObj.no_shared_preset_radioButton.setChecked(not settings.shared_preset)
+
+        settings.program_version = constants.VERSION
 
     ################################################################################
     def show_game_config_form(self, game_name: str):
-        self.game_config_form = QtWidgets.QWidget()
-        _translate = QtCore.QCoreApplication.translate
-        qtObj = UiGameConfigForm()
-        qtObj.setupUi(self.game_config_form)
-        self.game_config_form.qtObj = qtObj
-        if self.use_dark_theme:
-            self.game_config_form.setStyleSheet(open(constants.STYLE_QSS_FILENAME, "r").read())
-        self.game_config_form.qtObj.game_name_lineEdit.setFocus()
-        self.game_config_form.show()
-        QtWidgets.QApplication.processEvents()
-
-        self.game_config_form.qtObj.ok_pushButton.clicked.connect(lambda: FormEvents.game_config_form(self, "OK"))
-        self.game_config_form.qtObj.cancel_pushButton.clicked.connect(lambda: FormEvents.game_config_form(self, "CANCEL"))
-
         if self.selected_game is not None:
-            self.game_config_form.qtObj.game_name_lineEdit.setText(self.selected_game.rs[0]["name"])
-            if self.selected_game.rs[0]["architecture"] == "32bits":
-                self.game_config_form.qtObj.radioButton_32bits.setChecked(True)
-                self.game_config_form.qtObj.radioButton_64bits.setChecked(False)
-            else:
-                self.game_config_form.qtObj.radioButton_32bits.setChecked(False)
-                self.game_config_form.qtObj.radioButton_64bits.setChecked(True)
-
-            if self.selected_game.rs[0]["api"] == "DX9":
-                self.game_config_form.qtObj.dx9_radioButton.setChecked(True)
-                self.game_config_form.qtObj.dx11_radioButton.setChecked(False)
-            else:
-                self.game_config_form.qtObj.dx9_radioButton.setChecked(False)
-                self.game_config_form.qtObj.dx11_radioButton.setChecked(True)
+            self.game_config_form.show(game_name, games_row=self.selected_game.rs[0])
         else:
-            self.game_config_form.qtObj.game_name_lineEdit.setText(game_name)
+            self.game_config_form.show(game_name, exe_path=self.added_game_path)
 
     ################################################################################
-    def set_style_sheet(self, status: bool):
+    def set_game_watcher(self, status: bool):
+        # the watcher thread only queues game ids, repairs run on the gui thread
         if status:
-            self.form.setStyleSheet(open(constants.STYLE_QSS_FILENAME, "r").read())
+            if self.watcher_timer is None:
+                self.watcher_timer = QtCore.QTimer()
+                self.watcher_timer.timeout.connect(lambda: FormEvents.repair_changed_games(self))
+            self.game_watcher.start()
+            self.watcher_timer.start(constants.WATCHER_TIMER_MSEC)
         else:
-            self.form.setStyleSheet("")
+            self.game_watcher.stop()
+            if self.watcher_timer is not None:
+                self.watcher_timer.stop()
+
+    ################################################################################
+    def set_style_sheet(self, status: bool):
+        theme.apply_theme(status)
 
     ################################################################################
     def populate_programs_listWidget(self):
         self.qtObj.programs_tableWidget.setRowCount(0)
         games_sql = GamesSql(self)
         rs_all_games = games_sql.get_games()
+        if rs_all_games is not None:
+            self.game_watcher.set_games(rs_all_games)
         if rs_all_games is not None and len(rs_all_games) > 0:
             for i in range(len(rs_all_games)):
                 len_games = self.qtObj.programs_tableWidget.rowCount()
@@ -429,6 +489,7 @@ class MainSrc:
     ################################################################################
     def enable_form(self, status: bool):
         self.qtObj.add_button.setEnabled(status)
+        self.qtObj.scan_button.setEnabled(status)
         num_pages = self.qtObj.main_tabWidget.count()
 
         if status:
@@ -461,3 +522,4 @@ class MainSrc:
         self.qtObj.delete_button.setEnabled(status)
         self.qtObj.edit_path_button.setEnabled(status)
         self.qtObj.edit_config_button.setEnabled(status)
+        self.qtObj.preset_button.setEnabled(status)
@@ -0,0 +1,110 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+from PyQt5 import QtCore
+
+from src.sql.configs_sql import ConfigsSql
+from src.utils import constants
+
+
+################################################################################
+def _bool_setting(column: str):
+    def getter(self):
+        return self._get(column) == "Y"
+
+    def setter(self, value: bool):
+        self._set(column, "Y" if value else "N")
+    return property(getter, setter)
+
+
+################################################################################
+def _text_setting(column: str):
+    def getter(self):
+        return self._get(column)
+
+    def setter(self, value: str):
+        self._set(column, value)
+    return property(getter, setter)
+
+
+class Settings:
+    # the configs row is read once, changes are kept in memory and written together
+    # in one UPDATE shortly after the last change, and when the program quits
+    use_dark_theme = _bool_setting("use_dark_theme")
+    update_shaders = _bool_setting("update_shaders")
+    check_program_updates = _bool_setting("check_program_updates")
+    check_reshade_updates = _bool_setting("check_reshade_updates")
+    silent_reshade_updates = _bool_setting("silent_reshade_updates")
+    create_screenshots_folder = _bool_setting("create_screenshots_folder")
+    reset_reshade_files = _bool_setting("reset_reshade_files")
+    use_hardlinks = _bool_setting("use_hardlinks")
+    watch_games = _bool_setting("watch_games")
+    shared_preset = _bool_setting("shared_preset")
+    program_version = _text_setting("program_version")
+    reshade_version = _text_setting("reshade_version")
+    # set when the user rolls back to an older build, updates are not offered while it is set
+    pinned_reshade_version = _text_setting("pinned_reshade_version")
+
+    def __init__(self, main):
+        self.main = main
+        self._row = {}
+        self._changes = {}
+        self._timer = None
+
+    ################################################################################
+    def load(self):
+        rs_config = ConfigsSql(self.main).get_configs()
+        self._row = dict(rs_config[0]) if rs_config is not None and len(rs_config) > 0 else {}
+        self._changes.clear()
+        return self
+
+    ################################################################################
+    def flush(self):
+        if self._timer is not None:
+            self._timer.stop()
+        if len(self._changes) == 0:
+            return
+        # a change is only dropped once it is written, a failed write is retried on the next flush
+        changes = dict(self._changes)
+        try:
+            error = ConfigsSql(self.main).update_configs(changes)
+        except Exception as e:
+            error = e
+        if error is not None:
+            self.main.log.error(f"settings flush: {error}")
+            return
+        for column, value in changes.items():
+            if self._changes.get(column) == value:
+                del self._changes[column]
+
+    ################################################################################
+    def _get(self, column: str):
+        return self._row.get(column)
+
+    ################################################################################
+    def _set(self, column: str, value):
+        if self._row.get(column) == value:
+            return
+        self._row[column] = value
+        self._changes[column] = value
+        self._schedule_flush()
+
+    ################################################################################
+    def _schedule_flush(self):
+        if self._timer is None:
+            app = QtCore.QCoreApplication.instance()
+            if app is None:
+                # no event loop to debounce on
+                self.flush()
+                return
+            self._timer = QtCore.QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self.flush)
+            app.aboutToQuit.connect(self.flush)
+        self._timer.start(constants.SETTINGS_FLUSH_MSEC)
@@ -1,6 +1,10 @@
-__all__ = ['configs_sql',
+__all__ = ['apply_jobs_sql',
+           'configs_sql',
+           'games_apply_state_sql',
+           'games_deploy_sql',
            'games_sql',
            'initial_tables_sql',
+           'presets_sql',
            'triggers_sql',
            'update_tables_sql'
            ]
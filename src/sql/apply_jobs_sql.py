@@ -0,0 +1,99 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+from src.databases.databases import Databases
+from src.utils import constants
+
+
+class ApplyJobsSql:
+    def __init__(self, main):
+        self.main = main
+        self.log = main.log
+
+    ################################################################################
+    def create_job(self, jobObj: object):
+        self.delete_old_jobs()
+        sql = f"""INSERT INTO apply_jobs(
+                status,
+                reset_reshade_files
+                )VALUES(
+                'running',
+                '{jobObj.reset_reshade_files}'
+                );"""
+        databases = Databases(self.main)
+        databases.execute(sql)
+
+        sql = "SELECT MAX(id) AS id from apply_jobs;"
+        job_id = databases.select(sql)[0]["id"]
+
+        # without game_ids the job covers the whole library
+        game_ids = getattr(jobObj, "game_ids", None)
+        where = f" where id IN ({', '.join(str(x) for x in game_ids)})" if game_ids else ""
+        sql = f"""INSERT INTO apply_job_games (job_id, game_id)
+                SELECT {job_id}, id from games{where};"""
+        databases.execute(sql)
+        return job_id
+
+    ################################################################################
+    def delete_old_jobs(self):
+        # finished jobs are only history, the last few are kept. failed ones can still be resumed
+        old_jobs = f"""SELECT id from apply_jobs
+                where status IN ('done', 'cancelled')
+                AND id NOT IN (SELECT id from apply_jobs ORDER BY id DESC LIMIT {constants.APPLY_JOBS_KEPT})"""
+        sql = f"""DELETE from apply_job_games where job_id IN ({old_jobs});
+                DELETE from apply_jobs where id IN ({old_jobs});"""
+        databases = Databases(self.main)
+        return databases.execute(sql)
+
+    ################################################################################
+    def get_unfinished_job(self):
+        sql = """SELECT * from apply_jobs
+                where status IN ('running', 'failed')
+                ORDER BY id DESC LIMIT 1;"""
+        databases = Databases(self.main)
+        rs = databases.select(sql)
+        if rs is not None and len(rs) > 0:
+            return rs[0]
+        return None
+
+    ################################################################################
+    def get_pending_games(self, job_id: int):
+        sql = f"""SELECT games.* from games
+                INNER JOIN apply_job_games ON apply_job_games.game_id = games.id
+                where apply_job_games.job_id = {job_id}
+                AND apply_job_games.status <> 'done'
+                ORDER BY LOWER(games.name) ASC;"""
+        databases = Databases(self.main)
+        return databases.select(sql)
+
+    #################################################################################
+    def update_game_status(self, jobObj: object):
+        error = str(jobObj.error).replace("'", "''") if jobObj.error else ""
+        sql = f"""UPDATE apply_job_games SET
+                status = '{jobObj.status}',
+                error = '{error}'
+                WHERE job_id = {jobObj.job_id} AND game_id = {jobObj.game_id};"""
+        databases = Databases(self.main)
+        databases.execute(sql)
+
+    #################################################################################
+    def update_job_status(self, jobObj: object):
+        sql = f"""UPDATE apply_jobs SET
+                status = '{jobObj.status}'
+                WHERE id = {jobObj.job_id};"""
+        databases = Databases(self.main)
+        databases.execute(sql)
+
+    #################################################################################
+    def cancel_unfinished_jobs(self):
+        sql = """UPDATE apply_jobs SET
+                status = 'cancelled'
+                WHERE status IN ('running', 'failed');"""
+        databases = Databases(self.main)
+        databases.execute(sql)
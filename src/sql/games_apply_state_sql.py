@@ -0,0 +1,50 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+from src.databases.databases import Databases
+
+
+class GamesApplyStateSql:
+    def __init__(self, main):
+        self.main = main
+        self.log = main.log
+
+    ################################################################################
+    def get_fingerprints(self):
+        sql = "SELECT game_id, fingerprint from games_apply_state;"
+        databases = Databases(self.main)
+        rs = databases.select(sql)
+        fingerprints = {}
+        if rs is not None:
+            for i in range(len(rs)):
+                fingerprints[rs[i]["game_id"]] = rs[i]["fingerprint"]
+        return fingerprints
+
+    #################################################################################
+    def update_fingerprints(self, states: list):
+        # one script for every game of the apply
+        sql = ""
+        for stateObj in states:
+            sql += f"""DELETE from games_apply_state where game_id = {stateObj.game_id};
+                INSERT INTO games_apply_state(
+                game_id,
+                fingerprint
+                )VALUES(
+                {stateObj.game_id},
+                '{stateObj.fingerprint}'
+                );"""
+        if len(sql) > 0:
+            databases = Databases(self.main)
+            databases.execute(sql)
+
+    #################################################################################
+    def delete_fingerprint(self, game_id: int):
+        sql = f"""DELETE from games_apply_state where game_id = {game_id};"""
+        databases = Databases(self.main)
+        databases.execute(sql)
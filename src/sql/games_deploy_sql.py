@@ -0,0 +1,44 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+from src.databases.databases import Databases
+
+
+class GamesDeploySql:
+    def __init__(self, main):
+        self.main = main
+        self.log = main.log
+
+    ################################################################################
+    def get_deploy_method(self, game_id: int):
+        sql = f"""SELECT deploy_method from games_deploy where game_id = {game_id};"""
+        databases = Databases(self.main)
+        rs = databases.select(sql)
+        if rs is not None and len(rs) > 0:
+            return rs[0]["deploy_method"]
+        return None
+
+    #################################################################################
+    def update_deploy_method(self, deployObj: object):
+        sql = f"""DELETE from games_deploy where game_id = {deployObj.game_id};
+                INSERT INTO games_deploy(
+                game_id,
+                deploy_method
+                )VALUES(
+                {deployObj.game_id},
+                '{deployObj.deploy_method}'
+                );"""
+        databases = Databases(self.main)
+        databases.execute(sql)
+
+    #################################################################################
+    def delete_deploy_method(self, game_id: int):
+        sql = f"""DELETE from games_deploy where game_id = {game_id};"""
+        databases = Databases(self.main)
+        databases.execute(sql)
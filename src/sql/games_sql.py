@@ -23,36 +23,59 @@ class GamesSql:
 
     ################################################################################
     def get_game_by_path(self, path: str):
+        path = path.replace("'", "''")
         sql = f"""SELECT * from games where path = '{path}' ORDER BY LOWER(name) ASC;"""
         databases = Databases(self.main)
         return databases.select(sql)
 
     ################################################################################
     def get_game_by_name(self, game_name: str):
+        game_name = game_name.replace("'", "''")
         sql = f"""SELECT * from games where name = '{game_name}' ORDER BY LOWER(name) ASC;"""
         databases = Databases(self.main)
         return databases.select(sql)
 
     ################################################################################
     def insert_game(self, gamesObj: object):
+        game_name = gamesObj.game_name.replace("'", "''")
+        path = gamesObj.path.replace("'", "''")
         sql = f"""INSERT INTO games(
             name,
             architecture,
             api,
             path
             )VALUES(
-            '{gamesObj.game_name}',
+            '{game_name}',
             '{gamesObj.architecture}',
             '{gamesObj.api}',
-            '{gamesObj.path}'
+            '{path}'
             );"""
         databases = Databases(self.main)
         databases.execute(sql)
 
+    ################################################################################
+    def insert_games(self, games: list):
+        # all games go in one script, so one transaction for the whole import
+        values = []
+        for gamesObj in games:
+            game_name = gamesObj.game_name.replace("'", "''")
+            path = gamesObj.path.replace("'", "''")
+            values.append(f"('{game_name}', '{gamesObj.architecture}', '{gamesObj.api}', '{path}')")
+        sql = f"""INSERT INTO games(
+            name,
+            architecture,
+            api,
+            path
+            )VALUES
+            {",".join(values)};"""
+        databases = Databases(self.main)
+        databases.execute(sql)
+
     #################################################################################
     def update_game(self, gamesObj: object):
+        game_name = gamesObj.game_name.replace("'", "''")
         sql = f"""UPDATE games SET
-                name = '{gamesObj.game_name}',
+                name = '{game_name}',
                 architecture = '{gamesObj.architecture}',
                 api = '{gamesObj.api}'
                 WHERE id = {gamesObj.id};"""
@@ -61,8 +84,9 @@ class GamesSql:
 
     #################################################################################
     def update_game_path(self, gamesObj: object):
+        path = gamesObj.path.replace("'", "''")
         sql = f"""UPDATE games SET
-                path = '{gamesObj.path}'
+                path = '{path}'
                 WHERE id = {gamesObj.id};"""
         databases = Databases(self.main)
         databases.execute(sql)
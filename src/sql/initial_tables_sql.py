@@ -33,13 +33,20 @@ class InitialTablesSql:
             create_screenshots_folder       CHAR(1)  NOT NULL DEFAULT 'Y',
             program_version                 TEXT,
             reshade_version                 TEXT,
+            use_hardlinks                   CHAR(1)  NOT NULL DEFAULT 'N',
+            watch_games                     CHAR(1)  NOT NULL DEFAULT 'N',
+            shared_preset                   CHAR(1)  NOT NULL DEFAULT 'N',
+            pinned_reshade_version          TEXT,
             CONSTRAINT  check_use_dark_theme CHECK (use_dark_theme IN ('Y','N')),
             CONSTRAINT  check_update_shaders CHECK (update_shaders IN ('Y','N')),
             CONSTRAINT  check_program_updates CHECK (check_program_updates IN ('Y','N')),
             CONSTRAINT  check_reshade_updates CHECK (check_reshade_updates IN ('Y','N')),
             CONSTRAINT  check_silent_reshade_updates CHECK (silent_reshade_updates IN ('Y','N')),
             CONSTRAINT  check_reset_reshade_files CHECK (reset_reshade_files IN ('Y','N')),
-            CONSTRAINT  check_create_screenshots_folder CHECK (create_screenshots_folder IN ('Y','N'))
+            CONSTRAINT  check_create_screenshots_folder CHECK (create_screenshots_folder IN ('Y','N')),
+            CONSTRAINT  check_use_hardlinks CHECK (use_hardlinks IN ('Y','N')),
+            CONSTRAINT  check_watch_games CHECK (watch_games IN ('Y','N')),
+            CONSTRAINT  check_shared_preset CHECK (shared_preset IN ('Y','N'))
         );
         
         CREATE TABLE IF NOT EXISTS games (
@@ -50,5 +57,40 @@ class InitialTablesSql:
             path           TEXT     NOT NULL
         );
 
+        CREATE TABLE IF NOT EXISTS games_deploy (
+            game_id        INTEGER  NOT NULL UNIQUE REFERENCES games(id) ON DELETE CASCADE,
+            deploy_method  TEXT     NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS presets (
+            id             {primary_key_type},
+            name           TEXT     NOT NULL UNIQUE,
+            hash           TEXT     NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS game_presets (
+            game_id        INTEGER  NOT NULL UNIQUE REFERENCES games(id) ON DELETE CASCADE,
+            preset_id      INTEGER  NOT NULL REFERENCES presets(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS games_apply_state (
+            game_id        INTEGER  NOT NULL UNIQUE REFERENCES games(id) ON DELETE CASCADE,
+            fingerprint    TEXT     NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS apply_jobs (
+            id                   {primary_key_type},
+            status               TEXT     NOT NULL DEFAULT 'running',
+            reset_reshade_files  CHAR(1)  NOT NULL DEFAULT 'N',
+            created_at           TEXT     NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS apply_job_games (
+            job_id         INTEGER  NOT NULL REFERENCES apply_jobs(id) ON DELETE CASCADE,
+            game_id        INTEGER  NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+            status         TEXT     NOT NULL DEFAULT 'pending',
+            error          TEXT
+        );
+
         """
-        databases.execute(sql)
+        return databases.execute(sql)
@@ -0,0 +1,54 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+from src.databases.databases import Databases
+
+
+class PresetsSql:
+    def __init__(self, main):
+        self.main = main
+        self.log = main.log
+
+    ################################################################################
+    def get_presets(self):
+        sql = "SELECT * from presets ORDER BY LOWER(name) ASC;"
+        databases = Databases(self.main)
+        return databases.select(sql)
+
+    ################################################################################
+    def update_preset(self, presetObj: object):
+        # same name again is a new version of that preset
+        name = presetObj.name.replace("'", "''")
+        sql = f"""UPDATE presets SET hash = '{presetObj.hash}' where name = '{name}';
+                INSERT INTO presets (name, hash)
+                SELECT '{name}', '{presetObj.hash}'
+                WHERE NOT EXISTS (SELECT 1 from presets where name = '{name}');"""
+        databases = Databases(self.main)
+        databases.execute(sql)
+
+    ################################################################################
+    def get_game_presets(self):
+        sql = """SELECT game_presets.game_id, presets.name, presets.hash from game_presets
+                INNER JOIN presets ON presets.id = game_presets.preset_id;"""
+        databases = Databases(self.main)
+        rs = databases.select(sql)
+        game_presets = {}
+        if rs is not None:
+            for i in range(len(rs)):
+                game_presets[rs[i]["game_id"]] = rs[i]
+        return game_presets
+
+    #################################################################################
+    def update_game_preset(self, gamePresetObj: object):
+        name = gamePresetObj.name.replace("'", "''")
+        sql = f"""DELETE from game_presets where game_id = {gamePresetObj.game_id};
+                INSERT INTO game_presets (game_id, preset_id)
+                SELECT {gamePresetObj.game_id}, id from presets where name = '{name}';"""
+        databases = Databases(self.main)
+        databases.execute(sql)
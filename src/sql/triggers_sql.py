@@ -46,4 +46,4 @@ class TriggersSql:
             ;"""
 
         databases = Databases(self.main)
-        databases.execute(sql)
+        return databases.execute(sql)
@@ -24,7 +24,8 @@ class UpdateTablesSql:
         sql = """DROP TRIGGER if exists before_insert_configs;
                 DROP TABLE if exists configs_old;
                 ALTER TABLE configs RENAME TO configs_old;"""
-        databases.execute(sql)
+        if databases.execute(sql) is not None:
+            return False
 
         initialTablesSql = InitialTablesSql(self.main)
         it = initialTablesSql.create_initial_tables()
@@ -32,7 +33,7 @@ class UpdateTablesSql:
             err_msg = messages.error_create_sql_config_msg
             self.log.error(err_msg)
             print(err_msg)
-            return
+            return False
 
         sql = "SELECT * from configs_old"
         rs_configs_old = databases.select(sql)
@@ -46,10 +47,11 @@ class UpdateTablesSql:
         sql = ""
         for col in rs_configs_old[0].keys():
             if col != "id".lower():
-                if col in rs_configs[0].keys():
+                if col in rs_configs[0].keys() and rs_configs_old[0].get(col) is not None:
                     sql += f"UPDATE configs SET {col} = '{rs_configs_old[0].get(col)}' WHERE id = 1;"
         sql += "DROP TABLE if exists configs_old;"
-        databases.execute(sql)
+        if databases.execute(sql) is not None:
+            return False
 
         triggersSql = TriggersSql(self.main)
         tr = triggersSql.create_triggers()
@@ -57,3 +59,5 @@ class UpdateTablesSql:
             err_msg = messages.error_create_sql_config_msg
             self.log.error(err_msg)
             print(err_msg)
+            return False
+        return True
@@ -1,5 +1,21 @@
-__all__ = ['constants',
+__all__ = ['apply_journal',
+           'assets',
+           'constants',
            'create_files',
+           'dll_verify',
+           'file_copy',
+           'file_deploy',
+           'game_watcher',
+           'ini_cache',
+           'library_scanner',
            'messages',
+           'pe_inspect',
+           'prefetch',
+           'preflight',
+           'preset_store',
+           'reshade_cache',
+           'screenshot_dirs',
+           'self_update',
+           'theme',
            'utilities'
            ]
@@ -0,0 +1,164 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+
+from src.utils import constants, file_copy
+
+_TMP_SUFFIX = ".rsu_tmp"
+_BAK_SUFFIX = ".rsu_bak"
+_PENDING = "pending"
+_COMMITTED = "committed"
+_log = logging.getLogger(__name__)
+
+
+class GameTransaction:
+    # every file is written to a temp file first and renamed over the original,
+    # the original is kept as a backup until commit, the journal lets a crash be rolled back
+    def __init__(self, game_id: int, game_name: str):
+        self.game_id = game_id
+        self.game_name = game_name
+        self.journal_path = os.path.join(constants.APPLY_JOURNAL_PATH, f"{game_id}.json")
+        self.state = _PENDING
+        self.entries = []
+
+    ################################################################################
+    def begin(self):
+        if not os.path.isdir(constants.APPLY_JOURNAL_PATH):
+            os.makedirs(constants.APPLY_JOURNAL_PATH)
+        self._write_journal()
+        return self
+
+    ################################################################################
+    def stage(self, dst_path: str):
+        entry = self._add_entry(dst_path, f"{dst_path}{_TMP_SUFFIX}")
+        if os.path.lexists(entry["tmp"]):
+            os.remove(entry["tmp"])
+        return entry["tmp"]
+
+    ################################################################################
+    def replace(self, dst_path: str):
+        entry = self._get_entry(dst_path)
+        if entry["existed"]:
+            os.replace(dst_path, entry["bak"])
+        os.replace(entry["tmp"], dst_path)
+        file_copy.track_rename(entry["tmp"], dst_path)
+
+    ################################################################################
+    def remove(self, dst_path: str):
+        entry = self._add_entry(dst_path, None)
+        if entry["existed"]:
+            os.replace(dst_path, entry["bak"])
+
+    ################################################################################
+    def commit(self):
+        self.state = _COMMITTED
+        self._write_journal()
+        _cleanup_committed(self.entries)
+        _remove_journal(self.journal_path)
+
+    ################################################################################
+    def rollback(self):
+        _rollback_entries(self.entries)
+        _remove_journal(self.journal_path)
+
+    ################################################################################
+    def _add_entry(self, dst_path: str, tmp_path):
+        entry = dict(dst=dst_path,
+                     tmp=tmp_path,
+                     bak=f"{dst_path}{_BAK_SUFFIX}",
+                     existed=os.path.lexists(dst_path))
+        self.entries.append(entry)
+        # journal has to be on disk before the game folder is touched
+        self._write_journal()
+        return entry
+
+    ################################################################################
+    def _get_entry(self, dst_path: str):
+        for entry in reversed(self.entries):
+            if entry["dst"] == dst_path:
+                return entry
+        raise KeyError(dst_path)
+
+    ################################################################################
+    def _write_journal(self):
+        tmp_path = f"{self.journal_path}{_TMP_SUFFIX}"
+        journal = dict(game_id=self.game_id,
+                       game_name=self.game_name,
+                       state=self.state,
+                       entries=self.entries)
+        with open(tmp_path, encoding="utf-8", mode="w") as file:
+            json.dump(journal, file)
+        os.replace(tmp_path, self.journal_path)
+
+
+################################################################################
+def recover_journals():
+    # journals left behind by a crash, pending ones are rolled back, committed ones just cleaned
+    recovered = []
+    if not os.path.isdir(constants.APPLY_JOURNAL_PATH):
+        return recovered
+
+    for file_name in os.listdir(constants.APPLY_JOURNAL_PATH):
+        if not file_name.endswith(".json"):
+            continue
+        journal_path = os.path.join(constants.APPLY_JOURNAL_PATH, file_name)
+        try:
+            with open(journal_path, encoding="utf-8", mode="r") as file:
+                journal = json.load(file)
+        except (OSError, ValueError) as e:
+            _log.error(f"recover_journals: {journal_path} {e}")
+            continue
+
+        if journal["state"] == _COMMITTED:
+            _cleanup_committed(journal["entries"])
+        else:
+            _rollback_entries(journal["entries"])
+            recovered.append(journal["game_name"])
+        _remove_journal(journal_path)
+    return recovered
+
+
+################################################################################
+def _rollback_entries(entries: list):
+    for entry in reversed(entries):
+        try:
+            if entry["tmp"] is not None and os.path.lexists(entry["tmp"]):
+                os.remove(entry["tmp"])
+                replaced = False
+            else:
+                replaced = True
+
+            if os.path.lexists(entry["bak"]):
+                os.replace(entry["bak"], entry["dst"])
+            elif not entry["existed"] and replaced and os.path.lexists(entry["dst"]):
+                os.remove(entry["dst"])
+        except OSError as e:
+            _log.error(f"rollback: {entry['dst']} {e}")
+
+
+################################################################################
+def _cleanup_committed(entries: list):
+    for entry in entries:
+        try:
+            if os.path.lexists(entry["bak"]):
+                os.remove(entry["bak"])
+        except OSError as e:
+            _log.error(f"commit: {entry['bak']} {e}")
+
+
+################################################################################
+def _remove_journal(journal_path: str):
+    try:
+        if os.path.isfile(journal_path):
+            os.remove(journal_path)
+    except OSError as e:
+        _log.error(f"remove_journal: {journal_path} {e}")
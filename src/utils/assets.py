@@ -0,0 +1,69 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+
+from src.utils import constants
+
+# paths inside the repo and inside the frozen exe, see the datas of the .spec files
+PAYPAL_PNG = "src/images/paypal.png"
+PRESET_INI = "src/files/ReShadePreset.ini"
+STYLE_QSS = "src/files/style.qss"
+_MANIFEST = "manifest.json"
+
+
+################################################################################
+def get_asset_path(name: str):
+    # a refreshed copy wins over the one shipped with the program
+    cache_path = get_cache_path(name)
+    if os.path.isfile(cache_path):
+        return cache_path
+    return get_bundled_path(name)
+
+
+################################################################################
+def get_bundled_path(name: str):
+    # pyinstaller unpacks the datas to sys._MEIPASS, from source the repo root is used
+    base_path = getattr(sys, "_MEIPASS", None)
+    if base_path is None:
+        base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base_path, *name.split("/"))
+
+
+################################################################################
+def get_cache_path(name: str):
+    return os.path.join(constants.ASSETS_CACHE_PATH, os.path.basename(name))
+
+
+################################################################################
+def get_remote_assets():
+    return {PAYPAL_PNG: constants.PAYPAL_REMOTE_FILENAME,
+            PRESET_INI: constants.PRESET_REMOTE_FILENAME,
+            STYLE_QSS: constants.CSS_REMOTE_FILENAME}
+
+
+################################################################################
+def needs_refresh():
+    # fetched once per program version instead of on every start
+    try:
+        with open(os.path.join(constants.ASSETS_CACHE_PATH, _MANIFEST), encoding="utf-8", mode="r") as file:
+            return json.load(file).get("program_version") != constants.VERSION
+    except (OSError, ValueError):
+        return True
+
+
+################################################################################
+def set_refreshed():
+    manifest_path = os.path.join(constants.ASSETS_CACHE_PATH, _MANIFEST)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, encoding="utf-8", mode="w") as file:
+        json.dump(dict(program_version=constants.VERSION), file)
+    os.replace(tmp_path, manifest_path)
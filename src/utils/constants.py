@@ -20,6 +20,10 @@ PROGRAM_NAME = "Reshade Utils"
 SHORT_PROGRAM_NAME = "ReshadeUtils"
 FULL_PROGRAM_NAME = f"{PROGRAM_NAME} v{VERSION}"
 EXE_PROGRAM_NAME = f"{SHORT_PROGRAM_NAME}.exe"
+PREFLIGHT_ARG = "--preflight-done"
+LOG_JSON_ARG = "--log-json"
+# bump when tables, triggers or config columns change
+DB_SCHEMA_VERSION = 2
 ################################################################################
 DATE_FORMATTER = "%b/%d/%Y"
 TIME_FORMATTER = "%H:%M:%S"
@@ -56,7 +60,24 @@ RESHADE_SCREENSHOT_PATH = os.path.join(utilities.get_pictures_path(), 'Screensho
 SQLITE3_FILENAME = os.path.join(PROGRAM_PATH, 'database.db')
 STYLE_QSS_FILENAME = os.path.join(PROGRAM_PATH, 'style.qss')
 ERROR_LOGS_FILENAME = os.path.join(PROGRAM_PATH, 'errors.log')
+JSON_LOGS_FILENAME = os.path.join(PROGRAM_PATH, 'log.jsonl')
+PREFLIGHT_FILENAME = os.path.join(PROGRAM_PATH, 'preflight.json')
 RESHADE_PRESET_FILENAME = os.path.join(PROGRAM_PATH, RESHADE_PRESET_INI)
+WATCHER_TIMER_MSEC = 5000
+PRESETS_PATH = os.path.join(PROGRAM_PATH, "presets")
+SHARED_PRESET_FILENAME = os.path.join(PRESETS_PATH, RESHADE_PRESET_INI)
+PRESET_STORE_PATH = os.path.join(PRESETS_PATH, "store")
+RESHADE_CACHE_PATH = os.path.join(PROGRAM_PATH, "reshade_cache")
+RESHADE_CACHE_MAX_VERSIONS = 5
+RESHADE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+STAGING_PATH = os.path.join(PROGRAM_PATH, "staging")
+STAGED_SHADERS_ZIP_PATH = os.path.join(STAGING_PATH, f"{RESHADE_SHADERS}.zip")
+PREFETCH_TIMER_MSEC = 2000
+SCAN_TIMER_MSEC = 200
+SETTINGS_FLUSH_MSEC = 500
+APPLY_JOBS_KEPT = 10
+APPLY_JOURNAL_PATH = os.path.join(PROGRAM_PATH, "journal")
+ASSETS_CACHE_PATH = os.path.join(PROGRAM_PATH, "assets")
 ################################################################################
 GITHUB_LATEST_VERSION_URL = f"https://github.com/ddc/{SHORT_PROGRAM_NAME}/releases/latest"
 GITHUB_EXE_PROGRAM_URL = f"https://github.com/ddc/{SHORT_PROGRAM_NAME}/releases/download/v"
@@ -70,4 +91,5 @@ RESHADE_EXE_URL = "https://reshade.me/downloads/ReShade_Setup_"
 PAYPAL_URL = "https://www.paypal.com/cgi-bin/webscr?cmd=_s-xclick&hosted_button_id=ENK474GPJMVTE"
 ################################################################################
 # table columns after fisrt release
-NEW_CONFIG_TABLE_COLUMNS = ["silent_reshade_updates", "program_version"]
+NEW_CONFIG_TABLE_COLUMNS = ["silent_reshade_updates", "program_version", "use_hardlinks", "watch_games", "shared_preset",
+                            "pinned_reshade_version"]
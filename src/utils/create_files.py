@@ -7,9 +7,10 @@
 #|*****************************************************
 # # -*- coding: utf-8 -*-
 
-from src.utils import constants
+from src.utils import assets, constants
+import functools
 import os
-import requests
+import shutil
 
 
 class CreateFiles:
@@ -20,13 +21,10 @@ class CreateFiles:
     ################################################################################
     def create_reshade_preset_ini_file(self):
         dst_path = constants.RESHADE_PRESET_FILENAME
-        preset_remote_file = constants.PRESET_REMOTE_FILENAME
 
         try:
-            req = requests.get(preset_remote_file)
-            with open(dst_path, 'wb') as outfile:
-                outfile.write(req.content)
-        except requests.HTTPError as e:
+            shutil.copyfile(assets.get_asset_path(assets.PRESET_INI), dst_path)
+        except OSError as e:
                 file = open(constants.RESHADE_PRESET_FILENAME, encoding="utf-8", mode="w")
                 file.write(
 """PreprocessorDefinitions=
@@ -56,99 +54,24 @@ show_sharpen=0
                 file.close()
 
     ################################################################################
-    def create_reshade_ini_file(self, game_path:str, screenshot_path:str):
-        file = open(os.path.join(game_path, constants.RESHADE_INI), encoding="utf-8", mode="w")
-        file.write(
-f"""[D3D11]
-DepthCopyAtClearIndex=0
-DepthCopyBeforeClears=0
-UseAspectRatioHeuristics=1
-
-[D3D12]
-DepthCopyAtClearIndex=0
-DepthCopyBeforeClears=0
-UseAspectRatioHeuristics=1
-
-[D3D9]
-DepthCopyAtClearIndex=0
-DepthCopyBeforeClears=0
-DisableINTZ=0
-UseAspectRatioHeuristics=1
-
-[GENERAL]
-EffectSearchPaths={constants.PROGRAM_PATH}\\Reshade-shaders\\Shaders
-PerformanceMode=1
-PreprocessorDefinitions=
-PresetPath=.\\{constants.RESHADE_PRESET_INI}
-PresetTransitionDelay=1000
-SkipLoadingDisabledEffects=1
-TextureSearchPaths={constants.PROGRAM_PATH}\\Reshade-shaders\\Textures
-
-[INPUT]
-ForceShortcutModifiers=1
-InputProcessing=2
-KeyEffects=145,0,0,0
-KeyNextPreset=0,0,0,0
-KeyOverlay=119,0,1,0
-KeyPerformanceMode=0,0,0,0
-KeyPreviousPreset=0,0,0,0
-KeyReload=0,0,0,0
-KeyScreenshot=44,0,0,0
-
-[OVERLAY]
-ClockFormat=1
-FPSPosition=1
-NoFontScaling=1
-SaveWindowState=0
-ShowClock=0
-ShowForceLoadEffectsButton=1
-ShowFPS=0
-ShowFrameTime=0
-ShowScreenshotMessage=1
-TutorialProgress=4
-VariableListHeight=300.000000
-VariableListUseTabs=1
-
-[SCREENSHOTS]
-ClearAlpha=1
-FileFormat=1
-FileNamingFormat=0
-JPEGQuality=100
-SaveBeforeShot=0
-SaveOverlayShot=0
-SavePath={screenshot_path}
-SavePresetFile=0
-
-[STYLE]
-Alpha=1.000000
-ChildRounding=12.000000
-ColFPSText=1.000000,1.000000,0.784314,1.000000
-EditorFont=ProggyClean.ttf
-EditorFontSize=13
-EditorStyleIndex=0
-Font=ProggyClean.ttf
-FontSize=13
-FPSScale=1.000000
-FrameRounding=12.000000
-GrabRounding=12.000000
-PopupRounding=12.000000
-ScrollbarRounding=12.000000
-StyleIndex=0
-TabRounding=12.000000
-WindowRounding=12.000000
-""")
-        file.close()
+    def create_reshade_ini_file(self, game_path:str, screenshot_path:str, file_name=None, merge=False, preset_path=None):
+        # returns False when the file already has the wanted content and nothing was written
+        content = get_reshade_ini_content(game_path, screenshot_path, merge, preset_path)
+        if content is None:
+            return False
+        if file_name is None:
+            file_name = constants.RESHADE_INI
+        with open(os.path.join(game_path, file_name), mode="wb") as file:
+            file.write(content)
+        return True
 
     ################################################################################
     def create_style_file(self):
         dst_path = constants.STYLE_QSS_FILENAME
-        css_remote_file = constants.CSS_REMOTE_FILENAME
 
         try:
-            req = requests.get(css_remote_file)
-            with open(dst_path, 'wb') as outfile:
-                outfile.write(req.content)
-        except requests.HTTPError as e:
+            shutil.copyfile(assets.get_asset_path(assets.STYLE_QSS), dst_path)
+        except OSError as e:
             file = open(constants.STYLE_QSS_FILENAME, encoding="utf-8", mode="w")
             file.write(
 """QWidget {
@@ -403,3 +326,172 @@ QTableCornerButton::section {
 }
 """)
             file.close()
+
+
+################################################################################
+def get_reshade_managed_keys(screenshot_path: str, preset_path=None):
+    # keys this program owns inside Reshade.ini, everything else belongs to the user
+    # PresetPath is only owned when a preset_path is given (shared preset), SavePath only
+    # when a screenshot folder is known, otherwise the user's own folder is kept
+    keys = {("GENERAL", "EffectSearchPaths"): f"{constants.SHADERS_SRC_PATH}\\Shaders",
+            ("GENERAL", "TextureSearchPaths"): f"{constants.SHADERS_SRC_PATH}\\Textures"}
+    if screenshot_path:
+        keys[("SCREENSHOTS", "SavePath")] = screenshot_path
+    if preset_path is not None:
+        keys[("GENERAL", "PresetPath")] = preset_path
+    return keys
+
+
+################################################################################
+@functools.lru_cache(maxsize=256)
+def render_reshade_ini(shaders_path: str, screenshot_path: str, preset_path=None):
+    # rendered once per unique (shader path, screenshot path, preset path)
+    if preset_path is None:
+        preset_path = f".\\{constants.RESHADE_PRESET_INI}"
+    text = _RESHADE_INI_TEMPLATE.format(effect_search_paths=f"{shaders_path}\\Shaders",
+                                        texture_search_paths=f"{shaders_path}\\Textures",
+                                        preset_path=preset_path,
+                                        screenshot_path=screenshot_path)
+    return text.replace("\n", os.linesep).encode("utf-8")
+
+
+################################################################################
+def get_reshade_ini_content(game_path: str, screenshot_path: str, merge=False, preset_path=None):
+    # full template, or with merge only the managed keys of the existing file are updated
+    # returns None when the existing file is already up to date
+    ini_path = os.path.join(game_path, constants.RESHADE_INI)
+    try:
+        with open(ini_path, mode="rb") as file:
+            current = file.read()
+    except OSError:
+        current = None
+
+    if merge and current is not None:
+        text = current.decode("utf-8", errors="replace")
+        content = merge_ini_text(text, get_reshade_managed_keys(screenshot_path, preset_path)).encode("utf-8")
+    else:
+        content = render_reshade_ini(constants.SHADERS_SRC_PATH, screenshot_path, preset_path)
+
+    if content == current:
+        return None
+    return content
+
+
+################################################################################
+def merge_ini_text(text: str, values: dict):
+    # values is {(section, key): value}, sections and keys that are missing get appended
+    newline = "\r\n" if "\r\n" in text else "\n"
+    lines = text.splitlines()
+    pending = dict(values)
+    section = None
+    section_ends = {}
+
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith("[") and stripped.endswith("]"):
+            section = stripped[1:-1].strip().upper()
+            section_ends[section] = i
+            continue
+        if section is None or "=" not in stripped:
+            continue
+        section_ends[section] = i
+        key = stripped.split("=", 1)[0].strip()
+        for section_key in list(pending):
+            if section_key[0].upper() == section and section_key[1] == key:
+                lines[i] = f"{key}={pending.pop(section_key)}"
+                break
+
+    # insert from the bottom up so the recorded line numbers stay valid
+    pending_items = sorted(pending.items(), key=lambda x: section_ends.get(x[0][0].upper(), -1), reverse=True)
+    for (section_name, key), value in pending_items:
+        index = section_ends.get(section_name.upper())
+        if index is None:
+            if len(lines) > 0 and lines[-1].strip():
+                lines.append("")
+            lines.append(f"[{section_name}]")
+            lines.append(f"{key}={value}")
+            section_ends[section_name.upper()] = len(lines) - 1
+        else:
+            lines.insert(index + 1, f"{key}={value}")
+
+    return newline.join(lines) + newline
+
+
+_RESHADE_INI_TEMPLATE = """[D3D11]
+DepthCopyAtClearIndex=0
+DepthCopyBeforeClears=0
+UseAspectRatioHeuristics=1
+
+[D3D12]
+DepthCopyAtClearIndex=0
+DepthCopyBeforeClears=0
+UseAspectRatioHeuristics=1
+
+[D3D9]
+DepthCopyAtClearIndex=0
+DepthCopyBeforeClears=0
+DisableINTZ=0
+UseAspectRatioHeuristics=1
+
+[GENERAL]
+EffectSearchPaths={effect_search_paths}
+PerformanceMode=1
+PreprocessorDefinitions=
+PresetPath={preset_path}
+PresetTransitionDelay=1000
+SkipLoadingDisabledEffects=1
+TextureSearchPaths={texture_search_paths}
+
+[INPUT]
+ForceShortcutModifiers=1
+InputProcessing=2
+KeyEffects=145,0,0,0
+KeyNextPreset=0,0,0,0
+KeyOverlay=119,0,1,0
+KeyPerformanceMode=0,0,0,0
+KeyPreviousPreset=0,0,0,0
+KeyReload=0,0,0,0
+KeyScreenshot=44,0,0,0
+
+[OVERLAY]
+ClockFormat=1
+FPSPosition=1
+NoFontScaling=1
+SaveWindowState=0
+ShowClock=0
+ShowForceLoadEffectsButton=1
+ShowFPS=0
+ShowFrameTime=0
+ShowScreenshotMessage=1
+TutorialProgress=4
+VariableListHeight=300.000000
+VariableListUseTabs=1
+
+[SCREENSHOTS]
+ClearAlpha=1
+FileFormat=1
+FileNamingFormat=0
+JPEGQuality=100
+SaveBeforeShot=0
+SaveOverlayShot=0
+SavePath={screenshot_path}
+SavePresetFile=0
+
+[STYLE]
+Alpha=1.000000
+ChildRounding=12.000000
+ColFPSText=1.000000,1.000000,0.784314,1.000000
+EditorFont=ProggyClean.ttf
+EditorFontSize=13
+EditorStyleIndex=0
+Font=ProggyClean.ttf
+FontSize=13
+FPSScale=1.000000
+FrameRounding=12.000000
+GrabRounding=12.000000
+PopupRounding=12.000000
+ScrollbarRounding=12.000000
+StyleIndex=0
+TabRounding=12.000000
+WindowRounding=12.000000
+"""
@@ -0,0 +1,94 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils import constants, utilities
+
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+STATUS_STALE = "stale"
+STATUS_FOREIGN = "foreign"
+_VERIFY_WORKERS = 16
+_RESHADE_MARKER = "ReShade".encode("utf-16-le")
+
+
+################################################################################
+def hash_file(path: str):
+    # hashing straight from the page cache, no read buffers
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size > 0:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                sha256.update(data)
+    return sha256.hexdigest()
+
+
+################################################################################
+def verify_games(games: list):
+    # the program dlls are hashed once, every game dll is checked by size first
+    # and only hashed when the size matches
+    reshade_dlls = {}
+    for architecture, path in (("32bits", constants.RESHADE32_PATH), ("64bits", constants.RESHADE64_PATH)):
+        try:
+            reshade_dlls[architecture] = (os.path.getsize(path), hash_file(path))
+        except OSError:
+            reshade_dlls[architecture] = (None, None)
+
+    if len(games) == 0:
+        return []
+    with ThreadPoolExecutor(max_workers=min(_VERIFY_WORKERS, len(games))) as executor:
+        return list(executor.map(lambda x: _verify_game(x, reshade_dlls), games))
+
+
+################################################################################
+def _verify_game(games_obj, reshade_dlls: dict):
+    game_dir = '\\'.join(games_obj.path.split("\\")[:-1])
+    dll_name = constants.D3D9 if games_obj.api == "DX9" else constants.DXGI
+    result = utilities.Object()
+    result.game_id = games_obj.id
+    result.game_name = games_obj.game_name
+    result.dll_path = f"{game_dir}\\{dll_name}"
+
+    expected_size, expected_hash = reshade_dlls[games_obj.architecture]
+    try:
+        size = os.path.getsize(result.dll_path)
+    except OSError:
+        result.status = STATUS_MISSING
+        return result
+
+    try:
+        same_dll = size == expected_size and hash_file(result.dll_path) == expected_hash
+    except OSError:
+        same_dll = False
+
+    if same_dll:
+        result.status = STATUS_OK
+    elif _is_reshade_dll(result.dll_path):
+        # an older build, or the build of the other architecture
+        result.status = STATUS_STALE
+    else:
+        result.status = STATUS_FOREIGN
+    return result
+
+
+################################################################################
+def _is_reshade_dll(path: str):
+    # the version resource of every reshade build carries the product name in utf-16
+    try:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return data.rfind(_RESHADE_MARKER) != -1
+    except OSError:
+        return False
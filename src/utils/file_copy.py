@@ -0,0 +1,175 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import logging
+import mmap
+import os
+import sys
+import time
+
+COPY_BUFSIZE = 1024 * 1024
+_log = logging.getLogger(__name__)
+_active_batch = None
+
+
+class CopyStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.files = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def add(self, size: int, seconds: float):
+        self.files += 1
+        self.bytes += size
+        self.seconds += seconds
+
+    def bytes_per_sec(self):
+        if self.seconds <= 0:
+            return 0
+        return int(self.bytes / self.seconds)
+
+
+copy_stats = CopyStats()
+
+
+################################################################################
+class SyncBatch:
+    # while active, copy_file(fsync=True) defers the fsync until the batch exits
+    def __init__(self):
+        self.paths = []
+
+    def __enter__(self):
+        global _active_batch
+        self._previous = _active_batch
+        _active_batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        global _active_batch
+        _active_batch = self._previous
+        self.flush()
+        return False
+
+    def rename(self, old_path: str, new_path: str):
+        self.paths = [new_path if x == old_path else x for x in self.paths]
+
+    def flush(self, raise_errors=False):
+        paths = self.paths
+        self.paths = []
+        for path in paths:
+            try:
+                _fsync_path(path)
+            except OSError as e:
+                if raise_errors:
+                    raise
+                _log.error(f"fsync: {path} {e}")
+
+
+################################################################################
+def track_rename(old_path: str, new_path: str):
+    # a staged file that is renamed before the batch flush is synced under its new name
+    if _active_batch is not None:
+        _active_batch.rename(old_path, new_path)
+
+
+################################################################################
+def flush_batch():
+    # for callers that depend on the files being on disk, errors are raised instead of logged
+    if _active_batch is not None:
+        _active_batch.flush(raise_errors=True)
+
+
+################################################################################
+def sync_file(path: str):
+    if _active_batch is not None:
+        _active_batch.paths.append(path)
+    else:
+        _fsync_path(path)
+
+
+################################################################################
+def copy_file(src_path: str, dst_path: str, fsync=False):
+    start = time.perf_counter()
+    with open(src_path, "rb") as fsrc, open(dst_path, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        copied = _copy_kernel(fsrc.fileno(), fdst.fileno(), size)
+        if copied is None:
+            copied = _copy_buffered(fsrc, fdst)
+
+    if fsync:
+        sync_file(dst_path)
+
+    elapsed = time.perf_counter() - start
+    copy_stats.add(copied, elapsed)
+    if elapsed > 0:
+        _log.debug(f"copy_file: {src_path} -> {dst_path} {copied} bytes {int(copied / elapsed)} bytes/sec")
+    return copied
+
+
+################################################################################
+def _copy_kernel(src_fd: int, dst_fd: int, size: int):
+    # copy_file_range/sendfile keep the data in the kernel, returns None when neither is usable
+    if size == 0:
+        return None
+
+    for func in (getattr(os, "copy_file_range", None), _sendfile):
+        if func is None:
+            continue
+        copied = 0
+        try:
+            while copied < size:
+                sent = func(src_fd, dst_fd, size - copied, copied)
+                if sent == 0:
+                    break
+                copied += sent
+        except OSError:
+            if copied > 0:
+                raise
+            continue
+        if copied > 0:
+            return copied
+    return None
+
+
+################################################################################
+def _sendfile(src_fd: int, dst_fd: int, count: int, offset: int):
+    # sendfile into a regular file only works on linux
+    if not hasattr(os, "sendfile") or not sys.platform.startswith("linux"):
+        raise OSError("sendfile not available")
+    return os.sendfile(dst_fd, src_fd, offset, count)
+
+
+################################################################################
+def _copy_buffered(fsrc, fdst):
+    # anonymous mmap gives a page aligned buffer
+    copied = 0
+    with mmap.mmap(-1, COPY_BUFSIZE) as buf:
+        view = memoryview(buf)
+        try:
+            while True:
+                read = fsrc.readinto(view)
+                if not read:
+                    break
+                fdst.write(view[:read])
+                copied += read
+        finally:
+            view.release()
+    return copied
+
+
+################################################################################
+def _fsync_path(path: str):
+    fd = os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
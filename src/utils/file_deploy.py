@@ -0,0 +1,85 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import os
+
+from src.utils import constants, file_copy
+
+DEPLOY_HARDLINK = "hardlink"
+DEPLOY_REFLINK = "reflink"
+DEPLOY_COPY = "copy"
+_FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+
+################################################################################
+def is_same_volume(src_path: str, dst_dir: str):
+    try:
+        return os.stat(src_path).st_dev == os.stat(dst_dir).st_dev
+    except OSError:
+        return False
+
+
+################################################################################
+def deploy_file(src_path: str, dst_path: str, use_links=False, known_method=None, fsync=False):
+    # hardlink (same volume) -> reflink -> copy, returns the method used
+    # known_method is the one recorded on the last deploy, if it was a copy the links are not tried again
+    if use_links and known_method != DEPLOY_COPY:
+        dst_dir = os.path.dirname(dst_path)
+        if is_same_volume(src_path, dst_dir):
+            try:
+                if os.path.isfile(dst_path) and os.path.samefile(src_path, dst_path):
+                    return DEPLOY_HARDLINK
+                _replace_with(os.link, src_path, dst_path)
+                return DEPLOY_HARDLINK
+            except (OSError, NotImplementedError):
+                pass
+
+        if constants.IS_LINUX:
+            try:
+                _replace_with(_reflink, src_path, dst_path)
+                return DEPLOY_REFLINK
+            except OSError:
+                pass
+
+    _unlink_if_hardlinked(dst_path)
+    file_copy.copy_file(src_path, dst_path, fsync)
+    return DEPLOY_COPY
+
+
+################################################################################
+def _replace_with(func, src_path: str, dst_path: str):
+    # links cannot overwrite an existing file, so create beside it and swap
+    tmp_path = f"{dst_path}.tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        func(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+    except OSError:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+################################################################################
+def _reflink(src_path: str, dst_path: str):
+    import fcntl
+
+    with open(src_path, "rb") as fsrc, open(dst_path, "wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+
+
+################################################################################
+def _unlink_if_hardlinked(dst_path: str):
+    # copying over a hardlink would write into the shared program dll
+    try:
+        if os.stat(dst_path).st_nlink > 1:
+            os.remove(dst_path)
+    except OSError:
+        pass
@@ -0,0 +1,209 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import logging
+import os
+import queue
+import threading
+
+from src.utils import constants
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+POLL_INTERVAL = 10
+# game updates settle for a moment before the folder is checked
+_SETTLE_SECONDS = 2
+_log = logging.getLogger(__name__)
+
+
+class GameWatcher:
+    # watches the managed files of every game folder, a game shows up in self.changed
+    # when its dll was removed or replaced, or its Reshade.ini / preset was removed.
+    # edits of the ini/preset are not changes, reshade itself writes those files.
+    def __init__(self):
+        self.changed = queue.Queue()
+        self._games = {}
+        self._snapshots = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._observer = None
+        self._paused = 0
+        # bumped by every pause/resume, a check that read a folder across one is dropped
+        self._generation = 0
+
+    ################################################################################
+    def set_games(self, rs_games: dict):
+        games = {}
+        for i in range(len(rs_games)):
+            game_dir = '\\'.join(rs_games[i]["path"].split("\\")[:-1])
+            dll_name = constants.D3D9 if rs_games[i]["api"] == "DX9" else constants.DXGI
+            games.setdefault(game_dir, []).append((rs_games[i]["id"], dll_name))
+
+        with self._lock:
+            self._games = games
+            self._snapshots = dict((x, _snapshot(x, games[x])) for x in games)
+            self._dirty.clear()
+            self._generation += 1
+        if self._observer is not None:
+            self._schedule_observer()
+
+    ################################################################################
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        if Observer is not None:
+            self._observer = Observer()
+            self._schedule_observer()
+            self._observer.start()
+        self._thread = threading.Thread(target=self._run, name="GameWatcher", daemon=True)
+        self._thread.start()
+
+    ################################################################################
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    ################################################################################
+    def is_running(self):
+        return self._thread is not None
+
+    ################################################################################
+    def pause(self):
+        # while the program itself writes to the game folders
+        with self._lock:
+            self._paused += 1
+            self._generation += 1
+
+    ################################################################################
+    def resume(self, game_dirs=None):
+        # the files just written become the new reference
+        with self._lock:
+            self._paused = max(0, self._paused - 1)
+            self._generation += 1
+            for game_dir in game_dirs if game_dirs is not None else list(self._games):
+                if game_dir in self._games:
+                    self._snapshots[game_dir] = _snapshot(game_dir, self._games[game_dir])
+                    self._dirty.discard(game_dir)
+
+    ################################################################################
+    def mark_dirty(self, game_dir: str):
+        with self._lock:
+            if game_dir in self._games:
+                self._dirty.add(game_dir)
+        self._wakeup.set()
+
+    ################################################################################
+    def _schedule_observer(self):
+        self._observer.unschedule_all()
+        handler = _EventHandler(self)
+        for game_dir in list(self._games):
+            if os.path.isdir(game_dir):
+                try:
+                    self._observer.schedule(handler, game_dir, recursive=False)
+                except OSError as e:
+                    _log.error(f"game_watcher: {game_dir} {e}")
+
+    ################################################################################
+    def _run(self):
+        while not self._stop.is_set():
+            # with watchdog only folders with events are checked, the timeout is a safety net
+            woken = self._wakeup.wait(POLL_INTERVAL)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+            if woken:
+                self._stop.wait(_SETTLE_SECONDS)
+
+            with self._lock:
+                if self._paused > 0:
+                    continue
+                if self._observer is None or not woken:
+                    game_dirs = list(self._games)
+                else:
+                    game_dirs = list(self._dirty)
+                self._dirty.clear()
+
+            for game_dir in game_dirs:
+                self._check_dir(game_dir)
+
+    ################################################################################
+    def _check_dir(self, game_dir: str):
+        with self._lock:
+            if self._paused > 0:
+                return
+            generation = self._generation
+            games = self._games.get(game_dir)
+            old = self._snapshots.get(game_dir)
+        if games is None or old is None:
+            return
+
+        new = _snapshot(game_dir, games)
+        with self._lock:
+            # the program wrote to the folders while it was read, resume already took the new snapshot
+            if self._paused > 0 or generation != self._generation or game_dir not in self._snapshots:
+                return
+            self._snapshots[game_dir] = new
+        if _is_broken(old, new):
+            _log.info(f"game_watcher: managed files changed in {game_dir}")
+            for game_id, _ in games:
+                self.changed.put(game_id)
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, watcher: GameWatcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        managed = {constants.D3D9.lower(), constants.DXGI.lower(),
+                   constants.RESHADE_INI.lower(), constants.RESHADE_PRESET_INI.lower()}
+        for path in (getattr(event, "src_path", ""), getattr(event, "dest_path", "")):
+            if path and os.path.basename(path).lower() in managed:
+                self.watcher.mark_dirty(os.path.dirname(path))
+
+
+################################################################################
+def _snapshot(game_dir: str, games: list):
+    snapshot = {}
+    dll_names = set(dll_name for _, dll_name in games)
+    for file_name in list(dll_names) + [constants.RESHADE_INI, constants.RESHADE_PRESET_INI]:
+        try:
+            st = os.stat(f"{game_dir}\\{file_name}")
+            snapshot[file_name] = (st.st_size, st.st_mtime_ns, file_name in dll_names)
+        except OSError:
+            snapshot[file_name] = None
+    return snapshot
+
+
+################################################################################
+def _is_broken(old: dict, new: dict):
+    for file_name, old_stat in old.items():
+        if old_stat is None:
+            continue
+        new_stat = new.get(file_name)
+        if new_stat is None:
+            return True
+        is_dll = old_stat[2]
+        if is_dll and new_stat[:2] != old_stat[:2]:
+            return True
+    return False
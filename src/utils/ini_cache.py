@@ -0,0 +1,79 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import configparser
+import logging
+import os
+import threading
+
+_log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_cache = {}
+
+
+################################################################################
+def get_parser(file_name: str):
+    # each file is parsed once, until its mtime or size changes. None when it is missing or invalid
+    try:
+        stat = os.stat(file_name)
+    except OSError:
+        invalidate(file_name)
+        return None
+
+    key = os.path.normcase(os.path.abspath(file_name))
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+    parser = configparser.ConfigParser(delimiters='=', allow_no_value=True)
+    parser.optionxform = str  # this wont change all values to lowercase
+    parser._interpolation = configparser.ExtendedInterpolation()
+    try:
+        parser.read(file_name)
+    except (configparser.Error, UnicodeError) as e:
+        # a hand edited file reads as missing, the failure is cached so it is logged once
+        _log.error(f"ini_cache: {file_name} {e}")
+        parser = None
+
+    with _lock:
+        _cache[key] = (stat.st_mtime_ns, stat.st_size, parser)
+    return parser
+
+
+################################################################################
+def get_ini_settings(file_name: str, section: str, config_name: str):
+    return get_ini_settings_batch(file_name, [(section, config_name)])[(section, config_name)]
+
+
+################################################################################
+def get_ini_settings_batch(file_name: str, keys: list):
+    # keys is a list of (section, config_name), returns {(section, config_name): value}
+    parser = get_parser(file_name)
+    values = {}
+    for section, config_name in keys:
+        value = None
+        if parser is not None:
+            try:
+                value = parser.get(section, config_name).replace("\"", "")
+            except Exception:
+                value = None
+        if value is not None and len(value) == 0:
+            value = None
+        values[(section, config_name)] = value
+    return values
+
+
+################################################################################
+def invalidate(file_name=None):
+    with _lock:
+        if file_name is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.normcase(os.path.abspath(file_name)), None)
@@ -0,0 +1,203 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils import pe_inspect, utilities
+
+_SCAN_WORKERS = 16
+_log = logging.getLogger(__name__)
+_MAX_DEPTH = 4
+# executables that are never the game itself
+_IGNORED_EXES = re.compile(r"(unins|setup|install|redist|vcredist|vc_redist|dxsetup|dxwebsetup|dotnet|crash|"
+                           r"report|prereq|easyanticheat|battleye|helper|updater|cleanup|touchup|launcherpatcher)",
+                           re.IGNORECASE)
+_IGNORED_DIRS = re.compile(r"^(_commonredist|redist|redistributables|directx|dotnetfx|vcredist|support|"
+                           r"__installer|installers|engine)$", re.IGNORECASE)
+# "key" "value" pairs and the braces of the nested blocks
+_VDF_TOKENS = re.compile(r'"((?:[^"\\]|\\.)*)"|([{}])')
+
+
+class LibraryScan:
+    # walks the library folders in a background thread, the gui thread polls is_done()
+    # and reads self.games once the scan finished
+    def __init__(self, root_dirs: list):
+        self.root_dirs = root_dirs
+        self.games = []
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="LibraryScan", daemon=True)
+
+    ################################################################################
+    def start(self):
+        self._thread.start()
+        return self
+
+    ################################################################################
+    def is_done(self):
+        return self._done.is_set()
+
+    ################################################################################
+    def _run(self):
+        try:
+            self.games = scan_library(self.root_dirs)
+        except Exception as e:
+            _log.error(f"library scan: {e}")
+        finally:
+            self._done.set()
+
+
+################################################################################
+def find_game_executable(game_dir: str):
+    # best guess of the main exe inside a game folder, None when there is no exe at all
+    game_key = _normalize(os.path.basename(game_dir))
+    best = None
+    best_score = None
+    for path, size in _list_executables(game_dir):
+        file_name = os.path.basename(path)
+        stem = _normalize(os.path.splitext(file_name)[0])
+        score = 0
+        if "shipping" in stem:
+            score += 4  # unreal engine, reshade goes next to the shipping exe
+        if stem == game_key or (len(stem) > 2 and (stem in game_key or game_key in stem)):
+            score += 2
+        if "launcher" in stem:
+            score -= 2
+        candidate = (score, size)
+        if best_score is None or candidate > best_score:
+            best, best_score = path, candidate
+    return best
+
+
+################################################################################
+def scan_library(root_dirs: list):
+    # every sub folder of every root is one game, the folders are walked in parallel
+    game_dirs = []
+    for root_dir in root_dirs:
+        try:
+            with os.scandir(root_dir) as it:
+                game_dirs += [x.path for x in it if x.is_dir() and not _IGNORED_DIRS.match(x.name)]
+        except OSError:
+            continue
+
+    if len(game_dirs) == 0:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(_SCAN_WORKERS, len(game_dirs))) as executor:
+        results = list(executor.map(_scan_game_dir, game_dirs))
+
+    games = []
+    for game_dir, (exe_path, exe_info) in zip(game_dirs, results):
+        if exe_path is None:
+            continue
+        games_obj = utilities.Object()
+        games_obj.game_name = os.path.basename(game_dir)
+        games_obj.path = exe_path.replace("/", "\\")
+        games_obj.architecture = exe_info.architecture
+        games_obj.api = exe_info.api
+        games.append(games_obj)
+    return games
+
+
+################################################################################
+def _scan_game_dir(game_dir: str):
+    exe_path = find_game_executable(game_dir)
+    if exe_path is None:
+        return None, None
+    return exe_path, pe_inspect.inspect_exe(exe_path)
+
+
+################################################################################
+def get_library_roots(extra_roots=None):
+    roots = []
+    for root_dir in _get_default_roots() + list(extra_roots or []):
+        if root_dir and os.path.isdir(root_dir) and root_dir not in roots:
+            roots.append(root_dir)
+    return roots
+
+
+################################################################################
+def _get_default_roots():
+    program_files = [os.getenv("ProgramFiles(x86)"), os.getenv("ProgramFiles")]
+    roots = []
+    for program_path in [x for x in program_files if x]:
+        steam_apps = os.path.join(program_path, "Steam", "steamapps")
+        roots.append(os.path.join(steam_apps, "common"))
+        roots += [os.path.join(x, "steamapps", "common") for x in _read_library_folders(steam_apps)]
+        roots.append(os.path.join(program_path, "GOG Galaxy", "Games"))
+        roots.append(os.path.join(program_path, "Epic Games"))
+    roots.append(os.path.join("C:\\", "GOG Games"))
+    return roots
+
+
+################################################################################
+def _read_library_folders(steam_apps: str):
+    # every other steam library the user added is listed in libraryfolders.vdf
+    vdf_path = os.path.join(steam_apps, "libraryfolders.vdf")
+    try:
+        with open(vdf_path, encoding="utf-8", errors="replace") as file:
+            return parse_library_folders(file.read())
+    except OSError:
+        return []
+
+
+################################################################################
+def parse_library_folders(vdf_text: str):
+    # new format: "libraryfolders" { "0" { "path" "D:\\SteamLibrary" ... } }
+    # old format: "LibraryFolders" { "1" "D:\\SteamLibrary" }
+    paths = []
+    keys = []
+    key = None
+    for match in _VDF_TOKENS.finditer(vdf_text):
+        text, brace = match.groups()
+        if brace == "{":
+            keys.append(key)
+            key = None
+        elif brace == "}":
+            if keys:
+                keys.pop()
+            key = None
+        elif key is None:
+            key = text
+        else:
+            value = re.sub(r"\\(.)", r"\1", text)
+            parent = keys[-1] if keys else None
+            is_path = key.lower() == "path" \
+                or (key.isdigit() and parent is not None and parent.lower() == "libraryfolders")
+            if is_path and value and value not in paths:
+                paths.append(value)
+            key = None
+    return paths
+
+
+################################################################################
+def _list_executables(game_dir: str):
+    found = []
+    stack = [(game_dir, 0)]
+    while stack:
+        path, depth = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth < _MAX_DEPTH and not _IGNORED_DIRS.match(entry.name):
+                            stack.append((entry.path, depth + 1))
+                    elif entry.name.lower().endswith(".exe") and not _IGNORED_EXES.search(entry.name):
+                        found.append((entry.path, entry.stat().st_size))
+        except OSError:
+            continue
+    return found
+
+
+################################################################################
+def _normalize(name: str):
+    return re.sub(r"[^a-z0-9]", "", name.lower()).replace("win64", "").replace("x64", "")
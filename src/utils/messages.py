@@ -50,6 +50,27 @@ no_change_path = "No changes to path were made!"
 not_same_game = "Please, choose the same game as before!"
 path_changed_success = "Path changed successfully!"
 update_reshade_question = "Download new Reshade version now?"
+retry_failed_games_question = "Failed games were rolled back. Retry only the failed games now?"
+resume_apply_question = "The last apply did not finish. Resume it with the games that are not done yet?"
+games_remaining = "Games remaining: "
+scanning_library = "Scanning game libraries..."
+library_not_found = "No game library folder was found, please choose one."
+no_new_games_found = "No new games were found."
+games_imported = "Games imported: "
+verifying_dlls = "Verifying DLLs..."
+verify_all_ok = "All games have the current Reshade DLL."
+verify_report = "Games that do not have the current Reshade DLL:"
+verify_reapply_question = "Apply again the games with a missing or stale DLL?"
+preset_assigned = "Preset assigned!"
+reshade_version_switched = "Reshade version switched to "
+apply_all_question = "Apply it to all games now?"
+apply_dry_run = "Dry run, nothing was changed. Planned operations are in the details and the log."
+dry_run_games = "Games to apply: "
+dry_run_skipped_games = "Games already up to date: "
+dry_run_operations = "File operations: "
+dry_run_screenshot_dirs = "Screenshot folders to create: "
+reshade_dlls_missing = "Reshade DLLs not found!!!\nDownload Reshade again before applying."
+shaders_missing = "Reshade shaders not found!!!\nCheck your connection and try again."
 
 # update messages
 dl_new_version_msg = "Downloading new version..."
@@ -0,0 +1,177 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import logging
+import mmap
+import os
+import struct
+import threading
+
+from src.utils import utilities
+
+MACHINE_I386 = 0x14c
+MACHINE_AMD64 = 0x8664
+_PE32_MAGIC = 0x10b
+_PE32_PLUS_MAGIC = 0x20b
+_IMPORT_DIRECTORY = 1
+_DELAY_IMPORT_DIRECTORY = 13
+_MAX_IMPORTS = 4096
+_DX9_DLLS = {"d3d9.dll"}
+_DX11_DLLS = {"dxgi.dll", "d3d10.dll", "d3d10_1.dll", "d3d11.dll", "d3d12.dll"}
+_log = logging.getLogger(__name__)
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class PeFormatError(Exception):
+    pass
+
+
+################################################################################
+def inspect_exe(exe_path: str):
+    # architecture ("32bits"/"64bits") and api ("DX9"/"DX11") of an exe, None for what could not be found
+    # results are cached by path and mtime, a changed exe is parsed again
+    key = os.path.normcase(os.path.abspath(exe_path))
+    try:
+        st = os.stat(exe_path)
+    except OSError:
+        return _empty_result()
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        machine, imports = read_pe_headers(exe_path)
+        result = _build_result(machine, imports)
+    except (OSError, ValueError, PeFormatError, struct.error) as e:
+        _log.debug(f"inspect_exe: {exe_path} {e}")
+        result = _empty_result()
+
+    with _cache_lock:
+        _cache[key] = (stamp, result)
+    return result
+
+
+################################################################################
+def read_pe_headers(exe_path: str):
+    # only the pages holding the headers and the import table are touched
+    with open(exe_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < 64:
+            raise PeFormatError("file too small")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _parse(data)
+
+
+################################################################################
+def invalidate(exe_path=None):
+    with _cache_lock:
+        if exe_path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.normcase(os.path.abspath(exe_path)), None)
+
+
+################################################################################
+def _parse(data):
+    if data[0:2] != b"MZ":
+        raise PeFormatError("missing MZ signature")
+    pe_offset = struct.unpack_from("<I", data, 0x3C)[0]
+    if data[pe_offset:pe_offset + 4] != b"PE\0\0":
+        raise PeFormatError("missing PE signature")
+
+    coff_offset = pe_offset + 4
+    machine, num_sections = struct.unpack_from("<HH", data, coff_offset)
+    optional_size = struct.unpack_from("<H", data, coff_offset + 16)[0]
+    optional_offset = coff_offset + 20
+    magic = struct.unpack_from("<H", data, optional_offset)[0]
+    if magic == _PE32_MAGIC:
+        num_dirs_offset = optional_offset + 92
+    elif magic == _PE32_PLUS_MAGIC:
+        num_dirs_offset = optional_offset + 108
+    else:
+        raise PeFormatError(f"unknown optional header magic {magic:#x}")
+
+    num_dirs = struct.unpack_from("<I", data, num_dirs_offset)[0]
+    sections = _read_sections(data, optional_offset + optional_size, num_sections)
+
+    imports = set()
+    if num_dirs > _IMPORT_DIRECTORY:
+        rva = struct.unpack_from("<I", data, num_dirs_offset + 4 + 8 * _IMPORT_DIRECTORY)[0]
+        imports |= _read_import_names(data, sections, rva, 20, 12)
+    if num_dirs > _DELAY_IMPORT_DIRECTORY:
+        rva = struct.unpack_from("<I", data, num_dirs_offset + 4 + 8 * _DELAY_IMPORT_DIRECTORY)[0]
+        imports |= _read_import_names(data, sections, rva, 32, 4)
+    return machine, imports
+
+
+################################################################################
+def _read_sections(data, offset: int, num_sections: int):
+    sections = []
+    for i in range(num_sections):
+        virtual_size, virtual_address, raw_size, raw_pointer = struct.unpack_from("<IIII", data, offset + 40 * i + 8)
+        sections.append((virtual_address, max(virtual_size, raw_size), raw_pointer))
+    return sections
+
+
+################################################################################
+def _rva_to_offset(sections: list, rva: int):
+    for virtual_address, size, raw_pointer in sections:
+        if virtual_address <= rva < virtual_address + size:
+            return rva - virtual_address + raw_pointer
+    raise PeFormatError(f"rva {rva:#x} outside of sections")
+
+
+################################################################################
+def _read_import_names(data, sections: list, rva: int, descriptor_size: int, name_field: int):
+    names = set()
+    if rva == 0:
+        return names
+
+    offset = _rva_to_offset(sections, rva)
+    for _ in range(_MAX_IMPORTS):
+        descriptor = data[offset:offset + descriptor_size]
+        if len(descriptor) < descriptor_size or descriptor == bytes(descriptor_size):
+            break
+        name_rva = struct.unpack_from("<I", descriptor, name_field)[0]
+        if name_rva != 0:
+            name_offset = _rva_to_offset(sections, name_rva)
+            end = data.find(b"\0", name_offset, name_offset + 256)
+            if end != -1:
+                names.add(data[name_offset:end].decode("ascii", "replace").lower())
+        offset += descriptor_size
+    return names
+
+
+################################################################################
+def _build_result(machine: int, imports: set):
+    result = _empty_result()
+    if machine == MACHINE_I386:
+        result.architecture = "32bits"
+    elif machine == MACHINE_AMD64:
+        result.architecture = "64bits"
+
+    # dx10+ games often import d3d9 as well, for the D3DPERF markers, so it only decides alone
+    if imports & _DX11_DLLS:
+        result.api = "DX11"
+    elif imports & _DX9_DLLS:
+        result.api = "DX9"
+    result.imports = imports
+    return result
+
+
+################################################################################
+def _empty_result():
+    result = utilities.Object()
+    result.architecture = None
+    result.api = None
+    result.imports = set()
+    return result
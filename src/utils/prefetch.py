@@ -0,0 +1,150 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import logging
+import os
+import queue
+import shutil
+import threading
+import zipfile
+
+import requests
+
+from src.utils import assets, constants, reshade_cache, utilities
+
+PREFETCH_RESHADE = "reshade"
+PREFETCH_SHADERS = "shaders"
+PREFETCH_ASSETS = "assets"
+# small pause between chunks so the prefetch does not take the whole connection
+_CHUNK_DELAY = 0.005
+_log = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    # downloads new releases in a background thread, finished items show up in self.done
+    # as (kind, value, ok) and are read on the gui thread
+    def __init__(self):
+        self.done = queue.Queue()
+        self._tasks = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    ################################################################################
+    def prefetch_reshade(self, version: str):
+        if version is None or reshade_cache.has_version(version):
+            return
+        self._put((PREFETCH_RESHADE, version))
+
+    ################################################################################
+    def prefetch_shaders(self):
+        self._put((PREFETCH_SHADERS, None))
+
+    ################################################################################
+    def prefetch_assets(self):
+        if not assets.needs_refresh():
+            return
+        self._put((PREFETCH_ASSETS, None))
+
+    ################################################################################
+    def _put(self, task: tuple):
+        with self._lock:
+            if task in self._pending:
+                return
+            self._pending.add(task)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="Prefetcher", daemon=True)
+                self._thread.start()
+        self._tasks.put(task)
+
+    ################################################################################
+    def _run(self):
+        while True:
+            kind, value = self._tasks.get()
+            ok = False
+            try:
+                if kind == PREFETCH_RESHADE:
+                    _prefetch_reshade(value)
+                elif kind == PREFETCH_SHADERS:
+                    _prefetch_shaders()
+                else:
+                    _prefetch_assets()
+                ok = True
+            except (OSError, ValueError, zipfile.BadZipFile, requests.exceptions.RequestException) as e:
+                _log.error(f"prefetch {kind}: {e}")
+            except Exception:
+                # the thread has to outlive any single task
+                _log.exception(f"prefetch {kind}")
+            finally:
+                with self._lock:
+                    self._pending.discard((kind, value))
+                self.done.put((kind, value, ok))
+
+
+################################################################################
+def has_staged_shaders():
+    return os.path.isfile(constants.STAGED_SHADERS_ZIP_PATH)
+
+
+################################################################################
+def install_staged_shaders():
+    # swaps the prefetched shaders in, only local file operations
+    staging_out = os.path.join(constants.STAGING_PATH, "shaders")
+    if os.path.isdir(staging_out):
+        shutil.rmtree(staging_out)
+    with zipfile.ZipFile(constants.STAGED_SHADERS_ZIP_PATH) as zipf:
+        zipf.extractall(staging_out)
+
+    extracted_path = os.path.join(staging_out, os.path.basename(constants.RES_SHAD_MPATH))
+    if not os.path.isdir(extracted_path):
+        raise FileNotFoundError(extracted_path)
+    if os.path.exists(constants.SHADERS_SRC_PATH):
+        shutil.rmtree(constants.SHADERS_SRC_PATH)
+    os.replace(extracted_path, constants.SHADERS_SRC_PATH)
+    shutil.rmtree(staging_out, ignore_errors=True)
+    os.remove(constants.STAGED_SHADERS_ZIP_PATH)
+
+
+################################################################################
+def _prefetch_reshade(version: str):
+    staging_dir = os.path.join(constants.STAGING_PATH, f"reshade_{version}")
+    setup_path = os.path.join(constants.STAGING_PATH, f"ReShade_Setup_{version}.exe")
+    utilities.download_file(f"{constants.RESHADE_EXE_URL}{version}.exe", setup_path, _CHUNK_DELAY)
+
+    # only the two dlls are needed from the setup exe
+    if os.path.isdir(staging_dir):
+        shutil.rmtree(staging_dir)
+    os.makedirs(staging_dir)
+    wanted = {constants.RESHADE32.lower(): constants.RESHADE32, constants.RESHADE64.lower(): constants.RESHADE64}
+    with zipfile.ZipFile(setup_path) as zipf:
+        for member in zipf.infolist():
+            file_name = wanted.pop(os.path.basename(member.filename).lower(), None)
+            if file_name is not None:
+                with zipf.open(member) as fsrc, open(os.path.join(staging_dir, file_name), "wb") as fdst:
+                    shutil.copyfileobj(fsrc, fdst)
+    if len(wanted) > 0:
+        raise FileNotFoundError(f"{', '.join(wanted.values())} not found in {setup_path}")
+
+    reshade_cache.store_version(version, staging_dir)
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.remove(setup_path)
+
+
+################################################################################
+def _prefetch_shaders():
+    utilities.download_file(constants.SHADERS_ZIP_URL, constants.STAGED_SHADERS_ZIP_PATH, _CHUNK_DELAY)
+
+
+################################################################################
+def _prefetch_assets():
+    # the icon is picked up on the next start, the preset and the stylesheet
+    # only when their files in the program folder are created again
+    for name, url in assets.get_remote_assets().items():
+        utilities.download_file(url, assets.get_cache_path(name), _CHUNK_DELAY)
+    assets.set_refreshed()
@@ -0,0 +1,64 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+
+from src.utils import constants, messages, utilities
+
+
+################################################################################
+def run(self, skip_checks=False):
+    # startup shared by the launcher and the program, files and database are only
+    # checked when the version, the schema or one of the files changed since the last run
+    utilities.check_dirs()
+    self.log = utilities.setup_logging(self)
+    sys.excepthook = utilities.log_uncaught_exceptions
+    self.database_settings = dict(DatabaseInUse='sqlite')
+
+    if skip_checks or get_fingerprint() == _read_fingerprint():
+        return False
+
+    self.progressBar.setValues(messages.checking_files, 15)
+    ok = utilities.check_files(self)
+
+    self.progressBar.setValues(messages.checking_db_connection, 30)
+    ok = utilities.check_db_connection(self) and ok
+    ok = utilities.set_default_database_configs(self) and ok
+    ok = utilities.check_database_updated_columns(self) and ok
+    # a failed check runs again on the next start
+    if ok:
+        _write_fingerprint(get_fingerprint())
+    return True
+
+
+################################################################################
+def get_fingerprint():
+    files = (constants.SQLITE3_FILENAME, constants.STYLE_QSS_FILENAME, constants.RESHADE_PRESET_FILENAME)
+    return dict(program_version=constants.VERSION,
+                schema_version=constants.DB_SCHEMA_VERSION,
+                files=dict((os.path.basename(x), os.path.isfile(x)) for x in files))
+
+
+################################################################################
+def _read_fingerprint():
+    try:
+        with open(constants.PREFLIGHT_FILENAME, encoding="utf-8", mode="r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+################################################################################
+def _write_fingerprint(fingerprint: dict):
+    tmp_path = f"{constants.PREFLIGHT_FILENAME}.tmp"
+    with open(tmp_path, encoding="utf-8", mode="w") as file:
+        json.dump(fingerprint, file)
+    os.replace(tmp_path, constants.PREFLIGHT_FILENAME)
@@ -0,0 +1,76 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import hashlib
+import os
+
+from src.utils import constants
+
+
+################################################################################
+def get_preset_path(preset_hash: str):
+    # presets are stored once per content, named by their sha256
+    return os.path.join(constants.PRESET_STORE_PATH, f"{preset_hash}.ini")
+
+
+################################################################################
+def get_preset_hash(path):
+    # the hash of a store file, None for any other path
+    if path is None:
+        return None
+    dir_name, file_name = os.path.split(path)
+    preset_hash, extension = os.path.splitext(file_name)
+    if os.path.normcase(dir_name) != os.path.normcase(constants.PRESET_STORE_PATH) \
+            or extension.lower() != ".ini" or not _is_hash(preset_hash):
+        return None
+    return preset_hash.lower()
+
+
+################################################################################
+def add_preset_file(src_path: str):
+    with open(src_path, "rb") as file:
+        content = file.read()
+    return add_preset_content(content)
+
+
+################################################################################
+def add_preset_content(content: bytes):
+    preset_hash = hashlib.sha256(content).hexdigest()
+    dst_path = get_preset_path(preset_hash)
+    if os.path.isfile(dst_path):
+        return preset_hash
+
+    if not os.path.isdir(constants.PRESET_STORE_PATH):
+        os.makedirs(constants.PRESET_STORE_PATH)
+    tmp_path = f"{dst_path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, dst_path)
+    return preset_hash
+
+
+################################################################################
+def remove_unused(used_hashes: set):
+    # store files nothing points to anymore, files not named by a hash are never touched
+    removed = []
+    if not os.path.isdir(constants.PRESET_STORE_PATH):
+        return removed
+    for file_name in os.listdir(constants.PRESET_STORE_PATH):
+        preset_hash, extension = os.path.splitext(file_name)
+        if extension == ".ini" and _is_hash(preset_hash) and preset_hash.lower() not in used_hashes:
+            os.remove(os.path.join(constants.PRESET_STORE_PATH, file_name))
+            removed.append(preset_hash)
+    return removed
+
+
+################################################################################
+def _is_hash(name: str):
+    return len(name) == 64 and all(x in "0123456789abcdefABCDEF" for x in name)
@@ -0,0 +1,144 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import shutil
+import time
+
+from src.utils import constants, dll_verify, file_copy
+
+_MANIFEST = "manifest.json"
+_log = logging.getLogger(__name__)
+
+
+################################################################################
+def get_version_path(version: str):
+    return os.path.join(constants.RESHADE_CACHE_PATH, version)
+
+
+################################################################################
+def has_version(version: str):
+    return version is not None and _read_manifest(version) is not None
+
+
+################################################################################
+def list_versions():
+    # most recently used first
+    versions = []
+    if not os.path.isdir(constants.RESHADE_CACHE_PATH):
+        return versions
+    for version in os.listdir(constants.RESHADE_CACHE_PATH):
+        manifest = _read_manifest(version)
+        if manifest is not None:
+            versions.append(manifest)
+    versions.sort(key=lambda x: x["last_used"], reverse=True)
+    return versions
+
+
+################################################################################
+def store_version(version: str, src_dir=None):
+    # keeps the dlls that were just extracted to the program folder, or to src_dir
+    version_path = get_version_path(version)
+    tmp_path = f"{version_path}.tmp"
+    if os.path.isdir(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+
+    files = {}
+    for src_path in (constants.RESHADE32_PATH, constants.RESHADE64_PATH):
+        file_name = os.path.basename(src_path)
+        if src_dir is not None:
+            src_path = os.path.join(src_dir, file_name)
+        dst_path = os.path.join(tmp_path, file_name)
+        size = file_copy.copy_file(src_path, dst_path, fsync=True)
+        files[file_name] = dict(sha256=dll_verify.hash_file(dst_path), size=size)
+
+    manifest = dict(version=version, files=files, last_used=time.time())
+    with open(os.path.join(tmp_path, _MANIFEST), encoding="utf-8", mode="w") as file:
+        json.dump(manifest, file)
+
+    if os.path.isdir(version_path):
+        shutil.rmtree(version_path)
+    os.replace(tmp_path, version_path)
+    return manifest
+
+
+################################################################################
+def activate_version(version: str):
+    # copies a cached build over the program dlls, no network needed
+    manifest = _read_manifest(version)
+    if manifest is None:
+        raise FileNotFoundError(f"Reshade {version} is not cached")
+
+    version_path = get_version_path(version)
+    for dst_path in (constants.RESHADE32_PATH, constants.RESHADE64_PATH):
+        file_name = os.path.basename(dst_path)
+        src_path = os.path.join(version_path, file_name)
+        if dll_verify.hash_file(src_path) != manifest["files"][file_name]["sha256"]:
+            raise ValueError(f"cached {file_name} of Reshade {version} is corrupted")
+        tmp_path = f"{dst_path}.tmp"
+        file_copy.copy_file(src_path, tmp_path, fsync=True)
+        os.replace(tmp_path, dst_path)
+
+    touch_version(version)
+    return manifest
+
+
+################################################################################
+def touch_version(version: str):
+    manifest = _read_manifest(version)
+    if manifest is not None:
+        manifest["last_used"] = time.time()
+        _write_manifest(version, manifest)
+
+
+################################################################################
+def evict(keep_version=None, max_versions=None, max_bytes=None):
+    # least recently used builds go first, the active one is always kept
+    if max_versions is None:
+        max_versions = constants.RESHADE_CACHE_MAX_VERSIONS
+    if max_bytes is None:
+        max_bytes = constants.RESHADE_CACHE_MAX_BYTES
+
+    evicted = []
+    count = 0
+    total = 0
+    for manifest in list_versions():
+        size = sum(x["size"] for x in manifest["files"].values())
+        if manifest["version"] != keep_version and (count >= max_versions or total + size > max_bytes):
+            try:
+                shutil.rmtree(get_version_path(manifest["version"]))
+                evicted.append(manifest["version"])
+            except OSError as e:
+                _log.error(f"reshade_cache evict: {manifest['version']} {e}")
+            continue
+        count += 1
+        total += size
+    return evicted
+
+
+################################################################################
+def _read_manifest(version: str):
+    try:
+        with open(os.path.join(get_version_path(version), _MANIFEST), encoding="utf-8", mode="r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+################################################################################
+def _write_manifest(version: str, manifest: dict):
+    manifest_path = os.path.join(get_version_path(version), _MANIFEST)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, encoding="utf-8", mode="w") as file:
+        json.dump(manifest, file)
+    os.replace(tmp_path, manifest_path)
+
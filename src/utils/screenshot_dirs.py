@@ -0,0 +1,96 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import logging
+import os
+
+from src.utils import constants
+
+_log = logging.getLogger(__name__)
+_known_dirs = set()  # screenshot dirs known to exist in this session
+
+
+################################################################################
+def get_game_screenshots_path(game_name: str):
+    return f"{constants.RESHADE_SCREENSHOT_PATH}\\{game_name}"
+
+
+################################################################################
+def get_missing_dirs(game_names: list):
+    # root and every game dir in one pass, the root is listed once instead of a stat per game
+    wanted = [constants.RESHADE_SCREENSHOT_PATH] + [get_game_screenshots_path(x) for x in game_names]
+    wanted = [x for x in dict.fromkeys(wanted) if _key(x) not in _known_dirs]
+    if len(wanted) == 0:
+        return []
+
+    existing = set()
+    listed = False
+    try:
+        with os.scandir(constants.RESHADE_SCREENSHOT_PATH) as it:
+            existing = set(_key(x.path) for x in it if x.is_dir())
+        existing.add(_key(constants.RESHADE_SCREENSHOT_PATH))
+        listed = True
+    except OSError:
+        pass
+
+    missing = []
+    root_key = _key(constants.RESHADE_SCREENSHOT_PATH)
+    for path in wanted:
+        if _key(path) in existing:
+            _known_dirs.add(_key(path))
+        elif listed and os.path.dirname(_key(path)) == root_key:
+            missing.append(path)
+        elif os.path.isdir(path):
+            # game names with path separators are not direct children of the root
+            _known_dirs.add(_key(path))
+        else:
+            missing.append(path)
+    return missing
+
+
+################################################################################
+def create_dirs(paths: list):
+    errors = []
+    for path in paths:
+        try:
+            os.makedirs(path, exist_ok=True)
+            _known_dirs.add(_key(path))
+        except OSError as e:
+            _log.error(f"mkdir: {path} {e}")
+            errors.append(path)
+    return errors
+
+
+################################################################################
+def provision(game_names: list):
+    return create_dirs(get_missing_dirs(game_names))
+
+
+################################################################################
+def rename_dir(old_path: str, new_path: str):
+    # renames through the index so the new name does not need another scan
+    if _key(old_path) in _known_dirs or os.path.isdir(old_path):
+        os.rename(old_path, new_path)
+        _known_dirs.discard(_key(old_path))
+        _known_dirs.add(_key(new_path))
+        return True
+    return False
+
+
+################################################################################
+def forget(path=None):
+    if path is None:
+        _known_dirs.clear()
+    else:
+        _known_dirs.discard(_key(path))
+
+
+################################################################################
+def _key(path: str):
+    return os.path.normcase(path)
@@ -0,0 +1,102 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import logging
+import os
+import re
+
+import requests
+
+from src.utils import constants, dll_verify, utilities
+
+try:
+    import bsdiff4
+except ImportError:
+    bsdiff4 = None
+
+UPDATE_DELTA = "delta"
+UPDATE_FULL = "full"
+_HASH_SUFFIX = ".sha256"
+_TIMEOUT = 30
+_log = logging.getLogger(__name__)
+
+
+class UpdateError(Exception):
+    pass
+
+
+################################################################################
+def get_release_url(version):
+    return f"{constants.GITHUB_EXE_PROGRAM_URL}{version}/"
+
+
+################################################################################
+def get_delta_name(old_version):
+    # published next to the exe of the new release, one per older version
+    return f"{constants.SHORT_PROGRAM_NAME}_v{old_version}.bsdiff"
+
+
+################################################################################
+def get_published_hash(release_url: str):
+    url = f"{release_url}{constants.EXE_PROGRAM_NAME}{_HASH_SUFFIX}"
+    response = requests.get(url, timeout=_TIMEOUT)
+    if response.status_code != 200:
+        raise UpdateError(f"hash not published: {url} code:{response.status_code}")
+    # sha256sum format, the hash comes first
+    match = re.match(r"\s*([0-9a-fA-F]{64})\b", response.text)
+    if match is None:
+        raise UpdateError(f"invalid hash file: {url}")
+    return match.group(1).lower()
+
+
+################################################################################
+def update_program(old_version, new_version, program_path: str, release_url=None):
+    # the new exe is built next to the old one and only swapped in after its hash matched,
+    # a failed update leaves the installed program untouched
+    if release_url is None:
+        release_url = get_release_url(new_version)
+    expected_hash = get_published_hash(release_url)
+    tmp_path = f"{program_path}.new"
+    try:
+        if _apply_delta(old_version, program_path, tmp_path, release_url, expected_hash):
+            method = UPDATE_DELTA
+        else:
+            sha256 = utilities.download_file(f"{release_url}{constants.EXE_PROGRAM_NAME}", tmp_path, timeout=_TIMEOUT)
+            if sha256 != expected_hash:
+                raise UpdateError(f"hash mismatch for {constants.EXE_PROGRAM_NAME} v{new_version}")
+            method = UPDATE_FULL
+        os.replace(tmp_path, program_path)
+    finally:
+        if os.path.isfile(tmp_path):
+            os.remove(tmp_path)
+    _log.info(f"program updated to v{new_version} ({method})")
+    return method
+
+
+################################################################################
+def _apply_delta(old_version, program_path: str, dst_path: str, release_url: str, expected_hash: str):
+    # any problem with the delta falls back to the full download
+    if bsdiff4 is None or old_version is None or not os.path.isfile(program_path):
+        return False
+
+    delta_path = f"{program_path}.bsdiff"
+    try:
+        utilities.download_file(f"{release_url}{get_delta_name(old_version)}", delta_path, timeout=_TIMEOUT)
+        bsdiff4.file_patch(program_path, dst_path, delta_path)
+        with open(dst_path, "rb+") as file:
+            os.fsync(file.fileno())
+        if dll_verify.hash_file(dst_path) != expected_hash:
+            raise UpdateError("patched file hash mismatch")
+        return True
+    except (OSError, ValueError, UpdateError, requests.exceptions.RequestException) as e:
+        _log.info(f"self_update: delta from v{old_version} not used: {e}")
+        return False
+    finally:
+        if os.path.isfile(delta_path):
+            os.remove(delta_path)
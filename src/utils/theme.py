@@ -0,0 +1,60 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import logging
+import os
+import threading
+
+from PyQt5 import QtWidgets
+
+from src.utils import constants
+
+_log = logging.getLogger(__name__)
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+################################################################################
+def get_style_sheet(qss_path=None):
+    # read once, read again only when the file on disk changed
+    if qss_path is None:
+        qss_path = constants.STYLE_QSS_FILENAME
+    try:
+        st = os.stat(qss_path)
+    except OSError as e:
+        _log.error(f"theme: {e}")
+        return ""
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    with _cache_lock:
+        cached = _cache.get(qss_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        with open(qss_path, encoding="utf-8", mode="r") as file:
+            style_sheet = file.read()
+    except (OSError, ValueError) as e:
+        _log.error(f"theme: {e}")
+        return ""
+
+    with _cache_lock:
+        _cache[qss_path] = (stamp, style_sheet)
+    return style_sheet
+
+
+################################################################################
+def apply_theme(dark: bool):
+    # application wide, every window and dialog picks it up
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        return
+    style_sheet = get_style_sheet() if dark else ""
+    if app.styleSheet() != style_sheet:
+        app.setStyleSheet(style_sheet)
@@ -7,24 +7,31 @@
 # |*****************************************************
 # # -*- coding: utf-8 -*-
 
-import configparser
+import atexit
+import copy
 import datetime
+import hashlib
 import json
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import time
 import zipfile
 
 import requests
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtWidgets import QFileDialog
 
-from src.utils import constants, messages
+from src.utils import constants, ini_cache, messages
 from src.utils.create_files import CreateFiles
 
 _date_formatter = "%b/%d/%Y"
 _time_formatter = "%H:%M:%S"
+_log_listener = None
+_stdout_hdlr = None
+_exc_formatter = logging.Formatter()
 
 
 class Object:
@@ -77,17 +84,7 @@ def get_current_path():
 
 ################################################################################
 def get_ini_settings(file_name: str, section: str, config_name: str):
-    parser = configparser.ConfigParser(delimiters='=', allow_no_value=True)
-    parser.optionxform = str  # this wont change all values to lowercase
-    parser._interpolation = configparser.ExtendedInterpolation()
-    parser.read(file_name)
-    try:
-        value = parser.get(section, config_name).replace("\"", "")
-    except Exception:
-        value = None
-    if value is not None and len(value) == 0:
-        value = None
-    return value
+    return ini_cache.get_ini_settings(file_name, section, config_name)
 
 
 ################################################################################
@@ -98,13 +95,54 @@ def unzip_file(file_name: str, out_path: str):
     zipf.close()
 
 
+################################################################################
+class JsonLogFormatter(logging.Formatter):
+    # one json object per line, timings in milliseconds
+    def format(self, record):
+        entry = dict(time=self.formatTime(record, f"{_date_formatter} {_time_formatter}"),
+                     created=record.created,
+                     relative_ms=round(record.relativeCreated, 3),
+                     write_delay_ms=round((time.time() - record.created) * 1000, 3),
+                     level=record.levelname,
+                     logger=record.name,
+                     file=record.filename,
+                     func=record.funcName,
+                     line=record.lineno,
+                     thread=record.threadName,
+                     message=record.getMessage())
+        duration_ms = getattr(record, "duration_ms", None)
+        if duration_ms is not None:
+            entry["duration_ms"] = duration_ms
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+################################################################################
+class LogQueueHandler(logging.handlers.QueueHandler):
+    # the stock prepare folds the traceback into the message, here it is kept apart
+    # as exc_text so every handler of the listener still formats it its own way
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 ################################################################################
 def log_uncaught_exceptions(exc_type, exc_value, exc_traceback):
+    global _stdout_hdlr
     logger = logging.getLogger(__name__)
-    stderr_hdlr = logging.StreamHandler(stream=sys.stdout)
-    stderr_hdlr.setLevel(constants.LOG_LEVEL)
-    stderr_hdlr.setFormatter(constants.LOG_FORMATTER)
-    logger.addHandler(stderr_hdlr)
+    if _stdout_hdlr is None:
+        _stdout_hdlr = logging.StreamHandler(stream=sys.stdout)
+        _stdout_hdlr.setLevel(constants.LOG_LEVEL)
+        _stdout_hdlr.setFormatter(constants.LOG_FORMATTER)
+        logger.addHandler(_stdout_hdlr)
     if issubclass(exc_type, KeyboardInterrupt) or issubclass(exc_type, EOFError):
         sys.__excepthook__(exc_type, exc_value, exc_traceback)
         return
@@ -113,26 +151,53 @@ def log_uncaught_exceptions(exc_type, exc_value, exc_traceback):
 
 ################################################################################
 def setup_logging(self):
+    # callers only put records on a queue, the files are written by the listener thread.
+    # safe to call more than once, the handlers are only added the first time
+    global _log_listener
     logger = logging.getLogger()
     logger.setLevel(constants.LOG_LEVEL)
-    file_hdlr = logging.handlers.RotatingFileHandler(
-        filename=constants.ERROR_LOGS_FILENAME,
-        maxBytes=10 * 1024 * 1024,
-        encoding="utf-8",
-        backupCount=5,
-        mode='a')
-    file_hdlr.setFormatter(constants.LOG_FORMATTER)
-    logger.addHandler(file_hdlr)
+    if _log_listener is None:
+        file_hdlr = logging.handlers.RotatingFileHandler(
+            filename=constants.ERROR_LOGS_FILENAME,
+            maxBytes=10 * 1024 * 1024,
+            encoding="utf-8",
+            backupCount=5,
+            mode='a')
+        file_hdlr.setFormatter(constants.LOG_FORMATTER)
+        handlers = [file_hdlr]
+
+        if constants.LOG_JSON_ARG in sys.argv:
+            json_hdlr = logging.handlers.RotatingFileHandler(
+                filename=constants.JSON_LOGS_FILENAME,
+                maxBytes=10 * 1024 * 1024,
+                encoding="utf-8",
+                backupCount=5,
+                mode='a')
+            json_hdlr.setFormatter(JsonLogFormatter())
+            handlers.append(json_hdlr)
+
+        log_queue = queue.Queue(-1)
+        _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _log_listener.start()
+        logger.addHandler(LogQueueHandler(log_queue))
+        # whatever is still queued gets written before the process ends
+        atexit.register(_stop_logging)
     self.log = logging.getLogger(__name__)
     return self.log
 
 
 ################################################################################
-def open_get_filename():
+def _stop_logging():
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+################################################################################
+def open_get_filename(_filter="exe(*.exe)", _path="C:"):
     _qfd = QFileDialog()
     _title = 'Open file'
-    _path = "C:"
-    _filter = "exe(*.exe)"
     _filename = QFileDialog.getOpenFileName(parent=_qfd, caption=_title, directory=_path, filter=_filter)
     if _filename[0] == '':
         return None
@@ -140,6 +205,18 @@ def open_get_filename():
         return str(_filename[0])
 
 
+################################################################################
+def open_get_directory():
+    _qfd = QFileDialog()
+    _title = 'Open library folder'
+    _path = "C:"
+    _dirname = QFileDialog.getExistingDirectory(parent=_qfd, caption=_title, directory=_path)
+    if _dirname == '':
+        return None
+    else:
+        return str(_dirname).replace("/", "\\")
+
+
 ################################################################################
 # def get_download_path():
 #     if constants.IS_WINDOWS:
@@ -173,7 +250,7 @@ def get_pictures_path():
 
 
 ################################################################################
-def show_message_window(window_type: str, window_title: str, msg: str):
+def show_message_window(window_type: str, window_title: str, msg: str, details=None):
     if window_type.lower() == "error":
         icon = QtWidgets.QMessageBox.Critical
     elif window_type.lower() == "warning":
@@ -187,6 +264,9 @@ def show_message_window(window_type: str, window_title: str, msg: str):
     msgBox.setIcon(icon)
     msgBox.setWindowTitle(window_title)
     msgBox.setInformativeText(msg)
+    if details is not None:
+        # long text goes behind the details button, it scrolls instead of growing the window
+        msgBox.setDetailedText(details)
 
     if window_type.lower() == "question":
         msgBox.setStandardButtons(QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
@@ -232,6 +312,33 @@ def check_new_program_version(self):
         return obj_return
 
 
+################################################################################
+def download_file(url: str, dst_path: str, chunk_delay=0.0, timeout=30):
+    # streamed to a temp file, the final name only exists once the download is complete
+    # returns the sha256 of what was written
+    dst_dir = os.path.dirname(dst_path)
+    if dst_dir and not os.path.isdir(dst_dir):
+        os.makedirs(dst_dir)
+    sha256 = hashlib.sha256()
+    tmp_path = f"{dst_path}.part"
+    try:
+        with requests.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(tmp_path, "wb") as file:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    file.write(chunk)
+                    sha256.update(chunk)
+                    if chunk_delay:
+                        time.sleep(chunk_delay)
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(tmp_path, dst_path)
+    finally:
+        if os.path.isfile(tmp_path):
+            os.remove(tmp_path)
+    return sha256.hexdigest()
+
+
 ################################################################################
 def check_dirs():
     try:
@@ -245,18 +352,22 @@ def check_dirs():
 ################################################################################
 def check_files(self):
     create_files = CreateFiles(self)
+    ok = True
 
     try:
         if not os.path.exists(constants.STYLE_QSS_FILENAME):
             create_files.create_style_file()
     except Exception as e:
+        ok = False
         self.log.error(f"{e}")
 
     try:
         if not os.path.exists(constants.RESHADE_PRESET_FILENAME):
             create_files.create_reshade_preset_ini_file()
     except Exception as e:
+        ok = False
         self.log.error(f"{e}")
+    return ok
 
 
 ################################################################################
@@ -265,9 +376,11 @@ def set_default_database_configs(self):
     from src.sql.triggers_sql import TriggersSql
     from src.sql.configs_sql import ConfigsSql
 
+    ok = True
     initialTablesSql = InitialTablesSql(self)
     it = initialTablesSql.create_initial_tables()
     if it is not None:
+        ok = False
         err_msg = messages.error_create_sql_config_msg
         self.log.error(err_msg)
         print(err_msg)
@@ -275,16 +388,20 @@ def set_default_database_configs(self):
 
     configSql = ConfigsSql(self)
     rsConfig = configSql.get_configs()
-    if rsConfig is not None and len(rsConfig) == 0:
-        configSql.set_default_configs()
+    if rsConfig is None:
+        ok = False
+    elif len(rsConfig) == 0 and configSql.set_default_configs() is not None:
+        ok = False
 
     triggersSql = TriggersSql(self)
     tr = triggersSql.create_triggers()
     if tr is not None:
+        ok = False
         err_msg = messages.error_create_sql_config_msg
         self.log.error(err_msg)
         print(err_msg)
         # sys.exit()
+    return ok
 
 
 ################################################################################
@@ -299,6 +416,7 @@ def check_db_connection(self):
         msg_exit = messages.exit_program
         show_message_window("error", "ERROR", f"{error_db_conn}\n\n{msg_exit}")
         sys.exit(0)
+    return True
 
 
 ################################################################################
@@ -309,21 +427,24 @@ def check_database_updated_columns(self):
     updateTablesSql = UpdateTablesSql(self)
     configSql = ConfigsSql(self)
     rsConfig = configSql.get_configs()
+    if rsConfig is None:
+        return False
     if len(rsConfig) > 0:
         for eac in constants.NEW_CONFIG_TABLE_COLUMNS:
             if eac != "id".lower() and not eac in rsConfig[0].keys():
-                    ut = updateTablesSql.update_config_table()
+                # the table is rebuilt with every column at once
+                return updateTablesSql.update_config_table()
+    return True
 
 
 ################################################################################
 def set_paypal_button(self):
-    url = constants.PAYPAL_REMOTE_FILENAME
-    data = requests.get(url, stream=True)
-    if data.status_code == 200:
-        pixmap = QtGui.QPixmap()
-        pixmap.loadFromData(data.content)
-        icon = QtGui.QIcon(pixmap)
-        self.qtObj.paypal_button.setIcon(icon)
+    # shipped with the program, no download before the window shows up
+    from src.utils import assets
+
+    icon_path = assets.get_asset_path(assets.PAYPAL_PNG)
+    if os.path.isfile(icon_path):
+        self.qtObj.paypal_button.setIcon(QtGui.QIcon(icon_path))
     else:
         _translate = QtCore.QCoreApplication.translate
         self.qtObj.paypal_button.setText(_translate("Main", "PayPal"))
@@ -0,0 +1,4 @@
+import importlib
+
+# constants and utilities import each other, constants is loaded first like the program does
+importlib.import_module("src.utils.constants")
@@ -0,0 +1,125 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.utils import constants, utilities
+from src import apply_plan
+from src.sql.configs_sql import ConfigsSql
+from src.sql.games_sql import GamesSql
+from src.sql.initial_tables_sql import InitialTablesSql
+from src.sql.triggers_sql import TriggersSql
+
+
+class DatabaseTestCase(unittest.TestCase):
+    # every test gets its own temp folder and a new sqlite database inside it,
+    # self.main carries what the sql classes read from the main window
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.patch_constant("SQLITE3_FILENAME", os.path.join(self.tmp_dir, "database.db"))
+
+        self.main = utilities.Object()
+        self.main.log = logging.getLogger("tests")
+        self.main.database_settings = dict(DatabaseInUse="sqlite")
+        InitialTablesSql(self.main).create_initial_tables()
+        ConfigsSql(self.main).set_default_configs()
+        TriggersSql(self.main).create_triggers()
+
+    def patch_constant(self, name: str, value):
+        patcher = mock.patch.object(constants, name, value)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return value
+
+
+class _GameWatcher:
+    def __init__(self):
+        self.paused = 0
+
+    def pause(self):
+        self.paused += 1
+
+    def resume(self, game_dirs=None):
+        self.paused -= 1
+
+
+################################################################################
+def _list_game_dir(game_dir: str):
+    # the program joins game paths with "\\", the managed files are looked up the same way
+    # so the tests also run outside windows
+    names = (constants.D3D9, constants.DXGI, constants.RESHADE_INI, constants.RESHADE_PRESET_INI)
+    return game_dir, set(x.lower() for x in names if os.path.lexists(f"{game_dir}\\{x}"))
+
+
+class ApplyTestCase(DatabaseTestCase):
+    # program files (reshade dlls, default preset, shaders) live in the temp folder,
+    # games are added with add_game and applied with ApplyPlan like the program does
+    def setUp(self):
+        super().setUp()
+        program_path = os.path.join(self.tmp_dir, "program")
+        os.makedirs(program_path)
+        for name, data in (("RESHADE32_PATH", b"reshade32"), ("RESHADE64_PATH", b"reshade64 dll"),
+                           ("RESHADE_PRESET_FILENAME", b"[default]\n")):
+            path = self.patch_constant(name, os.path.join(program_path, os.path.basename(getattr(constants, name))))
+            self.write_file(path, data)
+        self.patch_constant("SHADERS_SRC_PATH", os.path.join(program_path, constants.RESHADE_SHADERS))
+        self.patch_constant("APPLY_JOURNAL_PATH", os.path.join(program_path, "journal"))
+        presets_path = self.patch_constant("PRESETS_PATH", os.path.join(program_path, "presets"))
+        self.patch_constant("SHARED_PRESET_FILENAME", os.path.join(presets_path, constants.RESHADE_PRESET_INI))
+        self.patch_constant("PRESET_STORE_PATH", os.path.join(presets_path, "store"))
+        patcher = mock.patch.object(apply_plan, "_list_game_dir", _list_game_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.main.settings = utilities.Object()
+        self.main.settings.create_screenshots_folder = False
+        self.main.settings.use_hardlinks = False
+        self.main.settings.shared_preset = False
+        self.main.reset_reshade_files = False
+        self.main.reshade_version = "4.9.1"
+        self.main.game_watcher = _GameWatcher()
+
+    def add_game(self, game_name: str, architecture="64bits", api="DX11"):
+        game_dir = os.path.join(self.tmp_dir, "games", game_name)
+        os.makedirs(game_dir)
+        games_obj = utilities.Object()
+        games_obj.game_name = game_name
+        games_obj.architecture = architecture
+        games_obj.api = api
+        games_obj.path = f"{game_dir}\\{game_name}.exe"
+        games_sql = GamesSql(self.main)
+        games_sql.insert_game(games_obj)
+        games_obj.id = games_sql.get_game_by_path(games_obj.path)[0]["id"]
+        games_obj.game_dir = game_dir
+        return games_obj
+
+    def game_file(self, games_obj, file_name: str):
+        return f"{games_obj.game_dir}\\{file_name}"
+
+    def apply(self):
+        plan = apply_plan.ApplyPlan(self.main).build(GamesSql(self.main).get_games())
+        self.assertEqual(plan.execute(), [])
+        return plan
+
+    def get_actions(self, plan, games_obj):
+        return sorted(x.action for x in plan.get_game_operations(games_obj.id))
+
+    def write_file(self, path: str, data: bytes):
+        with open(path, "wb") as file:
+            file.write(data)
+
+    def read_file(self, path: str):
+        with open(path, "rb") as file:
+            return file.read()
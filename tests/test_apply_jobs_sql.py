@@ -0,0 +1,58 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import unittest
+
+from tests.fixtures import DatabaseTestCase
+from src.databases.databases import Databases
+from src.sql.apply_jobs_sql import ApplyJobsSql
+from src.sql.games_sql import GamesSql
+from src.utils import utilities
+
+
+class TestApplyJobsSql(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.patch_constant("APPLY_JOBS_KEPT", 3)
+        for game_name in ("Game A", "Game B"):
+            games_obj = utilities.Object()
+            games_obj.game_name = game_name
+            games_obj.architecture = "64bits"
+            games_obj.api = "DX11"
+            games_obj.path = f"C:\\Games\\{game_name}\\game.exe"
+            GamesSql(self.main).insert_game(games_obj)
+
+    def _create_job(self, status: str):
+        apply_jobs_sql = ApplyJobsSql(self.main)
+        job_obj = utilities.Object()
+        job_obj.reset_reshade_files = "N"
+        job_obj.job_id = apply_jobs_sql.create_job(job_obj)
+        job_obj.status = status
+        apply_jobs_sql.update_job_status(job_obj)
+        return job_obj.job_id
+
+    def _job_ids(self, table: str, column: str):
+        rs = Databases(self.main).select(f"SELECT DISTINCT {column} from {table} ORDER BY {column};")
+        return [rs[i][column] for i in range(len(rs))]
+
+    def test_old_finished_jobs_are_deleted(self):
+        failed_id = self._create_job("failed")
+        done_ids = [self._create_job(x) for x in ("done", "cancelled", "done", "done", "cancelled")]
+        running_id = self._create_job("running")
+
+        # the failed job is kept for a resume, finished ones only while they were among
+        # the last three when the new job was created
+        kept_ids = [failed_id] + done_ids[-3:] + [running_id]
+        self.assertEqual(self._job_ids("apply_jobs", "id"), kept_ids)
+        self.assertEqual(self._job_ids("apply_job_games", "job_id"), kept_ids)
+        self.assertEqual(len(ApplyJobsSql(self.main).get_pending_games(running_id)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.utils import apply_journal, constants
+
+
+class TestApplyJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.game_dir = os.path.join(self.tmp_dir, "Game")
+        os.makedirs(self.game_dir)
+        patcher = mock.patch.object(constants, "APPLY_JOURNAL_PATH", os.path.join(self.tmp_dir, "journal"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _path(self, file_name: str):
+        return os.path.join(self.game_dir, file_name)
+
+    def _write(self, path: str, data: bytes):
+        with open(path, "wb") as file:
+            file.write(data)
+
+    def _read(self, path: str):
+        with open(path, "rb") as file:
+            return file.read()
+
+    def _crashed_transaction(self):
+        # dxgi.dll replaced, d3d9.dll removed, the preset is new, the ini was staged but not renamed yet
+        self._write(self._path(constants.DXGI), b"old dll")
+        self._write(self._path(constants.D3D9), b"other dll")
+        self._write(self._path(constants.RESHADE_INI), b"old ini")
+
+        transaction = apply_journal.GameTransaction(7, "Game").begin()
+        self._write(transaction.stage(self._path(constants.DXGI)), b"new dll")
+        transaction.replace(self._path(constants.DXGI))
+        transaction.remove(self._path(constants.D3D9))
+        self._write(transaction.stage(self._path(constants.RESHADE_PRESET_INI)), b"new preset")
+        transaction.replace(self._path(constants.RESHADE_PRESET_INI))
+        self._write(transaction.stage(self._path(constants.RESHADE_INI)), b"new ini")
+        return transaction
+
+    def _assert_original_files(self):
+        self.assertEqual(sorted(os.listdir(self.game_dir)), sorted([constants.DXGI, constants.D3D9, constants.RESHADE_INI]))
+        self.assertEqual(self._read(self._path(constants.DXGI)), b"old dll")
+        self.assertEqual(self._read(self._path(constants.D3D9)), b"other dll")
+        self.assertEqual(self._read(self._path(constants.RESHADE_INI)), b"old ini")
+
+    def test_recover_pending_journal(self):
+        self._crashed_transaction()
+        self.assertEqual(self._read(self._path(constants.DXGI)), b"new dll")
+
+        self.assertEqual(apply_journal.recover_journals(), ["Game"])
+        self._assert_original_files()
+        self.assertEqual(os.listdir(constants.APPLY_JOURNAL_PATH), [])
+
+    def test_rollback(self):
+        self._crashed_transaction().rollback()
+        self._assert_original_files()
+        self.assertEqual(apply_journal.recover_journals(), [])
+
+    def test_recover_committed_journal(self):
+        transaction = self._crashed_transaction()
+        transaction.replace(self._path(constants.RESHADE_INI))
+        # crashed after the journal was marked committed, before the backups were removed
+        with mock.patch.object(apply_journal, "_cleanup_committed"), \
+                mock.patch.object(apply_journal, "_remove_journal"):
+            transaction.commit()
+
+        self.assertEqual(apply_journal.recover_journals(), [])
+        self.assertEqual(sorted(os.listdir(self.game_dir)),
+                         sorted([constants.DXGI, constants.RESHADE_INI, constants.RESHADE_PRESET_INI]))
+        self.assertEqual(self._read(self._path(constants.DXGI)), b"new dll")
+        self.assertEqual(self._read(self._path(constants.RESHADE_INI)), b"new ini")
+        self.assertEqual(os.listdir(constants.APPLY_JOURNAL_PATH), [])
+
+    def test_invalid_journal_is_skipped(self):
+        os.makedirs(constants.APPLY_JOURNAL_PATH)
+        self._write(os.path.join(constants.APPLY_JOURNAL_PATH, "1.json"), b"{not json")
+        with self.assertLogs(apply_journal.__name__, level="ERROR"):
+            self.assertEqual(apply_journal.recover_journals(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
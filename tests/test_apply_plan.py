@@ -0,0 +1,73 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import json
+import unittest
+
+from tests.fixtures import ApplyTestCase
+from src import apply_plan
+from src.sql.games_apply_state_sql import GamesApplyStateSql
+from src.sql.presets_sql import PresetsSql
+from src.utils import constants, preset_store, utilities
+
+
+class TestApplyFingerprints(ApplyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.game_a = self.add_game("Game A")
+        self.game_b = self.add_game("Game B", "32bits", "DX9")
+        plan = self.apply()
+        for games_obj in (self.game_a, self.game_b):
+            self.assertEqual(self.get_actions(plan, games_obj),
+                             sorted([apply_plan.COPY_DLL, apply_plan.WRITE_INI, apply_plan.COPY_PRESET]))
+
+    def test_unchanged_games_are_skipped(self):
+        plan = self.apply()
+        self.assertEqual(plan.games, [])
+        self.assertEqual(sorted(x.id for x in plan.skipped_games), sorted([self.game_a.id, self.game_b.id]))
+        fingerprints = GamesApplyStateSql(self.main).get_fingerprints()
+        self.assertEqual(sorted(json.loads(fingerprints[self.game_a.id])), ["dll", "ini", "preset"])
+
+    def test_only_the_preset_changed(self):
+        preset_obj = utilities.Object()
+        preset_obj.name = "Sharp"
+        preset_obj.hash = preset_store.add_preset_content(b"[sharp]\n")
+        presets_sql = PresetsSql(self.main)
+        presets_sql.update_preset(preset_obj)
+        game_preset_obj = utilities.Object()
+        game_preset_obj.game_id = self.game_a.id
+        game_preset_obj.name = preset_obj.name
+        presets_sql.update_game_preset(game_preset_obj)
+
+        plan = self.apply()
+        self.assertEqual([x.id for x in plan.games], [self.game_a.id])
+        self.assertEqual(self.get_actions(plan, self.game_a), [apply_plan.COPY_PRESET])
+        self.assertEqual(self.read_file(self.game_file(self.game_a, constants.RESHADE_PRESET_INI)), b"[sharp]\n")
+        self.assertEqual(self.apply().games, [])
+
+    def test_only_the_dll_source_changed(self):
+        self.write_file(constants.RESHADE64_PATH, b"reshade64 dll, a newer build")
+
+        plan = self.apply()
+        self.assertEqual([x.id for x in plan.games], [self.game_a.id])
+        self.assertEqual(self.get_actions(plan, self.game_a), [apply_plan.COPY_DLL])
+        self.assertEqual(self.read_file(self.game_file(self.game_a, constants.DXGI)), b"reshade64 dll, a newer build")
+        self.assertEqual(self.apply().games, [])
+
+    def test_replaced_dll_is_deployed_again(self):
+        self.write_file(self.game_file(self.game_b, constants.D3D9), b"replaced by a game update")
+
+        plan = self.apply()
+        self.assertEqual([x.id for x in plan.games], [self.game_b.id])
+        self.assertEqual(self.get_actions(plan, self.game_b), [apply_plan.COPY_DLL])
+        self.assertEqual(self.read_file(self.game_file(self.game_b, constants.D3D9)), b"reshade32")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.utils import constants, create_files
+
+_USER_INI = """; tweaked by hand
+[GENERAL]
+EffectSearchPaths=C:\\Old\\Shaders
+PerformanceMode=0
+PresetPath=.\\MyPreset.ini
+TextureSearchPaths=C:\\Old\\Textures
+
+[INPUT]
+KeyOverlay=36,0,0,0
+
+[SCREENSHOTS]
+; my own folder
+SavePath=D:\\Captures
+FileFormat=2
+"""
+
+
+class TestMergeIni(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ini_path = os.path.join(self.tmp_dir, constants.RESHADE_INI)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write_ini(self, text: str):
+        with open(self.ini_path, "wb") as file:
+            file.write(text.encode("utf-8"))
+
+    def _changed_lines(self, old_text: str, new_text: str):
+        return [(x, y) for x, y in zip(old_text.splitlines(), new_text.splitlines()) if x != y]
+
+    def test_only_managed_keys_change(self):
+        self._write_ini(_USER_INI)
+        content = create_files.get_reshade_ini_content(self.tmp_dir, "", merge=True)
+        text = content.decode("utf-8")
+        self.assertEqual(len(text.splitlines()), len(_USER_INI.splitlines()))
+        self.assertEqual(self._changed_lines(_USER_INI, text), [
+            ("EffectSearchPaths=C:\\Old\\Shaders", f"EffectSearchPaths={constants.SHADERS_SRC_PATH}\\Shaders"),
+            ("TextureSearchPaths=C:\\Old\\Textures", f"TextureSearchPaths={constants.SHADERS_SRC_PATH}\\Textures"),
+        ])
+
+    def test_known_screenshot_path_is_written(self):
+        self._write_ini(_USER_INI)
+        content = create_files.get_reshade_ini_content(self.tmp_dir, "E:\\Shots\\Game", merge=True)
+        text = content.decode("utf-8")
+        self.assertIn("SavePath=E:\\Shots\\Game", text.splitlines())
+        self.assertNotIn("D:\\Captures", text)
+        self.assertIn("PresetPath=.\\MyPreset.ini", text.splitlines())
+
+    def test_preset_path_is_written_when_given(self):
+        self._write_ini(_USER_INI)
+        content = create_files.get_reshade_ini_content(self.tmp_dir, "", merge=True,
+                                                       preset_path=constants.SHARED_PRESET_FILENAME)
+        self.assertIn(f"PresetPath={constants.SHARED_PRESET_FILENAME}", content.decode("utf-8").splitlines())
+
+    def test_up_to_date_file_returns_none(self):
+        self._write_ini(_USER_INI)
+        content = create_files.get_reshade_ini_content(self.tmp_dir, "", merge=True)
+        self._write_ini(content.decode("utf-8"))
+        self.assertIsNone(create_files.get_reshade_ini_content(self.tmp_dir, "", merge=True))
+
+    def test_missing_keys_are_appended(self):
+        text = create_files.merge_ini_text("[INPUT]\nKeyOverlay=36,0,0,0\n",
+                                           {("GENERAL", "PresetPath"): ".\\ReShadePreset.ini",
+                                            ("INPUT", "KeyReload"): "0,0,0,0"})
+        self.assertEqual(text, "[INPUT]\nKeyOverlay=36,0,0,0\nKeyReload=0,0,0,0\n\n"
+                               "[GENERAL]\nPresetPath=.\\ReShadePreset.ini\n")
+
+    def test_crlf_is_kept(self):
+        text = create_files.merge_ini_text("[GENERAL]\r\nPresetPath=a\r\n", {("GENERAL", "PresetPath"): "b"})
+        self.assertEqual(text, "[GENERAL]\r\nPresetPath=b\r\n")
+
+    def test_new_file_uses_the_template(self):
+        content = create_files.get_reshade_ini_content(self.tmp_dir, "", merge=True)
+        self.assertEqual(content, create_files.render_reshade_ini(constants.SHADERS_SRC_PATH, ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
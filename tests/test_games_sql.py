@@ -0,0 +1,46 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import unittest
+
+from tests.fixtures import DatabaseTestCase
+from src.sql.games_sql import GamesSql
+from src.utils import utilities
+
+
+class TestGamesSql(DatabaseTestCase):
+    def _games_obj(self, game_name: str, path: str):
+        games_obj = utilities.Object()
+        games_obj.game_name = game_name
+        games_obj.architecture = "64bits"
+        games_obj.api = "DX11"
+        games_obj.path = path
+        return games_obj
+
+    def test_names_with_quotes(self):
+        games_sql = GamesSql(self.main)
+        games_sql.insert_game(self._games_obj("Baldur's Gate 3", "C:\\Games\\Baldur's Gate 3\\bg3.exe"))
+        games_sql.insert_games([self._games_obj("Assassin's Creed", "D:\\Assassin's Creed\\AC.exe")])
+
+        rs = games_sql.get_game_by_name("Baldur's Gate 3")
+        self.assertEqual(len(rs), 1)
+        self.assertEqual(len(games_sql.get_game_by_path("D:\\Assassin's Creed\\AC.exe")), 1)
+
+        games_obj = self._games_obj("Baldur's Gate III", "E:\\Larian's\\bg3.exe")
+        games_obj.id = rs[0]["id"]
+        games_obj.api = "DX9"
+        games_sql.update_game(games_obj)
+        games_sql.update_game_path(games_obj)
+        rs = games_sql.get_game_by_name("Baldur's Gate III")
+        self.assertEqual((rs[0]["api"], rs[0]["path"]), ("DX9", "E:\\Larian's\\bg3.exe"))
+        self.assertEqual(len(games_sql.get_game_by_name("Baldur's Gate 3")), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.utils import ini_cache
+
+
+class TestIniCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ini_path = os.path.join(self.tmp_dir, "ReShade.ini")
+        ini_cache.invalidate()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write_ini(self, data: bytes):
+        with open(self.ini_path, "wb") as file:
+            file.write(data)
+        ini_cache.invalidate(self.ini_path)
+
+    def test_read_value(self):
+        self._write_ini(b"[GENERAL]\nPresetPath=\".\\ReShadePreset.ini\"\nPerformanceMode=\n")
+        self.assertEqual(ini_cache.get_ini_settings(self.ini_path, "GENERAL", "PresetPath"), ".\\ReShadePreset.ini")
+        self.assertIsNone(ini_cache.get_ini_settings(self.ini_path, "GENERAL", "PerformanceMode"))
+        self.assertIsNone(ini_cache.get_ini_settings(self.ini_path, "SCREENSHOTS", "SavePath"))
+
+    def test_missing_file(self):
+        self.assertIsNone(ini_cache.get_parser(self.ini_path))
+        self.assertIsNone(ini_cache.get_ini_settings(self.ini_path, "GENERAL", "PresetPath"))
+
+    def test_invalid_files(self):
+        for data in (b"[GENERAL]\nPresetPath=a\nPresetPath=b\n",
+                     b"PresetPath=a\n[GENERAL]\n",
+                     b"[GENERAL]\nPresetPath=\xff\xfe\xfa\n"):
+            with self.subTest(data=data):
+                self._write_ini(data)
+                with self.assertLogs(ini_cache.__name__, level="ERROR"):
+                    self.assertIsNone(ini_cache.get_parser(self.ini_path))
+                self.assertIsNone(ini_cache.get_ini_settings(self.ini_path, "GENERAL", "PresetPath"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.utils import library_scanner, pe_inspect
+
+_NEW_VDF = r'''
+"libraryfolders"
+{
+	"0"
+	{
+		"path"		"C:\\Program Files (x86)\\Steam"
+		"label"		""
+		"apps"
+		{
+			"228980"		"250"
+		}
+	}
+	"1"
+	{
+		"path"		"D:\\SteamLibrary"
+		"label"		"Games \"fast\""
+	}
+}
+'''
+
+_OLD_VDF = r'''
+"LibraryFolders"
+{
+	"TimeNextStatsReport"		"1600000000"
+	"ContentStatsID"		"-123"
+	"1"		"D:\\SteamLibrary"
+	"2"		"E:\\Games\\Steam"
+}
+'''
+
+
+class TestLibraryFolders(unittest.TestCase):
+    def test_new_format(self):
+        paths = library_scanner.parse_library_folders(_NEW_VDF)
+        self.assertEqual(paths, ["C:\\Program Files (x86)\\Steam", "D:\\SteamLibrary"])
+
+    def test_old_format(self):
+        paths = library_scanner.parse_library_folders(_OLD_VDF)
+        self.assertEqual(paths, ["D:\\SteamLibrary", "E:\\Games\\Steam"])
+
+    def test_invalid_text(self):
+        self.assertEqual(library_scanner.parse_library_folders(""), [])
+        self.assertEqual(library_scanner.parse_library_folders("}} not a vdf {"), [])
+
+    def test_read_from_steamapps(self):
+        steam_apps = tempfile.mkdtemp()
+        try:
+            self.assertEqual(library_scanner._read_library_folders(steam_apps), [])
+            with open(os.path.join(steam_apps, "libraryfolders.vdf"), "w", encoding="utf-8") as file:
+                file.write(_OLD_VDF)
+            self.assertEqual(library_scanner._read_library_folders(steam_apps), ["D:\\SteamLibrary", "E:\\Games\\Steam"])
+        finally:
+            shutil.rmtree(steam_apps, ignore_errors=True)
+
+
+class TestFindGameExecutable(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        pe_inspect.invalidate()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _make_file(self, rel_path: str, size=16):
+        path = os.path.join(self.tmp_dir, *rel_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(bytes(size))
+        return path
+
+    def test_no_executable(self):
+        self._make_file("Empty Game/readme.txt")
+        self.assertIsNone(library_scanner.find_game_executable(os.path.join(self.tmp_dir, "Empty Game")))
+
+    def test_name_match_wins_over_size(self):
+        self._make_file("Some Game/tool.exe", 4096)
+        game_exe = self._make_file("Some Game/bin/SomeGame.exe", 64)
+        self._make_file("Some Game/unins000.exe", 8192)
+        self.assertEqual(library_scanner.find_game_executable(os.path.join(self.tmp_dir, "Some Game")), game_exe)
+
+    def test_shipping_exe(self):
+        self._make_file("Unreal Game/UnrealGame.exe", 64)
+        shipping_exe = self._make_file("Unreal Game/UnrealGame/Binaries/Win64/UnrealGame-Win64-Shipping.exe", 64)
+        self.assertEqual(library_scanner.find_game_executable(os.path.join(self.tmp_dir, "Unreal Game")), shipping_exe)
+
+    def test_ignored_dirs(self):
+        self._make_file("Other Game/_CommonRedist/OtherGame.exe", 64)
+        self.assertIsNone(library_scanner.find_game_executable(os.path.join(self.tmp_dir, "Other Game")))
+
+    def test_background_scan(self):
+        game_exe = self._make_file("Some Game/SomeGame.exe", 64)
+        self._make_file("Empty Game/readme.txt")
+        scan = library_scanner.LibraryScan([self.tmp_dir]).start()
+        scan._thread.join(10)
+        self.assertTrue(scan.is_done())
+        self.assertEqual([x.game_name for x in scan.games], ["Some Game"])
+        self.assertEqual(scan.games[0].path, game_exe.replace("/", "\\"))
+        self.assertIsNone(scan.games[0].api)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from src.utils import constants, pe_inspect
+
+_SECTION_RVA = 0x1000
+_SECTION_RAW = 0x400
+_NAMES_RVA = 0x1200
+
+
+################################################################################
+def make_pe(machine: int, imports=(), delay_imports=()):
+    # smallest exe the parser accepts: headers, then one section with the import
+    # descriptors and the dll names
+    pe32_plus = machine == pe_inspect.MACHINE_AMD64
+    optional_size = 240 if pe32_plus else 224
+    data = bytearray(_SECTION_RAW * 2)
+    data[0:2] = b"MZ"
+    struct.pack_into("<I", data, 0x3C, 0x80)
+    data[0x80:0x84] = b"PE\0\0"
+    struct.pack_into("<HH", data, 0x84, machine, 1)
+    struct.pack_into("<H", data, 0x84 + 16, optional_size)
+    optional_offset = 0x98
+    struct.pack_into("<H", data, optional_offset, 0x20b if pe32_plus else 0x10b)
+    num_dirs_offset = optional_offset + (108 if pe32_plus else 92)
+    struct.pack_into("<I", data, num_dirs_offset, 16)
+    section_offset = optional_offset + optional_size
+    data[section_offset:section_offset + 8] = b".idata\0\0"
+    struct.pack_into("<IIII", data, section_offset + 8, _SECTION_RAW, _SECTION_RVA, _SECTION_RAW, _SECTION_RAW)
+
+    name_rva = _NAMES_RVA
+    descriptor_rva = _SECTION_RVA
+    for directory, dll_names, descriptor_size, name_field in ((1, imports, 20, 12), (13, delay_imports, 32, 4)):
+        if len(dll_names) == 0:
+            continue
+        struct.pack_into("<I", data, num_dirs_offset + 4 + 8 * directory, descriptor_rva)
+        for dll_name in dll_names:
+            struct.pack_into("<I", data, descriptor_rva - _SECTION_RVA + _SECTION_RAW + name_field, name_rva)
+            name_offset = name_rva - _SECTION_RVA + _SECTION_RAW
+            data[name_offset:name_offset + len(dll_name)] = dll_name.encode("ascii")
+            name_rva += 32
+            descriptor_rva += descriptor_size
+        # a zeroed descriptor ends the table
+        descriptor_rva += descriptor_size
+    return bytes(data)
+
+
+class TestPeInspect(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        pe_inspect.invalidate()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _inspect(self, data: bytes, file_name="game.exe"):
+        exe_path = os.path.join(self.tmp_dir, file_name)
+        with open(exe_path, "wb") as file:
+            file.write(data)
+        return pe_inspect.inspect_exe(exe_path)
+
+    def test_architecture(self):
+        for machine, architecture in ((pe_inspect.MACHINE_I386, "32bits"), (pe_inspect.MACHINE_AMD64, "64bits")):
+            with self.subTest(architecture=architecture):
+                result = self._inspect(make_pe(machine, ["KERNEL32.dll"]), f"{architecture}.exe")
+                self.assertEqual(result.architecture, architecture)
+                self.assertIsNone(result.api)
+                self.assertEqual(result.imports, {"kernel32.dll"})
+
+    def test_dx9(self):
+        for machine in (pe_inspect.MACHINE_I386, pe_inspect.MACHINE_AMD64):
+            with self.subTest(machine=machine):
+                result = self._inspect(make_pe(machine, ["KERNEL32.dll", "d3d9.dll"]), f"{machine}.exe")
+                self.assertEqual(result.api, "DX9")
+
+    def test_dx11_dlls(self):
+        for machine in (pe_inspect.MACHINE_I386, pe_inspect.MACHINE_AMD64):
+            for dll_name in (constants.DXGI, "d3d10.dll", "d3d10_1.dll", "D3D11.dll", "d3d12.dll"):
+                with self.subTest(machine=machine, dll_name=dll_name):
+                    result = self._inspect(make_pe(machine, ["KERNEL32.dll", dll_name]), f"{machine}_{dll_name}.exe")
+                    self.assertEqual(result.api, "DX11")
+
+    def test_dx11_wins_over_dx9(self):
+        for machine in (pe_inspect.MACHINE_I386, pe_inspect.MACHINE_AMD64):
+            with self.subTest(machine=machine):
+                data = make_pe(machine, [constants.D3D9, "d3d11.dll", constants.DXGI])
+                self.assertEqual(self._inspect(data, f"{machine}.exe").api, "DX11")
+
+    def test_delay_imports(self):
+        data = make_pe(pe_inspect.MACHINE_AMD64, ["KERNEL32.dll"], delay_imports=["d3d11.dll"])
+        result = self._inspect(data)
+        self.assertEqual(result.api, "DX11")
+        self.assertEqual(result.imports, {"kernel32.dll", "d3d11.dll"})
+
+    def test_not_a_pe(self):
+        result = self._inspect(b"MZ" + bytes(126))
+        self.assertIsNone(result.architecture)
+        self.assertIsNone(result.api)
+
+    def test_changed_exe_is_parsed_again(self):
+        self.assertEqual(self._inspect(make_pe(pe_inspect.MACHINE_AMD64, [constants.D3D9])).api, "DX9")
+        data = make_pe(pe_inspect.MACHINE_AMD64, [constants.D3D9, "d3d12.dll"]) + bytes(16)
+        self.assertEqual(self._inspect(data).api, "DX11")
+
+
+if __name__ == "__main__":
+    unittest.main()
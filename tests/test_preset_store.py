@@ -0,0 +1,89 @@
+#! /usr/bin/env python3
+# |*****************************************************
+# * Copyright         : Copyright (C) 2019
+# * Author            : ddc
+# * License           : GPL v3
+# * Python            : 3.6
+# |*****************************************************
+# # -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import unittest
+
+from tests.fixtures import ApplyTestCase
+from src import apply_plan, form_events
+from src.sql.presets_sql import PresetsSql
+from src.utils import constants, preset_store, utilities
+
+
+class TestPresetStore(ApplyTestCase):
+    def _assign_preset(self, games_obj, name: str, content: bytes):
+        preset_obj = utilities.Object()
+        preset_obj.name = name
+        preset_obj.hash = preset_store.add_preset_content(content)
+        presets_sql = PresetsSql(self.main)
+        presets_sql.update_preset(preset_obj)
+        game_preset_obj = utilities.Object()
+        game_preset_obj.game_id = games_obj.id
+        game_preset_obj.name = name
+        presets_sql.update_game_preset(game_preset_obj)
+        return preset_obj.hash
+
+    def _store_files(self):
+        return sorted(os.listdir(constants.PRESET_STORE_PATH))
+
+    def test_same_content_is_stored_once(self):
+        preset_hash = preset_store.add_preset_content(b"[Clarity.fx]\n")
+        self.assertEqual(preset_hash, hashlib.sha256(b"[Clarity.fx]\n").hexdigest())
+        self.assertEqual(preset_store.add_preset_content(b"[Clarity.fx]\n"), preset_hash)
+        self.assertEqual(self._store_files(), [f"{preset_hash}.ini"])
+        self.assertEqual(preset_store.get_preset_hash(preset_store.get_preset_path(preset_hash)), preset_hash)
+        self.assertIsNone(preset_store.get_preset_hash(os.path.join(self.tmp_dir, f"{preset_hash}.ini")))
+        self.assertIsNone(preset_store.get_preset_hash(f".\\{constants.RESHADE_PRESET_INI}"))
+
+    def test_remove_unused(self):
+        used_hash = preset_store.add_preset_content(b"used")
+        unused_hash = preset_store.add_preset_content(b"unused")
+        self.write_file(os.path.join(constants.PRESET_STORE_PATH, "notes.ini"), b"not a store file")
+
+        self.assertEqual(preset_store.remove_unused({used_hash}), [unused_hash])
+        self.assertEqual(self._store_files(), sorted([f"{used_hash}.ini", "notes.ini"]))
+
+    def test_assigned_preset_survives_remove_unused(self):
+        game_a = self.add_game("Game A")
+        game_b = self.add_game("Game B")
+        assigned_hash = self._assign_preset(game_a, "Sharp", b"[sharp]\n")
+        # game B still points to a store file from an older version
+        referenced_hash = preset_store.add_preset_content(b"[referenced]\n")
+        self.write_file(self.game_file(game_b, constants.RESHADE_INI),
+                        f"[GENERAL]\nPresetPath={preset_store.get_preset_path(referenced_hash)}\n".encode("utf-8"))
+        orphan_hash = preset_store.add_preset_content(b"[orphan]\n")
+
+        form_events._remove_unused_presets(self.main)
+        self.assertEqual(self._store_files(), sorted([f"{assigned_hash}.ini", f"{referenced_hash}.ini"]))
+        self.assertNotIn(f"{orphan_hash}.ini", self._store_files())
+
+    def test_store_preset_is_copied_per_game(self):
+        self.main.settings.shared_preset = True
+        game_a = self.add_game("Game A")
+        game_b = self.add_game("Game B")
+        self._assign_preset(game_a, "Sharp", b"[sharp]\n")
+        self._assign_preset(game_b, "Sharp", b"[sharp]\n")
+
+        plan = self.apply()
+        for games_obj in (game_a, game_b):
+            self.assertIn(apply_plan.COPY_PRESET, self.get_actions(plan, games_obj))
+            self.assertEqual(self.read_file(self.game_file(games_obj, constants.RESHADE_PRESET_INI)), b"[sharp]\n")
+
+        # reshade saves to the game's own copy, the other game and the store are not changed
+        self.write_file(self.game_file(game_a, constants.RESHADE_PRESET_INI), b"[sharp edited]\n")
+        plan = self.apply()
+        self.assertEqual(plan.games, [])
+        self.assertEqual(self.read_file(self.game_file(game_b, constants.RESHADE_PRESET_INI)), b"[sharp]\n")
+        self.assertEqual(self.read_file(preset_store.get_preset_path(hashlib.sha256(b"[sharp]\n").hexdigest())),
+                         b"[sharp]\n")
+
+
+if __name__ == "__main__":
+    unittest.main()